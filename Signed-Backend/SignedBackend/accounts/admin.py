@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import FanoutProgress, Notification
 
 # Register your models here.
 
@@ -10,3 +10,12 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ['title', 'message', 'user__email']
     readonly_fields = ['id', 'created_at', 'updated_at']
     ordering = ['-created_at']
+
+
+@admin.register(FanoutProgress)
+class FanoutProgressAdmin(admin.ModelAdmin):
+    list_display = ['job_posting', 'kind', 'status', 'processed', 'total', 'notified', 'chunks', 'updated_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['id', 'started_at', 'updated_at', 'finished_at']
+    ordering = ['-started_at']
+
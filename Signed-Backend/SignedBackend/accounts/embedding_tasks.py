@@ -0,0 +1,137 @@
+"""
+Re-embedding of rows whose vectors came from an older embedding model version.
+
+After settings.EMBEDDING_MODEL_VERSION changes, stale rows are brought up
+to date a few at a time instead of in one stop-the-world recompute: read
+paths that run into a stale vector call request_reembed(), and the
+embeddings.sweep task works through the rest in small batches with a
+pause in between, on a single worker slot. Until a row is re-embedded it
+is only compared with vectors of its own version.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .embeddings import current_version, encode_batch
+from .embeddings.texts import applicant_embedding_text, job_posting_embedding_text
+from .models import ApplicantProfile, BackgroundTask, JobPosting
+from .tasks import enqueue, task
+
+REEMBED_TASKS = {
+    "jobs": "embeddings.reembed_jobs",
+    "applicants": "embeddings.reembed_applicants",
+}
+# ids queued by one read path call (the sweeper picks up anything beyond)
+LAZY_REEMBED_MAX_IDS = 50
+
+_requested = OrderedDict()
+_requested_lock = threading.Lock()
+
+
+def stale_rows(model):
+    """Rows of model holding a vector from a version other than the current one."""
+    return model.objects.filter(vector_embedding__isnull=False).exclude(
+        embedding_model_version=current_version().name
+    )
+
+
+def request_reembed(kind, ids):
+    """
+    Queue re-embedding of stale rows a read path ran into.
+
+    kind is "jobs" or "applicants". Ids queued by this process within the
+    last EMBEDDING_LAZY_REEMBED_WINDOW seconds are skipped, so a busy feed
+    doesn't queue the same rows on every request.
+    """
+    window = getattr(settings, "EMBEDDING_LAZY_REEMBED_WINDOW", 600)
+    now = time.monotonic()
+    fresh = []
+    with _requested_lock:
+        while _requested and next(iter(_requested.values())) < now - window:
+            _requested.popitem(last=False)
+        for row_id in ids:
+            key = (kind, str(row_id))
+            if key in _requested:
+                continue
+            _requested[key] = now
+            fresh.append(str(row_id))
+            if len(fresh) >= LAZY_REEMBED_MAX_IDS:
+                break
+    if fresh:
+        enqueue(REEMBED_TASKS[kind], ids=fresh)
+    return fresh
+
+
+def _reembed(rows, text_for):
+    """
+    Re-embed the rows not on the current version, in one encode call.
+
+    Rows whose text is empty lose their stale vector, since it can't be
+    compared with anything anymore. Returns the rows that were changed
+    (not yet saved).
+    """
+    version = current_version().name
+    rows = [row for row in rows if row.embedding_model_version != version]
+    texts = [text_for(row) for row in rows]
+    embeddable = [(row, text) for row, text in zip(rows, texts) if text.strip()]
+    vectors = encode_batch([text for _, text in embeddable]) if embeddable else []
+
+    for (row, _), vector in zip(embeddable, vectors):
+        row.vector_embedding = vector
+        row.embedding_model_version = version
+    for row, text in zip(rows, texts):
+        if not text.strip():
+            row.vector_embedding = None
+            row.embedding_model_version = ""
+    return rows
+
+
+@task("embeddings.reembed_jobs", concurrency=1, visibility_timeout=300)
+def reembed_jobs(ids):
+    postings = JobPosting.objects.select_related('company').filter(id__in=ids)
+    for posting in _reembed(postings, job_posting_embedding_text):
+        # one save per row so the vector index picks the new vector up
+        posting.save(update_fields=["vector_embedding", "embedding_model_version"])
+        enqueue("job_posting.mirror", job_id=str(posting.id))
+
+
+@task("embeddings.reembed_applicants", concurrency=1, visibility_timeout=600)
+def reembed_applicants(ids):
+    from .signals import sync_applicant_vector_index
+
+    profiles = _reembed(ApplicantProfile.objects.filter(pk__in=ids), applicant_embedding_text)
+    if profiles:
+        fields = ["vector_embedding", "embedding_model_version"]
+        ApplicantProfile.objects.bulk_update(profiles, fields)
+        # bulk_update sends no post_save: move the new vectors into the notification index here,
+        # or find_similar_applicants would keep comparing against the old ones until its next reload
+        for profile in profiles:
+            sync_applicant_vector_index(sender=ApplicantProfile, instance=profile, update_fields=fields)
+
+
+@task("embeddings.sweep", concurrency=1, visibility_timeout=900)
+def sweep_stale_embeddings():
+    batch_size = getattr(settings, "EMBEDDING_SWEEP_BATCH_SIZE", 64)
+    remaining = False
+    for model, handler in ((JobPosting, reembed_jobs), (ApplicantProfile, reembed_applicants)):
+        ids = list(stale_rows(model).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if ids:
+            handler(ids=[str(row_id) for row_id in ids])
+            remaining = remaining or len(ids) == batch_size
+    if remaining:
+        enqueue("embeddings.sweep", delay=getattr(settings, "EMBEDDING_SWEEP_INTERVAL", 30))
+    else:
+        print(f"[embeddings] every vector is on {current_version().name}")
+
+
+def schedule_sweep():
+    """Queue the sweeper if there are stale rows and it isn't queued already."""
+    pending = BackgroundTask.objects.filter(task_type="embeddings.sweep", status__in=("queued", "running"))
+    if pending.exists():
+        return False
+    if not (stale_rows(JobPosting).exists() or stale_rows(ApplicantProfile).exists()):
+        return False
+    enqueue("embeddings.sweep")
+    return True
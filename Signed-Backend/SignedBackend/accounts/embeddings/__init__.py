@@ -0,0 +1,143 @@
+"""
+Text embeddings for applicants and job postings.
+
+Every caller shares one lazily-loaded model per process through the
+module-level helpers below; set EMBEDDING_WARMUP to load it when the app
+starts instead of on the first request that needs it. Single texts go
+through a micro-batcher, so concurrent requests share forward passes,
+and every encode is looked up first in a persistent cache keyed by the
+SHA-256 of the model name and the exact text.
+
+The model comes from the current entry of the version registry
+(versions.py); stored vectors record the version that produced them.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+
+from .batching import MicroBatcher
+from .cache import EmbeddingCache, content_key
+from .provider import EmbeddingProvider, normalize_rows
+from .versions import EMBEDDING_VERSIONS, EmbeddingVersion, current_version, get_version, is_current
+
+EMBEDDING_BACKENDS = ("torch", "onnx")
+
+
+def make_provider(backend=None, model_name=None, fallback=True):
+    """
+    An EmbeddingProvider for the given (or configured) inference backend.
+
+    With fallback, an ONNX backend that can't serve yet (onnxruntime isn't
+    installed, or the model hasn't been exported) is replaced by the PyTorch
+    provider with a warning, rather than failing or exporting on the first encode.
+    """
+    backend = backend or getattr(settings, "EMBEDDING_BACKEND", "torch")
+    model_name = model_name or current_version().model_name
+    if backend == "torch":
+        return EmbeddingProvider(model_name)
+    if backend == "onnx":
+        from .onnx_backend import OnnxEmbeddingProvider, is_exported, onnx_available
+
+        model_dir = getattr(settings, "EMBEDDING_ONNX_DIR", "onnx_models")
+        quantized = getattr(settings, "EMBEDDING_ONNX_QUANTIZE", True)
+        if fallback and not onnx_available():
+            print("[warn] EMBEDDING_BACKEND = 'onnx' needs onnxruntime (see requirements.txt); using torch")
+            return EmbeddingProvider(model_name)
+        if fallback and not is_exported(model_name, model_dir, quantized):
+            print(f"[warn] no ONNX export of {model_name} in {model_dir}; using torch. "
+                  "Export it with `python manage.py embedding_benchmark --backends torch,onnx`")
+            return EmbeddingProvider(model_name)
+        return OnnxEmbeddingProvider(
+            model_name,
+            model_dir=model_dir,
+            quantized=quantized,
+            intra_op_threads=getattr(settings, "EMBEDDING_ONNX_THREADS", 0),
+        )
+    raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}; expected one of {EMBEDDING_BACKENDS}")
+
+
+embedding_provider = make_provider()
+embedding_batcher = MicroBatcher(
+    embedding_provider.encode_batch,
+    max_batch_size=getattr(settings, "EMBEDDING_BATCH_MAX_SIZE", 32),
+    max_wait_ms=getattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 5),
+)
+embedding_cache = EmbeddingCache(
+    max_entries=getattr(settings, "EMBEDDING_CACHE_MAX_ENTRIES", 50000),
+    touch_interval=timedelta(seconds=getattr(settings, "EMBEDDING_CACHE_TOUCH_INTERVAL", 3600)),
+)
+
+
+def _cache_enabled():
+    return getattr(settings, "EMBEDDING_CACHE_ENABLED", True)
+
+
+def encode_one(text):
+    namespace = embedding_provider.cache_namespace
+    if _cache_enabled():
+        cached = embedding_cache.get_many(namespace, [text])
+        if cached:
+            return cached[content_key(namespace, text)]
+
+    if getattr(settings, "EMBEDDING_BATCHING", True):
+        vector = embedding_batcher.encode(text)
+    else:
+        vector = embedding_provider.encode_one(text)
+
+    if _cache_enabled():
+        embedding_cache.put_many(namespace, {text: vector})
+    return vector
+
+
+def encode_batch(texts):
+    texts = list(texts)
+    if not _cache_enabled():
+        return embedding_provider.encode_batch(texts)
+
+    namespace = embedding_provider.cache_namespace
+    vectors = embedding_cache.get_many(namespace, texts)
+    missing = list(dict.fromkeys(text for text in texts if content_key(namespace, text) not in vectors))
+    if missing:
+        encoded = dict(zip(missing, embedding_provider.encode_batch(missing)))
+        embedding_cache.put_many(namespace, encoded)
+        vectors.update((content_key(namespace, text), vector) for text, vector in encoded.items())
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([vectors[content_key(namespace, text)] for text in texts]).astype(np.float32, copy=False)
+
+
+def warmup():
+    embedding_provider.warmup()
+
+
+def stats():
+    return {
+        "model": embedding_provider.cache_namespace,
+        "version": current_version().name,
+        "loaded": embedding_provider.loaded,
+        "batching": embedding_batcher.stats(),
+        "cache": embedding_cache.stats(),
+    }
+
+
+__all__ = [
+    "EMBEDDING_VERSIONS",
+    "EmbeddingCache",
+    "EmbeddingProvider",
+    "EmbeddingVersion",
+    "MicroBatcher",
+    "content_key",
+    "current_version",
+    "embedding_batcher",
+    "embedding_cache",
+    "embedding_provider",
+    "make_provider",
+    "encode_batch",
+    "encode_one",
+    "get_version",
+    "is_current",
+    "normalize_rows",
+    "stats",
+    "warmup",
+]
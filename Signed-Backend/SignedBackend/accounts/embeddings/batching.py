@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Coalesces single-text encode requests from any thread into batched calls.
+
+    The first request of a batch opens a window of max_wait_ms; everything
+    submitted before the window closes (up to max_batch_size texts) goes
+    through one encode_batch call, and each caller gets its own row back.
+    The worker thread starts on first use and is restarted in a forked child.
+    """
+
+    def __init__(self, encode_batch, max_batch_size=32, max_wait_ms=5):
+        self._encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._cond = threading.Condition()
+        self._queue = []
+        self._worker = None
+        self._pid = None
+
+        self.batches = 0
+        self.items = 0
+        self.batch_sizes = Counter()
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive() and self._pid == os.getpid():
+            return
+        self._queue = []
+        self._pid = os.getpid()
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        """Queue a text; the returned Future resolves to its embedding."""
+        future = Future()
+        with self._cond:
+            self._ensure_worker()
+            self._queue.append((time.monotonic(), text, future))
+            self._cond.notify()
+        return future
+
+    def encode(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            deadline = self._queue[0][0] + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            started = time.monotonic()
+            waits = [started - enqueued for enqueued, _, _ in batch]
+            try:
+                vectors = self._encode_batch([text for _, text, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, _, future), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            with self._cond:
+                self.batches += 1
+                self.items += len(batch)
+                self.batch_sizes[len(batch)] += 1
+                self.total_wait += sum(waits)
+                self.max_wait_seen = max(self.max_wait_seen, max(waits))
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "window_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "mean_queue_wait_ms": self.total_wait / self.items * 1000 if self.items else 0.0,
+                "max_queue_wait_ms": self.max_wait_seen * 1000,
+                "queued": len(self._queue),
+            }
@@ -0,0 +1,30 @@
+import time
+
+import numpy as np
+
+
+def parity(reference, candidate):
+    """
+    How closely two backends agree, as cosine similarity per text.
+
+    Both inputs are unit-length vectors of the same texts, so the row-wise
+    dot product is the cosine.
+    """
+    cosines = np.sum(np.asarray(reference) * np.asarray(candidate), axis=1)
+    return {
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+    }
+
+
+def throughput(provider, texts, batch_size=32, repeat=3):
+    """Best-of-`repeat` encodes per second for `provider` over `texts`."""
+    provider.warmup()
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for i in range(0, len(texts), batch_size):
+            provider.encode_batch(texts[i:i + batch_size])
+        elapsed = time.perf_counter() - started
+        best = max(best, len(texts) / elapsed if elapsed else 0.0)
+    return best
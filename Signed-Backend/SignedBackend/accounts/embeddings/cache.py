@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from datetime import timedelta
+
+from django.utils import timezone
+
+
+def content_key(model_name, text):
+    """SHA-256 of the model name and the exact text fed to it."""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache in the EmbeddingCacheEntry table.
+
+    Identical text for the same model never reaches the transformer twice.
+    Hits refresh last_used_at (at most once per touch_interval, to keep
+    reads cheap), and every evict_every inserts the least recently used
+    entries beyond max_entries are deleted. Cache failures are logged and
+    treated as misses; they never fail the encode.
+    """
+
+    def __init__(self, max_entries=50000, touch_interval=timedelta(hours=1), evict_every=100):
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model_name, texts):
+        """Map key -> vector for the texts already cached."""
+        from ..models import EmbeddingCacheEntry
+
+        keys = {content_key(model_name, text) for text in texts}
+        try:
+            entries = list(EmbeddingCacheEntry.objects.filter(key__in=keys).only("key", "vector", "last_used_at"))
+            stale = [e.key for e in entries if e.last_used_at < timezone.now() - self.touch_interval]
+            if stale:
+                EmbeddingCacheEntry.objects.filter(key__in=stale).update(last_used_at=timezone.now())
+        except Exception as e:
+            print(f"[embeddings] cache lookup failed: {e}")
+            entries = []
+        with self._lock:
+            self.hits += len(entries)
+            self.misses += len(keys) - len(entries)
+        return {entry.key: entry.vector for entry in entries}
+
+    def put_many(self, model_name, vectors_by_text):
+        from ..models import EmbeddingCacheEntry
+
+        entries = [
+            EmbeddingCacheEntry(key=content_key(model_name, text), model_name=model_name, vector=vector)
+            for text, vector in vectors_by_text.items()
+        ]
+        try:
+            EmbeddingCacheEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        except Exception as e:
+            print(f"[embeddings] cache insert failed: {e}")
+            return
+        with self._lock:
+            self._inserts += len(entries)
+            due = self._inserts >= self.evict_every
+            if due:
+                self._inserts = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Delete the least recently used entries beyond max_entries."""
+        from ..models import EmbeddingCacheEntry
+
+        try:
+            excess = EmbeddingCacheEntry.objects.count() - self.max_entries
+            if excess <= 0:
+                return 0
+            oldest = list(
+                EmbeddingCacheEntry.objects.order_by("last_used_at").values_list("key", flat=True)[:excess]
+            )
+            deleted = 0
+            for i in range(0, len(oldest), 500):
+                deleted += EmbeddingCacheEntry.objects.filter(key__in=oldest[i:i + 500]).delete()[0]
+            return deleted
+        except Exception as e:
+            print(f"[embeddings] cache eviction failed: {e}")
+            return 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
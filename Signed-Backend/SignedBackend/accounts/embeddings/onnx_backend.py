@@ -0,0 +1,150 @@
+"""
+onnxruntime inference for the sentence embedding model.
+
+export_onnx() traces the sentence-transformer's encoder to ONNX (optionally
+followed by int8 dynamic quantization of the weights) and saves the
+tokenizer next to it. OnnxEmbeddingProvider runs that graph on CPU with
+onnxruntime and reproduces the sentence-transformers pipeline around it
+(tokenize, mean-pool over the attention mask, L2-normalize), behind the
+same interface as the PyTorch provider.
+
+onnxruntime (pinned in requirements.txt) is only imported when
+EMBEDDING_BACKEND is "onnx". The export needs torch and takes a while, so it
+isn't run by the server: `python manage.py embedding_benchmark --backends
+torch,onnx` exports the model (and checks its parity) the first time.
+Until then make_provider() serves with the PyTorch provider.
+"""
+import importlib.util
+import json
+from pathlib import Path
+
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+
+from .provider import EmbeddingProvider, normalize_rows
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+CONFIG_FILE = "export.json"
+
+
+def _model_dir(base_dir, model_name):
+    return Path(base_dir) / model_name.replace("/", "__")
+
+
+def onnx_available():
+    return importlib.util.find_spec("onnxruntime") is not None
+
+
+def is_exported(model_name, base_dir, quantize=True):
+    output_dir = _model_dir(base_dir, model_name)
+    return (output_dir / (INT8_FILE if quantize else FP32_FILE)).exists() and (output_dir / CONFIG_FILE).exists()
+
+
+def export_onnx(model_name, base_dir, quantize=True):
+    """
+    Export model_name to ONNX under base_dir/<model_name>/.
+
+    Returns:
+        Path of the exported graph (the int8 one when quantize is set)
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output_dir = _model_dir(base_dir, model_name)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    encoder = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    tokenizer.save_pretrained(output_dir)
+
+    dummy = tokenizer(["an example sentence"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = output_dir / FP32_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            encoder,
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            # the TorchScript exporter: dynamo=True (torch 2.9's default) would also need onnxscript
+            dynamo=False,
+        )
+
+    path = fp32_path
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        path = output_dir / INT8_FILE
+        quantize_dynamic(str(fp32_path), str(path), weight_type=QuantType.QInt8)
+
+    (output_dir / CONFIG_FILE).write_text(json.dumps({
+        "model_name": model_name,
+        "max_seq_length": st_model.max_seq_length,
+        "input_names": input_names,
+    }))
+    print(f"[embeddings] exported {model_name} to {path}")
+    return path
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, model_name, model_dir, quantized=True, intra_op_threads=0):
+        super().__init__(model_name)
+        self.model_dir = model_dir
+        self.quantized = quantized
+        self.intra_op_threads = intra_op_threads
+
+    @property
+    def cache_namespace(self):
+        return f"{self.model_name}:onnx-{'int8' if self.quantized else 'fp32'}"
+
+    def _load(self):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImproperlyConfigured("EMBEDDING_BACKEND = 'onnx' needs onnxruntime: pip install onnxruntime")
+        from transformers import AutoTokenizer
+
+        output_dir = _model_dir(self.model_dir, self.model_name)
+        path = output_dir / (INT8_FILE if self.quantized else FP32_FILE)
+        if not is_exported(self.model_name, self.model_dir, self.quantized):
+            export_onnx(self.model_name, self.model_dir, quantize=self.quantized)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        print(f"[embeddings] loading {path}")
+        return _OnnxModel(
+            onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"]),
+            AutoTokenizer.from_pretrained(output_dir),
+            json.loads((output_dir / CONFIG_FILE).read_text()),
+        )
+
+
+class _OnnxModel:
+    """The sentence-transformers encode pipeline around an onnxruntime session."""
+
+    def __init__(self, session, tokenizer, config):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_seq_length = config["max_seq_length"]
+        self.input_names = config["input_names"]
+
+    def encode(self, texts, convert_to_numpy=True):
+        tokens = self.tokenizer(
+            list(texts), padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np"
+        )
+        feeds = {name: tokens[name].astype(np.int64) for name in self.input_names}
+        hidden = self.session.run(["last_hidden_state"], feeds)[0]
+
+        mask = feeds["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return normalize_rows(pooled)
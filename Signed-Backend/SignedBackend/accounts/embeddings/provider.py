@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+
+
+def normalize_rows(vectors):
+    """Scale each row to unit length (all-zero rows are left as they are)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class EmbeddingProvider:
+    """
+    Owns one sentence-transformer model per process.
+
+    The model is loaded on first use, or up front by warmup(), instead of at
+    import time; concurrent first callers wait for a single load.
+    """
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        from sentence_transformers import SentenceTransformer
+
+        print(f"[embeddings] loading {self.model_name}")
+        return SentenceTransformer(self.model_name)
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    @property
+    def cache_namespace(self):
+        """Identifies the vectors this provider produces, for cache keys."""
+        return self.model_name
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def warmup(self):
+        """Load the model and run one forward pass so the first request doesn't pay for either."""
+        self.encode_one("warmup")
+
+    def encode_batch(self, texts):
+        """Unit-length float32 embeddings of texts, shape (len(texts), dim)."""
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return normalize_rows(self.model.encode(texts, convert_to_numpy=True))
+
+    def encode_one(self, text):
+        """Unit-length float32 embedding of a single text."""
+        return self.encode_batch([text])[0]
@@ -0,0 +1,44 @@
+"""The exact text each kind of row is embedded from."""
+import os
+
+
+def job_embedding_text(job_title, job_description, tags, location, salary, company_size, job_type):
+    # Combine all text fields into a single text
+    text_parts = [
+        f"Job Title: {job_title}",
+        f"Description: {job_description or ''}",
+        f"Location: {location}",
+        f"Job Type: {job_type}",
+        f"Salary: {salary or ''}",
+        f"Company Size: {company_size or ''}",
+        f"Tags: {', '.join(tags) if tags else ''}"
+    ]
+    return " ".join(text_parts)
+
+
+def job_posting_embedding_text(posting):
+    return job_embedding_text(
+        job_title=posting.job_title,
+        job_description=posting.job_description,
+        tags=posting.tags,
+        location=posting.location,
+        salary=posting.salary,
+        company_size=posting.company.size if posting.company else "",
+        job_type=posting.job_type,
+    )
+
+
+def applicant_embedding_text(profile):
+    """Text of the applicant's resume file, or "" if there is none or it can't be read."""
+    from django.core.files import File
+
+    from ..serializers import extract_text_from_resume
+
+    if not profile.resume_file:
+        return ""
+    try:
+        with profile.resume_file.open("rb") as f:
+            return extract_text_from_resume(File(f, name=os.path.basename(profile.resume_file.name)))
+    except Exception as e:
+        print(f"Error reading resume for applicant {profile.pk}: {e}")
+        return ""
@@ -0,0 +1,55 @@
+"""
+Registry of embedding model versions.
+
+A version names everything that decides what a stored vector means: the
+model and the text each kind of row is embedded from (texts.py). Vectors
+of different versions live in different spaces, so rows record the
+version that produced them (embedding_model_version) and only vectors of
+the same version are ever compared.
+
+To roll out a new model, register a version here and point
+settings.EMBEDDING_MODEL_VERSION at it. New writes use it right away;
+existing rows are re-embedded lazily when the feed sees them and by the
+embeddings.sweep task (or all at once with `manage.py reembed --stale`).
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class EmbeddingVersion:
+    def __init__(self, name, model_name, dim):
+        self.name = name
+        self.model_name = model_name
+        self.dim = dim
+
+    def __repr__(self):
+        return f"EmbeddingVersion({self.name!r}, {self.model_name!r}, dim={self.dim})"
+
+
+# rows embedded before versions were recorded were produced by this one
+INITIAL_VERSION = "minilm-l6-v1"
+
+EMBEDDING_VERSIONS = {
+    version.name: version
+    for version in (
+        EmbeddingVersion(INITIAL_VERSION, "all-MiniLM-L6-v2", dim=384),
+    )
+}
+
+
+def get_version(name):
+    try:
+        return EMBEDDING_VERSIONS[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown embedding model version {name!r}; expected one of {sorted(EMBEDDING_VERSIONS)}"
+        )
+
+
+def current_version():
+    """The version new embeddings are produced with."""
+    return get_version(getattr(settings, "EMBEDDING_MODEL_VERSION", INITIAL_VERSION))
+
+
+def is_current(name):
+    return name == current_version().name
@@ -0,0 +1,122 @@
+"""
+Bulk applicant lookups for employer views of the feed.
+
+Jobs carry their applicants as a list of emails. Instead of one
+ApplicantProfile query per email, profiles are loaded with a single
+email__in query per chunk. Only the facets needed for applicant_stats are
+read for the whole feed; full summaries are built just for the few
+applicants previewed on each job of the page. The complete list of a job's
+applicants is served, a page at a time, by the jobs/<id>/applicants/
+endpoint.
+"""
+from django.conf import settings
+from django.core import signing
+
+from ..models import ApplicantProfile, JobPosting
+
+APPLICANT_PREVIEW_SIZE = getattr(settings, "FEED_APPLICANT_PREVIEW_SIZE", 5)
+APPLICANTS_PAGE_SIZE = getattr(settings, "JOB_APPLICANTS_PAGE_SIZE", 25)
+APPLICANTS_MAX_PAGE_SIZE = 100
+APPLICANTS_CURSOR_SALT = "accounts.feed.applicants.cursor"
+
+# stays well under SQLite's bound-parameter limit
+EMAIL_CHUNK_SIZE = 500
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def applicant_summary(profile):
+    """The applicant fields shown to employers."""
+    return {
+        "first_name": profile.user.first_name or "",
+        "last_name": profile.user.last_name or "",
+        "email": profile.user.email or "",
+        "major": profile.major or "",
+        "school": profile.school or "",
+        "skills": profile.skills or [],
+        "personality_type": profile.personality_type or "",
+        "resume_url": profile.resume_file.url if profile.resume_file else "",
+        "portfolio_url": profile.portfolio_url or "",
+        "profile_image": profile.profile_image.url if profile.profile_image else "",
+        "bio": profile.bio or "",
+        "reports": profile.reports or 0,
+    }
+
+
+def load_applicant_summaries(emails):
+    """Map each email with an applicant profile to its summary."""
+    emails = list(dict.fromkeys(emails))
+    summaries = {}
+    for chunk in _chunks(emails, EMAIL_CHUNK_SIZE):
+        profiles = ApplicantProfile.objects.filter(user__email__in=chunk).select_related('user')
+        for profile in profiles:
+            summaries[profile.user.email] = applicant_summary(profile)
+    return summaries
+
+
+def load_applicant_facets(emails):
+    """Map each email with an applicant profile to its (major, school, personality_type)."""
+    emails = list(dict.fromkeys(emails))
+    facets = {}
+    for chunk in _chunks(emails, EMAIL_CHUNK_SIZE):
+        rows = ApplicantProfile.objects.filter(user__email__in=chunk).values_list(
+            'user__email', 'major', 'school', 'personality_type'
+        )
+        for email, major, school, personality_type in rows:
+            facets[email] = (major or "", school or "", personality_type or "")
+    return facets
+
+
+def load_job_applicant_emails(job_ids):
+    """Map each job id with applicants to their emails, in the order they applied."""
+    emails = {}
+    for chunk in _chunks(list(job_ids), EMAIL_CHUNK_SIZE):
+        rows = (
+            JobPosting.applicants.through.objects
+            .filter(jobposting_id__in=chunk)
+            .order_by('id')
+            .values_list('jobposting_id', 'applicantprofile__user__email')
+        )
+        for job_id, email in rows:
+            emails.setdefault(str(job_id), []).append(str(email))
+    return emails
+
+
+def encode_applicants_cursor(job_id, last_row_id):
+    return signing.dumps({"j": str(job_id), "r": last_row_id}, salt=APPLICANTS_CURSOR_SALT)
+
+
+def decode_applicants_cursor(token, job_id):
+    """The application row id to resume after, or None if the token isn't valid for this job."""
+    try:
+        data = signing.loads(token, salt=APPLICANTS_CURSOR_SALT)
+        if data["j"] != str(job_id):
+            return None
+        return int(data["r"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+def page_job_applicants(job_id, after=None, limit=APPLICANTS_PAGE_SIZE):
+    """
+    One page of a job's applicants, in the order they applied.
+
+    Pages are keyed on the id of the application row (the applicants
+    join table), so a page is a single indexed range scan however deep it is.
+
+    Returns:
+        (list of applicant summaries, id of the last row or None if there are no more)
+    """
+    applications = JobPosting.applicants.through.objects.filter(jobposting_id=job_id)
+    if after is not None:
+        applications = applications.filter(id__gt=after)
+    rows = list(
+        applications.select_related('applicantprofile__user').order_by('id')[:limit + 1]
+    )
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    applicants = [applicant_summary(row.applicantprofile) for row in rows]
+    return applicants, (rows[-1].id if has_next else None)
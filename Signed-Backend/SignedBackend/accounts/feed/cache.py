@@ -0,0 +1,106 @@
+"""
+Per-user cache of ranked feeds.
+
+A user's ranking only changes when their vector_embedding changes
+(apply_to_job / reject_job) or the job catalogue changes (new or edited
+postings, the is_active toggle). Entries are keyed by the user, the feed
+query, a stamp of the user's vector and the catalogue version, so a stale
+entry can never be served even when the invalidation came from another
+worker; the write paths still invalidate explicitly so memory is freed
+right away. The cache is a bounded LRU with a TTL on top.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+from ..vector_index import job_vector_index
+
+
+def vector_stamp(vector):
+    """Short digest identifying the exact contents of an embedding."""
+    if vector is None or len(vector) == 0:
+        return ""
+    data = np.asarray(vector, dtype=np.float32).tobytes()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class RankedFeedCache:
+    def __init__(self, max_entries=2000, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._catalogue_epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def catalogue_version(self):
+        # the index generation moves when a job vector is added, changed or removed,
+        # whether by a signal here or by a reload that picked up another worker's write
+        return (self._catalogue_epoch, job_vector_index.generation)
+
+    def get(self, user_uid, query_key, user_stamp):
+        key = (str(user_uid), query_key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, stamp, catalogue_version, value = entry
+                if expires_at > now and stamp == user_stamp and catalogue_version == self.catalogue_version():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, user_uid, query_key, user_stamp, value):
+        key = (str(user_uid), query_key)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, user_stamp, self.catalogue_version(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_uid):
+        """Drop every cached feed for a user whose vector just changed."""
+        user_uid = str(user_uid)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == user_uid]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def invalidate_catalogue(self):
+        """Drop every cached feed after the job catalogue changed."""
+        with self._lock:
+            self._catalogue_epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+ranked_feed_cache = RankedFeedCache(
+    max_entries=getattr(settings, "FEED_CACHE_MAX_ENTRIES", 2000),
+    ttl=getattr(settings, "FEED_CACHE_TTL", 600),
+)
@@ -0,0 +1,135 @@
+"""
+Opaque cursor tokens and ranking snapshots for feed pagination.
+
+The first page of a feed stores the ranked job ids in a snapshot (Django's
+cache, so it expires on its own). A cursor is a signed token carrying the
+snapshot id, the position reached, the (score, job_id) of the last job
+returned and the time the ranking was scored at. The next page resumes
+straight from the snapshot without scoring the catalogue again, and the
+ordering can't shift between pages. If the snapshot is gone (expired,
+evicted, or served by another worker) the feed is re-ranked as of that same
+time, so the recency signal gives the same scores, and resumes after the
+last (score, job_id) pair instead.
+
+Feed order is score descending with ties broken by job id ascending.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+
+CURSOR_SALT = "accounts.feed.cursor"
+SNAPSHOT_TTL = getattr(settings, "FEED_SNAPSHOT_TTL", 900)
+SNAPSHOT_MAX_ITEMS = getattr(settings, "FEED_SNAPSHOT_MAX_ITEMS", 1500)
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def feed_query_key(user_uid, filters, fetch_inactive):
+    """Fingerprint of the parameters that determine a feed's ranking."""
+    raw = json.dumps([user_uid or "", filters or {}, bool(fetch_inactive)], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def encode_cursor(snapshot_id, position, score, job_id, scored_at=None):
+    data = {"s": snapshot_id, "p": position, "sc": score, "id": job_id}
+    if scored_at is not None:
+        data["t"] = scored_at
+    return signing.dumps(data, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+        return {
+            "snapshot_id": data["s"],
+            "position": int(data["p"]),
+            "score": float(data["sc"]),
+            "job_id": str(data["id"]),
+            # cursors issued before the scoring time was recorded don't carry it
+            "scored_at": float(data["t"]) if "t" in data else None,
+        }
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def seek_after(job_ids, scores, score, job_id):
+    """Index of the first job ordered strictly after (score, job_id)."""
+    for i, (jid, s) in enumerate(zip(job_ids, scores)):
+        if s < score or (s == score and str(jid) > job_id):
+            return i
+    return len(job_ids)
+
+
+class RankingSnapshot:
+    """The leading ranked job ids (and feed scores) of one feed query."""
+
+    def __init__(self, snapshot_id, query_key, job_ids, scores, total_count, similarities=None, scored_at=None):
+        self.id = snapshot_id
+        self.query_key = query_key
+        self.job_ids = job_ids
+        self.scores = scores
+        self.total_count = total_count
+        # the cosine similarity shown with each job; scores are the blended feed scores
+        self.similarities = similarities if similarities is not None else scores
+        # epoch seconds the scores' recency signal was computed for
+        self.scored_at = scored_at
+
+    @staticmethod
+    def _cache_key(snapshot_id):
+        return f"feed:snapshot:{snapshot_id}"
+
+    @classmethod
+    def create(cls, query_key, job_ids, scores, total_count, similarities=None, scored_at=None):
+        snapshot = cls(
+            uuid.uuid4().hex,
+            query_key,
+            [str(jid) for jid in job_ids],
+            [float(s) for s in scores],
+            total_count,
+            similarities=[float(s) for s in similarities] if similarities is not None else None,
+            scored_at=scored_at,
+        )
+        cache.set(
+            cls._cache_key(snapshot.id),
+            {
+                "query_key": snapshot.query_key,
+                "job_ids": snapshot.job_ids,
+                "scores": snapshot.scores,
+                "total_count": snapshot.total_count,
+                "similarities": snapshot.similarities,
+                "scored_at": snapshot.scored_at,
+            },
+            SNAPSHOT_TTL,
+        )
+        return snapshot
+
+    @classmethod
+    def load(cls, snapshot_id, query_key):
+        """Return the snapshot if it still exists and belongs to this query."""
+        data = cache.get(cls._cache_key(snapshot_id))
+        if not data or data["query_key"] != query_key:
+            return None
+        return cls(
+            snapshot_id, data["query_key"], data["job_ids"], data["scores"], data["total_count"],
+            similarities=data.get("similarities"), scored_at=data.get("scored_at"),
+        )
+
+    def covers(self, start, page_size):
+        """True if the page starting at `start` can be served from this snapshot."""
+        return start + page_size <= len(self.job_ids) or len(self.job_ids) >= self.total_count
+
+    def resume_position(self, cursor, page_size):
+        """
+        Where the page after `cursor` starts in this snapshot, or None if the
+        page runs past the stored ids and the feed has to be re-ranked.
+        """
+        position = cursor["position"]
+        if not (0 < position <= len(self.job_ids)) or self.job_ids[position - 1] != cursor["job_id"]:
+            position = seek_after(self.job_ids, self.scores, cursor["score"], cursor["job_id"])
+        return position if self.covers(position, page_size) else None
@@ -0,0 +1,204 @@
+"""
+Compiles the `filters` JSON accepted by get_job_postings into query-layer
+predicates so only matching rows leave the database.
+
+The feed has always applied filters with OR semantics: a job matches when
+any single key equals its value. `user_company`, `user_id` and
+`user_email` are looked up inside the job's `posted_by` map, every other key
+is compared against the top-level field, and keys the job doesn't have
+never match.
+
+Because the keys are OR-ed, a filter can only be pushed down when *every*
+key can be pushed down; a single key that has to be checked in Python means
+the whole collection must be read anyway. Those keys are reported in
+`CompiledFilters.fallback_keys` (and tallied in `fallback_counts`, served
+by the feed-cache-stats/ endpoint) so we know which fields need proper
+support.
+"""
+import uuid
+from collections import Counter
+
+from django.db.models import Q
+
+POSTED_BY_KEYS = ("user_company", "user_id", "user_email")
+
+# job dict key -> (ORM lookup, accepted python type)
+DJANGO_FIELD_MAP = {
+    "id": ("id", uuid.UUID),
+    "job_title": ("job_title", str),
+    "location": ("location", str),
+    "job_type": ("job_type", str),
+    "salary": ("salary", str),
+    "job_description": ("job_description", str),
+    "is_active": ("is_active", bool),
+    "likes_count": ("likes_count", int),
+    "impressions": ("impressions", int),
+    "num_rejects": ("num_rejects", int),
+    "tags": ("tags", list),
+    "company": ("company__name", str),
+    "company_id": ("company_id", uuid.UUID),
+    "company_size": ("company__size", str),
+    "company_website": ("company__website", str),
+    "user_company": ("posted_by__company__name", str),
+    "user_id": ("posted_by__user__id", uuid.UUID),
+    "user_email": ("posted_by__user__email", str),
+}
+
+# Firestore caps the number of disjunctions in a single OR query
+FIRESTORE_MAX_DISJUNCTIONS = 30
+
+fallback_counts = Counter()
+
+
+class CompiledFilters:
+    """
+    Result of compiling a filters dict for one query layer.
+
+    pushdown: the predicate to hand to the query layer, or None when nothing
+        can be pushed down (either there are no filters, or some key fell back).
+    fallback_keys: keys that must be evaluated in memory.
+    matches_nothing: True when no key can ever match, so the query can be skipped.
+    """
+
+    def __init__(self, filters, pushdown=None, fallback_keys=None, matches_nothing=False):
+        self.filters = filters or {}
+        self.pushdown = pushdown
+        self.fallback_keys = list(fallback_keys or [])
+        self.matches_nothing = matches_nothing
+
+    @property
+    def needs_memory_filter(self):
+        return bool(self.fallback_keys)
+
+    def apply(self, jobs):
+        """Evaluate the filters in memory if the query layer couldn't."""
+        if self.matches_nothing:
+            return []
+        if not self.needs_memory_filter:
+            return jobs
+        return [job for job in jobs if matches_filters(job, self.filters)]
+
+
+def matches_filters(job, filters):
+    """In-memory reference implementation of the feed's OR filter semantics."""
+    for key, value in filters.items():
+        if key in POSTED_BY_KEYS:
+            posted_by = job.get("posted_by") or {}
+            if key in posted_by and posted_by[key] == value:
+                return True
+        if key in job and job[key] == value:
+            return True
+    return False
+
+
+def _report_fallback(target, keys):
+    if not keys:
+        return
+    for key in keys:
+        fallback_counts[(target, key)] += 1
+    print(f"[filters] {target} could not push down {sorted(keys)}; evaluating in memory")
+
+
+def fallback_stats():
+    """{"<target>:<key>": times the key had to be evaluated in memory}, for get_feed_cache_stats."""
+    return {f"{target}:{key}": count for (target, key), count in sorted(fallback_counts.items())}
+
+
+def _coerce(value, expected):
+    """
+    (matchable, value) for a filter value compared against a field of type expected.
+
+    Mirrors matches_filters' `==`: numbers and bools compare by value
+    (3.0 == 3, 1 == True), so they are converted to the field's type;
+    values that can never be equal to it are reported as unmatchable.
+    """
+    if value is None:
+        return True, None
+    if expected is uuid.UUID:
+        try:
+            # the feed compares the canonical string form, so only push that down
+            return isinstance(value, str) and str(uuid.UUID(value)) == value, value
+        except ValueError:
+            return False, value
+    if expected in (int, bool):
+        if not isinstance(value, (int, float)):
+            return False, value
+        if expected is bool:
+            return value in (0, 1), bool(value)
+        if isinstance(value, float) and not value.is_integer():
+            return False, value
+        return True, int(value)
+    return isinstance(value, expected), value
+
+
+def compile_django_filters(filters):
+    """Compile a filters dict into a Q object over JobPosting."""
+    if not filters:
+        return CompiledFilters(filters)
+
+    clauses = []
+    fallback = []
+    for key, value in filters.items():
+        if key not in DJANGO_FIELD_MAP:
+            # the serialized job either doesn't have this key or it isn't a column
+            fallback.append(key)
+            continue
+        lookup, expected = DJANGO_FIELD_MAP[key]
+        matchable, value = _coerce(value, expected)
+        if not matchable:
+            # a value of the wrong type can never equal the serialized field
+            continue
+        if value is None:
+            clauses.append(Q(**{f"{lookup}__isnull": True}))
+        else:
+            clauses.append(Q(**{lookup: value}))
+
+    if fallback:
+        _report_fallback("django", fallback)
+        return CompiledFilters(filters, fallback_keys=fallback)
+    if not clauses:
+        return CompiledFilters(filters, matches_nothing=True)
+
+    q = clauses[0]
+    for clause in clauses[1:]:
+        q |= clause
+    return CompiledFilters(filters, pushdown=q)
+
+
+def compile_firestore_filters(filters):
+    """Compile a filters dict into a Firestore FieldFilter / Or filter."""
+    from google.cloud.firestore_v1.base_query import FieldFilter, Or
+
+    if not filters:
+        return CompiledFilters(filters)
+
+    clauses = []
+    fallback = []
+    for key, value in filters.items():
+        if not isinstance(key, str) or not key or any(c in key for c in ".`[]*~/"):
+            # the feed treats these as literal top-level keys, which Firestore
+            # would parse as paths; nothing in job_posting_to_dict has them
+            continue
+        if isinstance(value, dict):
+            # map equality in Firestore doesn't line up with dict equality
+            fallback.append(key)
+            continue
+        if key in DJANGO_FIELD_MAP and DJANGO_FIELD_MAP[key][1] in (int, bool):
+            # Firestore doesn't equate 1 with true the way the feed's == does
+            matchable, value = _coerce(value, DJANGO_FIELD_MAP[key][1])
+            if not matchable:
+                continue
+        field_path = f"posted_by.{key}" if key in POSTED_BY_KEYS else key
+        clauses.append(FieldFilter(field_path, "==", value))
+
+    if not fallback and len(clauses) > FIRESTORE_MAX_DISJUNCTIONS:
+        fallback = list(filters.keys())
+
+    if fallback:
+        _report_fallback("firestore", fallback)
+        return CompiledFilters(filters, fallback_keys=fallback)
+    if not clauses:
+        return CompiledFilters(filters, matches_nothing=True)
+    if len(clauses) == 1:
+        return CompiledFilters(filters, pushdown=clauses[0])
+    return CompiledFilters(filters, pushdown=Or(clauses))
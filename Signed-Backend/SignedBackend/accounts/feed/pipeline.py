@@ -0,0 +1,116 @@
+"""
+Staged assembly of the job feed.
+
+get_job_postings builds a FeedContext from the request and runs it through
+a FeedPipeline: candidate generation, similarity, scoring, filtering,
+pagination and then hydration. Each stage is a FeedStage that reads and writes the
+context; the hydration stages only ever touch the jobs in the page window.
+
+The stage list comes from settings.FEED_PIPELINE_STAGES (dotted paths), so
+a new ranking signal or hydration step is a new FeedStage subclass plus a
+settings entry. Every stage is timed; the timings are logged and returned
+in the response's Server-Timing header.
+"""
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from ..fields import has_embedding
+from .cache import vector_stamp
+
+DEFAULT_FEED_PIPELINE_STAGES = [
+    "accounts.feed.stages.ResumeStage",
+    "accounts.feed.stages.CandidateStage",
+    "accounts.feed.stages.SimilarityStage",
+    "accounts.feed.stages.ScoringStage",
+    "accounts.feed.stages.FilterStage",
+    "accounts.feed.stages.PaginationStage",
+    "accounts.feed.stages.UserFlagsStage",
+    "accounts.feed.stages.DefaultsStage",
+    "accounts.feed.stages.ApplicantInfoStage",
+]
+
+
+class FeedError(Exception):
+    """Raised by a stage to end the request with an error response."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class FeedContext:
+    def __init__(self, *, page_size, start_index, filters=None, fetch_inactive=False,
+                 get_applicant_info=False, user=None, applicant_profile=None,
+                 query_key=None, resume_from=None):
+        # request
+        self.page_size = page_size
+        self.start_index = start_index
+        self.filters = filters
+        self.fetch_inactive = fetch_inactive
+        self.get_applicant_info = get_applicant_info
+        self.user = user
+        self.applicant_profile = applicant_profile
+        self.user_embedding = applicant_profile.vector_embedding if applicant_profile else None
+        self.user_embedding_version = applicant_profile.embedding_model_version if applicant_profile else None
+        self.user_stamp = vector_stamp(self.user_embedding) if has_embedding(self.user_embedding) else None
+        self.query_key = query_key
+        self.resume_from = resume_from
+        # a re-rank for a cursor scores as of the first page, so its (score, id) still lines up
+        self.scored_at = (resume_from or {}).get("scored_at") or time.time()
+
+        # candidate generation / scoring / filtering
+        self.compiled_filters = None
+        self.candidates = []
+        self.similarities = None
+        self.scores = None
+        self.ranked = False
+
+        # pagination
+        self.snapshot = None
+        self.total_count = 0
+        self.end_index = start_index + page_size
+        self.page_jobs = []
+
+        # hydration
+        self.applicant_stats = None
+
+        self.timings = {}
+
+    @property
+    def has_next(self):
+        return self.end_index < self.total_count
+
+    def server_timing(self):
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.timings.items())
+
+
+class FeedStage:
+    """One step of the feed pipeline. Subclasses implement run(ctx)."""
+
+    name = "stage"
+
+    def run(self, ctx):
+        raise NotImplementedError
+
+
+class FeedPipeline:
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def run(self, ctx):
+        for stage in self.stages:
+            started = time.perf_counter()
+            try:
+                stage.run(ctx)
+            finally:
+                ctx.timings[stage.name] = (time.perf_counter() - started) * 1000
+        print(f"[feed] {ctx.server_timing()}")
+        return ctx
+
+
+def build_feed_pipeline():
+    paths = getattr(settings, "FEED_PIPELINE_STAGES", DEFAULT_FEED_PIPELINE_STAGES)
+    return FeedPipeline(import_string(path)() for path in paths)
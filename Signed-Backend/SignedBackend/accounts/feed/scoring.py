@@ -0,0 +1,99 @@
+"""
+Multi-signal scoring for the job feed.
+
+A job's feed score is a weighted blend of signals computed as numpy column
+operations over the whole candidate set:
+
+    similarity   cosine similarity to the user's embedding (0 without one)
+    recency      exponential decay on the age of date_posted
+    likes        likes_count, log-scaled against the most-liked candidate
+    impressions  impressions, log-scaled the same way
+    rejects      num_rejects, log-scaled the same way (weight it negatively)
+
+Weights come from settings.FEED_SCORING_WEIGHTS; signals left out of the
+mapping get weight 0.
+"""
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+from django.conf import settings
+
+DEFAULT_FEED_SCORING_WEIGHTS = {
+    "similarity": 1.0,
+    "recency": 0.15,
+    "likes": 0.1,
+    "impressions": 0.0,
+    "rejects": -0.1,
+}
+SIGNALS = tuple(DEFAULT_FEED_SCORING_WEIGHTS)
+
+
+def _epoch_seconds(value):
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return math.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return math.nan
+
+
+def _count_column(jobs, key):
+    return np.fromiter((job.get(key) or 0 for job in jobs), dtype=np.float64, count=len(jobs))
+
+
+def _log_scaled(column):
+    """log1p(x) / log1p(max x): 0 for nothing, 1 for the largest candidate."""
+    column = np.log1p(np.maximum(column, 0))
+    peak = column.max() if len(column) else 0.0
+    return column / peak if peak > 0 else np.zeros_like(column)
+
+
+class ScoringEngine:
+    def __init__(self, weights=None, recency_half_life_days=14):
+        weights = DEFAULT_FEED_SCORING_WEIGHTS if weights is None else weights
+        unknown = set(weights) - set(SIGNALS)
+        if unknown:
+            raise ValueError(f"Unknown feed scoring signals: {sorted(unknown)}")
+        self.weights = {signal: float(weights.get(signal, 0.0)) for signal in SIGNALS}
+        self.recency_half_life_days = recency_half_life_days
+
+    def signals(self, jobs, similarity, now=None):
+        """Each signal as a float64 column aligned with jobs."""
+        now = (now or datetime.now(timezone.utc)).timestamp()
+        posted = np.fromiter(
+            (_epoch_seconds(job.get('date_posted')) for job in jobs), dtype=np.float64, count=len(jobs)
+        )
+        age_days = np.maximum(now - posted, 0) / 86400
+        recency = np.nan_to_num(np.exp2(-age_days / self.recency_half_life_days), nan=0.0)
+        return {
+            "similarity": np.asarray(similarity, dtype=np.float64),
+            "recency": recency,
+            "likes": _log_scaled(_count_column(jobs, 'likes_count')),
+            "impressions": _log_scaled(_count_column(jobs, 'impressions')),
+            "rejects": _log_scaled(_count_column(jobs, 'num_rejects')),
+        }
+
+    def score(self, jobs, similarity, now=None):
+        """Blended feed score of every job, as a float32 array."""
+        scores = np.zeros(len(jobs), dtype=np.float64)
+        columns = None
+        for signal, weight in self.weights.items():
+            if not weight:
+                continue
+            if columns is None:
+                columns = self.signals(jobs, similarity, now)
+            scores += weight * columns[signal]
+        return scores.astype(np.float32)
+
+
+feed_scoring_engine = ScoringEngine(
+    weights=getattr(settings, "FEED_SCORING_WEIGHTS", DEFAULT_FEED_SCORING_WEIGHTS),
+    recency_half_life_days=getattr(settings, "FEED_RECENCY_HALF_LIFE_DAYS", 14),
+)
@@ -0,0 +1,153 @@
+"""
+Where the feed reads job postings from.
+
+The Django database is the source of truth for job postings; the Firestore
+collection is a mirror kept up to date by the write paths for the mobile
+client. settings.FEED_DATA_SOURCE picks the store the feed reads from
+("database" by default, or "firestore"), so the two can be compared; the
+candidates stage's Server-Timing entry shows the difference.
+
+fetch() returns jobs in the shape of job_posting_to_dict. candidates()
+returns them in job id order (the feed's tie-break order), either in that
+shape too or, for sources with complete_candidates = False, with just the
+RANKING_FIELDS; the feed then hydrates only the page with fetch().
+"""
+from django.conf import settings
+from django.db.models import BooleanField, ExpressionWrapper, Prefetch, Q
+
+from ..firebase_admin import db
+from ..models import ApplicantProfile, JobPosting
+from .filters import CompiledFilters, compile_django_filters, compile_firestore_filters
+
+# what ranking reads from a candidate; has_vector stands in for vector_embedding
+RANKING_FIELDS = (
+    "id", "date_posted", "date_updated", "is_active", "likes_count", "impressions", "num_rejects",
+    "embedding_model_version", "has_vector",
+)
+
+
+class FeedSource:
+    name = "source"
+    # False if candidates() returns only the RANKING_FIELDS
+    complete_candidates = True
+
+    def candidates(self, filters, fetch_inactive):
+        """
+        Jobs that may appear in the feed.
+
+        Returns:
+            (list of job dicts, CompiledFilters) -- the caller applies
+            whatever part of the filters couldn't be pushed down.
+        """
+        raise NotImplementedError
+
+    def fetch(self, job_ids):
+        """The given jobs, in the order of job_ids (missing ones are skipped)."""
+        raise NotImplementedError
+
+    def vectors(self, job_ids):
+        """{job id: vector_embedding} for candidates that came without their vector."""
+        return {}
+
+
+class DatabaseFeedSource(FeedSource):
+    name = "database"
+    complete_candidates = False
+
+    def queryset(self):
+        return (
+            JobPosting.objects
+            .select_related('company', 'company_logo', 'posted_by__user', 'posted_by__company')
+            .prefetch_related(
+                'media_items',
+                'personality_preferences',
+                Prefetch('applicants', queryset=ApplicantProfile.objects.select_related('user')),
+            )
+        )
+
+    def candidates(self, filters, fetch_inactive):
+        from ..job_postings import job_posting_to_dict
+
+        compiled = compile_django_filters(filters)
+        if compiled.matches_nothing:
+            return [], compiled
+
+        def restrict(postings):
+            if not fetch_inactive:
+                postings = postings.filter(is_active=True)
+            if compiled.pushdown is not None:
+                postings = postings.filter(compiled.pushdown)
+            return postings.order_by('id')
+
+        if compiled.needs_memory_filter:
+            # keys the query can't evaluate are matched against whole jobs here
+            # (the rare path, counted in the fallback stats), so the caller doesn't have to
+            matching = compiled.apply([job_posting_to_dict(posting) for posting in restrict(self.queryset())])
+            for job in matching:
+                job["has_vector"] = job["vector_embedding"] is not None
+            return [{key: job[key] for key in RANKING_FIELDS} for job in matching], CompiledFilters(filters)
+
+        rows = restrict(JobPosting.objects.all()).values(
+            *RANKING_FIELDS[:-1],
+            has_vector=ExpressionWrapper(Q(vector_embedding__isnull=False), output_field=BooleanField()),
+        )
+        jobs = list(rows)
+        for job in jobs:
+            job["id"] = str(job["id"])
+        return jobs, compiled
+
+    def fetch(self, job_ids):
+        from ..job_postings import job_posting_to_dict
+
+        by_id = {str(posting.id): posting for posting in self.queryset().filter(id__in=job_ids)}
+        return [job_posting_to_dict(by_id[str(job_id)]) for job_id in job_ids if str(job_id) in by_id]
+
+    def vectors(self, job_ids):
+        rows = JobPosting.objects.filter(id__in=list(job_ids)).values_list('id', 'vector_embedding')
+        return {str(job_id): vector for job_id, vector in rows}
+
+
+class FirestoreFeedSource(FeedSource):
+    name = "firestore"
+
+    def candidates(self, filters, fetch_inactive):
+        compiled = compile_firestore_filters(filters)
+        if compiled.matches_nothing:
+            return [], compiled
+
+        job_postings_ref = db.collection("job_postings")
+        if compiled.pushdown is not None:
+            job_postings_ref = job_postings_ref.where(filter=compiled.pushdown)
+
+        candidates = []
+        for doc in job_postings_ref.stream():
+            job_data = doc.to_dict()
+            job_data['id'] = doc.id  # Add the document ID
+            if job_data.get('is_active', True) or fetch_inactive:
+                candidates.append(job_data)
+        return candidates, compiled
+
+    def fetch(self, job_ids):
+        collection = db.collection("job_postings")
+        docs = db.get_all([collection.document(str(job_id)) for job_id in job_ids])
+        by_id = {}
+        for doc in docs:
+            if doc.exists:
+                job_data = doc.to_dict()
+                job_data['id'] = doc.id
+                by_id[doc.id] = job_data
+        return [by_id[str(job_id)] for job_id in job_ids if str(job_id) in by_id]
+
+
+FEED_SOURCES = {
+    DatabaseFeedSource.name: DatabaseFeedSource,
+    FirestoreFeedSource.name: FirestoreFeedSource,
+}
+
+
+def get_feed_source(name=None):
+    name = name or getattr(settings, "FEED_DATA_SOURCE", DatabaseFeedSource.name)
+    try:
+        return FEED_SOURCES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown FEED_DATA_SOURCE {name!r}; expected one of {sorted(FEED_SOURCES)}")
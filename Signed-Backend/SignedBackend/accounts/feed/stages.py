@@ -0,0 +1,347 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ..embedding_tasks import request_reembed
+from ..embeddings import current_version
+from ..fields import has_embedding
+from ..models import JobLike
+from ..vector_index import job_vector_index, top_k_indices
+from .applicants import (
+    APPLICANT_PREVIEW_SIZE,
+    load_applicant_facets,
+    load_applicant_summaries,
+    load_job_applicant_emails,
+)
+from .cache import ranked_feed_cache
+from .cursors import SNAPSHOT_MAX_ITEMS, RankingSnapshot, seek_after
+from .pipeline import FeedError, FeedStage
+from .scoring import feed_scoring_engine
+from .sources import get_feed_source
+
+
+def similarity_scores(user_embedding, jobs, user_version, load_vectors=None):
+    """
+    Cosine similarity of every job to a user embedding, as a float32 array.
+
+    Scores come from the in-memory job vector index (current embedding model
+    version only) in a single matrix-vector product. Jobs the index doesn't
+    hold (inactive ones, ones written by another worker since its last
+    reload, or any job when the user's vector is on an older version) fall
+    back to their own vector_embedding, read with load_vectors for jobs that
+    came without one. Vectors of different versions score 0.
+    """
+    if user_version == current_version().name:
+        scores = job_vector_index.scores(user_embedding, [job['id'] for job in jobs])
+    else:
+        scores = np.full(len(jobs), np.nan, dtype=np.float32)
+    missing = np.flatnonzero(np.isnan(scores))
+    if len(missing):
+        user_vector = np.asarray(user_embedding, dtype=np.float32)
+        user_norm = np.linalg.norm(user_vector)
+        unloaded = [
+            jobs[i]['id'] for i in missing
+            if 'vector_embedding' not in jobs[i] and jobs[i].get('embedding_model_version') == user_version
+        ]
+        loaded = load_vectors(unloaded) if unloaded and load_vectors is not None else {}
+        for i in missing:
+            job_embedding = jobs[i].get('vector_embedding', loaded.get(jobs[i]['id']))
+            if not has_embedding(job_embedding) or user_norm == 0 or jobs[i].get('embedding_model_version') != user_version:
+                scores[i] = 0.0
+                continue
+            job_vector = np.asarray(job_embedding, dtype=np.float32)
+            job_norm = np.linalg.norm(job_vector)
+            scores[i] = float(user_vector @ job_vector / (user_norm * job_norm)) if job_norm else 0.0
+    return scores
+
+
+class ResumeStage(FeedStage):
+    """Pick up a stored ranking from the cursor's snapshot or the per-user cache."""
+
+    name = "resume"
+
+    def run(self, ctx):
+        # applicant stats cover the whole feed, so they always need a full pass
+        if ctx.get_applicant_info:
+            return
+
+        snapshot = None
+        if ctx.resume_from:
+            snapshot = RankingSnapshot.load(ctx.resume_from["snapshot_id"], ctx.query_key)
+        if snapshot is None and ctx.user_stamp:
+            snapshot = ranked_feed_cache.get(ctx.user.id, ctx.query_key, ctx.user_stamp)
+        if snapshot is None:
+            return
+
+        if ctx.resume_from:
+            position = snapshot.resume_position(ctx.resume_from, ctx.page_size)
+            if position is None:
+                return
+            ctx.start_index = position
+        elif not snapshot.covers(ctx.start_index, ctx.page_size):
+            return
+        ctx.snapshot = snapshot
+
+
+class CandidateStage(FeedStage):
+    """Read candidate jobs from the feed source, pushing the filters down where possible."""
+
+    name = "candidates"
+
+    def run(self, ctx):
+        if ctx.snapshot is not None:
+            return
+
+        source = get_feed_source()
+        ctx.candidates, ctx.compiled_filters = source.candidates(ctx.filters, ctx.fetch_inactive)
+        print(f"Found {len(ctx.candidates)} job postings from {source.name}")
+
+
+class SimilarityStage(FeedStage):
+    """Similarity of every candidate to the user's embedding (0 without one)."""
+
+    name = "similarity"
+
+    def run(self, ctx):
+        if ctx.snapshot is not None:
+            return
+
+        ctx.similarities = np.zeros(len(ctx.candidates), dtype=np.float32)
+        if ctx.user_stamp and ctx.candidates:
+            try:
+                ctx.similarities = similarity_scores(
+                    ctx.user_embedding, ctx.candidates, ctx.user_embedding_version,
+                    load_vectors=get_feed_source().vectors,
+                )
+                ctx.ranked = True
+            except Exception as e:
+                print(f"Error sorting by similarity: {e}")
+        elif ctx.user_stamp:
+            ctx.ranked = True
+
+        for job, score in zip(ctx.candidates, ctx.similarities.tolist()):
+            job['similarity_score'] = score
+
+        self.queue_stale(ctx)
+
+    @staticmethod
+    def queue_stale(ctx):
+        """Re-embed vectors from an older model version that this request ran into."""
+        version = current_version().name
+        try:
+            if ctx.user_stamp and ctx.user_embedding_version != version:
+                request_reembed("applicants", [ctx.applicant_profile.pk])
+            stale_jobs = [
+                job['id'] for job in ctx.candidates
+                if job.get('has_vector', has_embedding(job.get('vector_embedding')))
+                and job.get('embedding_model_version') != version
+            ]
+            if stale_jobs:
+                request_reembed("jobs", stale_jobs)
+        except Exception as e:
+            print(f"Error queueing stale embeddings: {e}")
+
+
+class ScoringStage(FeedStage):
+    """Blend similarity with recency and engagement into the feed score."""
+
+    name = "scoring"
+
+    def run(self, ctx):
+        if ctx.snapshot is not None:
+            return
+
+        ctx.scores = feed_scoring_engine.score(
+            ctx.candidates, ctx.similarities, now=datetime.fromtimestamp(ctx.scored_at, timezone.utc)
+        )
+
+
+class FilterStage(FeedStage):
+    """Apply the filters the query layer couldn't evaluate (OR semantics)."""
+
+    name = "filtering"
+
+    def run(self, ctx):
+        if ctx.snapshot is not None or ctx.compiled_filters is None:
+            return
+        if not ctx.compiled_filters.needs_memory_filter:
+            return
+
+        kept = ctx.compiled_filters.apply(ctx.candidates)
+        kept_ids = {id(job) for job in kept}
+        mask = np.fromiter((id(job) in kept_ids for job in ctx.candidates), dtype=bool, count=len(ctx.candidates))
+        ctx.candidates = kept
+        ctx.similarities = ctx.similarities[mask]
+        ctx.scores = ctx.scores[mask]
+
+
+class PaginationStage(FeedStage):
+    """
+    Order the candidates, cut the page window and store the ranking snapshot.
+
+    Only the jobs this page and the snapshot cover are put in exact order
+    (argpartition); resuming by (score, id) needs the full order. Ties go to
+    the lower job id: the sources return candidates in ascending id order and
+    the sort is stable, which is the order seek_after assumes.
+    """
+
+    name = "pagination"
+
+    def run(self, ctx):
+        if ctx.snapshot is not None:
+            self._page_from_snapshot(ctx)
+            return
+
+        ctx.total_count = len(ctx.candidates)
+        ctx.end_index = ctx.start_index + ctx.page_size
+
+        k = None if ctx.resume_from else ctx.end_index + SNAPSHOT_MAX_ITEMS
+        order = top_k_indices(ctx.scores, k)
+        ranked_ids = [ctx.candidates[i]['id'] for i in order]
+        ranked_scores = ctx.scores[order].tolist()
+        ranked_similarities = ctx.similarities[order].tolist()
+
+        if ctx.resume_from:
+            # the snapshot expired or ran out: resume after the last (score, id) returned
+            ctx.start_index = seek_after(ranked_ids, ranked_scores, ctx.resume_from["score"], ctx.resume_from["job_id"])
+            ctx.end_index = ctx.start_index + ctx.page_size
+
+        if ctx.has_next or ctx.ranked:
+            snapshot_end = ctx.end_index + SNAPSHOT_MAX_ITEMS
+            ctx.snapshot = RankingSnapshot.create(
+                ctx.query_key, ranked_ids[:snapshot_end], ranked_scores[:snapshot_end], ctx.total_count,
+                similarities=ranked_similarities[:snapshot_end], scored_at=ctx.scored_at,
+            )
+            if ctx.ranked and not ctx.get_applicant_info:
+                ranked_feed_cache.put(ctx.user.id, ctx.query_key, ctx.user_stamp, ctx.snapshot)
+
+        page = [ctx.candidates[i] for i in order[ctx.start_index:ctx.end_index]]
+        if get_feed_source().complete_candidates:
+            ctx.page_jobs = page
+        else:
+            # the candidates only carried the ranking fields
+            ctx.page_jobs = self._fetch_page(ctx, {job['id']: job['similarity_score'] for job in page})
+
+    def _page_from_snapshot(self, ctx):
+        snapshot = ctx.snapshot
+        ctx.total_count = snapshot.total_count
+        ctx.end_index = ctx.start_index + ctx.page_size
+        ctx.page_jobs = self._fetch_page(ctx, dict(zip(
+            snapshot.job_ids[ctx.start_index:ctx.end_index],
+            snapshot.similarities[ctx.start_index:ctx.end_index],
+        )))
+
+    @staticmethod
+    def _fetch_page(ctx, page_similarities):
+        # only this page's documents are read
+        page_jobs = [
+            job for job in get_feed_source().fetch(list(page_similarities))
+            if job.get('is_active', True) or ctx.fetch_inactive
+        ]
+        for job in page_jobs:
+            job['similarity_score'] = page_similarities[job['id']]
+        return page_jobs
+
+
+class UserFlagsStage(FeedStage):
+    """Mark page jobs the applicant has liked, bookmarked or whose company they follow."""
+
+    name = "hydrate_user_flags"
+
+    def run(self, ctx):
+        user = ctx.user
+        if not (user and user.role == 'applicant'):
+            # if no user or not an applicant, set is_liked and is_bookmarked to false
+            for job in ctx.page_jobs:
+                job['is_liked'] = False
+                job['is_bookmarked'] = False
+                job['is_following_company'] = False
+            return
+
+        page_ids = [job['id'] for job in ctx.page_jobs]
+        liked_job_ids = set(
+            str(job_id) for job_id in
+            JobLike.objects.filter(user=user, job_posting_id__in=page_ids).values_list('job_posting_id', flat=True)
+        )
+        bookmarked_job_ids = set()
+        followed_company_ids = set()
+        if ctx.applicant_profile:
+            bookmarked_job_ids = set(
+                str(job_id) for job_id in
+                ctx.applicant_profile.bookmarked_jobs.filter(id__in=page_ids).values_list('id', flat=True)
+            )
+            followed_company_ids = set(
+                str(cid) for cid in ctx.applicant_profile.followed_companies.values_list("id", flat=True)
+            )
+
+        for job in ctx.page_jobs:
+            job['is_liked'] = job.get('id') in liked_job_ids
+            job['is_bookmarked'] = job.get('id') in bookmarked_job_ids
+            job['is_following_company'] = job.get('company_id') in followed_company_ids
+
+
+class DefaultsStage(FeedStage):
+    """Fill fields older Firestore documents may lack."""
+
+    name = "hydrate_defaults"
+
+    def run(self, ctx):
+        # ensures likes_count is included (default to 0 if not present from Firebase)
+        for job in ctx.page_jobs:
+            if 'likes_count' not in job:
+                job['likes_count'] = 0
+
+
+class ApplicantInfoStage(FeedStage):
+    """
+    With get_applicant_info, compute applicant stats over the whole feed and
+    give each page job a short applicant preview plus num_applicants. The
+    full lists are served by the jobs/<id>/applicants/ endpoint.
+    """
+
+    name = "hydrate_applicants"
+
+    def run(self, ctx):
+        if not ctx.get_applicant_info:
+            return
+
+        applicants_by_job = {job['id']: job['applicants'] for job in ctx.candidates if 'applicants' in job}
+        # candidates with just the ranking fields: one query for all their applicants
+        applicants_by_job.update(load_job_applicant_emails(
+            job['id'] for job in ctx.candidates if 'applicants' not in job
+        ))
+        unique_applicants = list(dict.fromkeys(
+            applicant for job in ctx.candidates for applicant in applicants_by_job.get(job['id'], [])
+        ))
+        facets = load_applicant_facets(unique_applicants)
+        for applicant in unique_applicants:
+            if applicant not in facets:
+                raise FeedError(f"applicant {applicant} not found", status=404)
+
+        previews = load_applicant_summaries(
+            applicant for job in ctx.page_jobs for applicant in job.get("applicants", [])[:APPLICANT_PREVIEW_SIZE]
+        )
+        for job in ctx.page_jobs:
+            emails = job.get("applicants", [])
+            job["num_applicants"] = len(emails)
+            job["applicants"] = [previews[applicant] for applicant in emails[:APPLICANT_PREVIEW_SIZE]]
+
+        # compute applicant stats
+        major_count = {}
+        school_count = {}
+        personality_count = {}
+
+        for major, school, personality_type in facets.values():
+            if major:
+                major_count[major] = major_count.get(major, 0) + 1
+            if school:
+                school_count[school] = school_count.get(school, 0) + 1
+            if personality_type:
+                personality_count[personality_type] = personality_count.get(personality_type, 0) + 1
+
+        ctx.applicant_stats = {
+            'unique_applicants': len(unique_applicants),
+            'most_common_majors': sorted(major_count.items(), key=lambda x: x[1], reverse=True)[:5],
+            'most_common_schools': sorted(school_count.items(), key=lambda x: x[1], reverse=True)[:5],
+            'most_common_personalities': sorted(personality_count.items(), key=lambda x: x[1], reverse=True)[:5],
+        }
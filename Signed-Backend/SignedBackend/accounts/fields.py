@@ -0,0 +1,75 @@
+"""
+Packed binary storage for embedding vectors.
+
+EmbeddingField keeps a vector as the raw bytes of a float32 (or float16)
+array instead of a JSON list of Python floats: a 384-dim MiniLM embedding
+is 1.5 KB as float32 (768 bytes as float16) rather than ~7-8 KB of JSON
+text, and loading it is an np.frombuffer over the column bytes instead of
+a JSON parse plus a list-to-array conversion.
+
+Values come back from the database as read-only 1-D numpy arrays (float16
+columns are widened to float32 on load). Assign a list, a numpy array or
+None. Use has_embedding() rather than truthiness to test for a vector.
+"""
+import base64
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db import models
+
+EMBEDDING_DTYPES = ("float32", "float16")
+
+
+def has_embedding(vector):
+    """True if vector holds at least one value (works for lists and arrays)."""
+    return vector is not None and len(vector) > 0
+
+
+class EmbeddingField(models.BinaryField):
+    description = "Packed embedding vector"
+
+    def __init__(self, *args, dtype="float32", **kwargs):
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"EmbeddingField dtype must be one of {EMBEDDING_DTYPES}, not {dtype!r}")
+        self.dtype = dtype
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.dtype != "float32":
+            kwargs["dtype"] = self.dtype
+        return name, path, args, kwargs
+
+    def _decode(self, data):
+        vector = np.frombuffer(data, dtype=self.dtype)
+        if self.dtype != "float32":
+            vector = vector.astype(np.float32)
+        return vector
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return self._decode(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, np.ndarray):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return self._decode(value)
+        if isinstance(value, str):
+            return self._decode(base64.b64decode(value.encode("ascii")))
+        try:
+            return np.asarray(value, dtype=np.float32).reshape(-1)
+        except (TypeError, ValueError):
+            raise ValidationError("Enter a list of numbers.", code="invalid")
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        return np.ascontiguousarray(value, dtype=self.dtype).reshape(-1).tobytes()
+
+    def value_to_string(self, obj):
+        value = self.get_prep_value(self.value_from_object(obj))
+        return None if value is None else base64.b64encode(value).decode("ascii")
@@ -0,0 +1,62 @@
+"""
+Targeted writes to the Firestore mirror of job postings.
+
+The job_posting.mirror task rewrites a whole document from
+job_posting_to_dict, which reads the posting's media items, applicants and
+personality preferences and uploads its embedding. Write paths that change
+one or two fields use update_job_document instead, with field transforms
+(array_union, increment, ...) where the change is relative, so their cost
+doesn't grow with the posting.
+
+A document that doesn't exist yet (the mirror task hasn't run for a new
+posting) can't be updated; pass rebuild to write the full document then.
+"""
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1 import ArrayUnion, Increment
+
+from .firebase_admin import db
+
+JOB_POSTINGS_COLLECTION = "job_postings"
+
+
+def job_document(job_id):
+    return db.collection(JOB_POSTINGS_COLLECTION).document(str(job_id))
+
+
+def increment(amount=1):
+    return Increment(amount)
+
+
+def array_union(*values):
+    return ArrayUnion(list(values))
+
+
+def update_job_document(job_id, fields, rebuild=None):
+    """
+    Apply fields (values or transforms) to a job posting's mirror document.
+
+    Args:
+        rebuild: called for the full document if there is none to update
+            yet; without it a missing document is left missing
+
+    Returns:
+        True if the document was updated, False if it was rebuilt or missing
+    """
+    try:
+        job_document(job_id).update(fields)
+        return True
+    except NotFound:
+        if rebuild is not None:
+            job_document(job_id).set(rebuild())
+        return False
+
+
+def add_applicant(job_posting, applicant_email):
+    """Mirror a new application: the email joins applicants and num_applicants goes up by one."""
+    from .job_postings import job_posting_to_dict
+
+    return update_job_document(
+        job_posting.id,
+        {"applicants": array_union(applicant_email), "num_applicants": increment()},
+        rebuild=lambda: job_posting_to_dict(job_posting),
+    )
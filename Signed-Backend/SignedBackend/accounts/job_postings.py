@@ -1,12 +1,31 @@
+from django.conf import settings
 from django.db import transaction, models
 from .models import MediaItem, JobPosting, EmployerProfile, ApplicantProfile, User, PersonalityType, JobLike, Notification, Company
-from .firebase_admin import db
+from .firestore_mirror import add_applicant, update_job_document
+from .embeddings import encode_one, is_current, stats as embedding_stats
+from .embedding_tasks import request_reembed
+from .embeddings.texts import job_embedding_text
+from .fields import has_embedding
+from .notifications import create_job_notifications, run_fanout
+from .notification_stream import get_broker
+from .tasks import enqueue
+from .vector_index import applicant_vector_index, scan_chunks, stream_vectors
+from .feed.cache import ranked_feed_cache
+from .feed.filters import fallback_stats as filter_fallback_stats
+from .feed.applicants import (
+    APPLICANTS_MAX_PAGE_SIZE,
+    APPLICANTS_PAGE_SIZE,
+    decode_applicants_cursor,
+    encode_applicants_cursor,
+    page_job_applicants,
+)
+from .feed.cursors import InvalidCursor, decode_cursor, encode_cursor, feed_query_key
+from .feed.pipeline import FeedContext, FeedError, build_feed_pipeline
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.http import HttpResponse
 import json
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import csv
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
@@ -15,13 +34,13 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.units import inch
 from datetime import datetime
 
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
 learning_rate = 0.03
+feed_pipeline = build_feed_pipeline()
 
 def cosine_similarity(vec1, vec2):
-    # Convert to numpy arrays
-    v1 = np.array(vec1)
-    v2 = np.array(vec2)
+    # Convert to numpy arrays (stored embeddings already are, so no copy is made)
+    v1 = np.asarray(vec1, dtype=np.float32)
+    v2 = np.asarray(vec2, dtype=np.float32)
 
     dot_product = np.dot(v1, v2)
     magnitude = np.linalg.norm(v1) * np.linalg.norm(v2)
@@ -31,15 +50,15 @@ def cosine_similarity(vec1, vec2):
     return dot_product / magnitude
 
 def normalize_vector(vector):
-    vector = np.array(vector)
+    vector = np.asarray(vector, dtype=np.float32)
     magnitude = np.linalg.norm(vector)
     vector = vector / magnitude
     return vector
 
 def increase_similarity(original_vector, reference_vector):
 
-    v1 = np.array(original_vector)
-    v2 = np.array(reference_vector)
+    v1 = np.asarray(original_vector, dtype=np.float32)
+    v2 = np.asarray(reference_vector, dtype=np.float32)
     v1_normal = normalize_vector(v1)
     v2_normal = normalize_vector(v2)
     new_vector = ((1 - learning_rate) * v1_normal) + (learning_rate * v2_normal)
@@ -47,39 +66,36 @@ def increase_similarity(original_vector, reference_vector):
     return v3_normal
 
 def decrease_similarity(original_vector, reference_vector):
-    v1 = np.array(original_vector)
-    v2 = np.array(reference_vector)
+    v1 = np.asarray(original_vector, dtype=np.float32)
+    v2 = np.asarray(reference_vector, dtype=np.float32)
     v1_normal = normalize_vector(v1)
     v2_normal = normalize_vector(v2)
     new_vector = v1_normal - (learning_rate * v2_normal)
     v3_normal = normalize_vector(new_vector)
     return v3_normal
 
+def same_embedding_version(applicant_profile, job_posting):
+    """
+    True if both vectors come from the same embedding model version.
 
+    Otherwise they can't be combined; whichever is stale is queued for
+    re-embedding.
+    """
+    if applicant_profile.embedding_model_version == job_posting.embedding_model_version:
+        return True
+    if not is_current(applicant_profile.embedding_model_version):
+        request_reembed("applicants", [applicant_profile.pk])
+    if not is_current(job_posting.embedding_model_version):
+        request_reembed("jobs", [job_posting.pk])
+    return False
 
 def generate_job_embedding(job_title, job_description, tags, location, salary, company_size, job_type):
     """Generate vector embedding from job posting data"""
     try:
-        # Combine all text fields into a single text
-        text_parts = [
-            f"Job Title: {job_title}",
-            f"Description: {job_description or ''}",
-            f"Location: {location}",
-            f"Job Type: {job_type}",
-            f"Salary: {salary or ''}",
-            f"Company Size: {company_size or ''}",
-            f"Tags: {', '.join(tags) if tags else ''}"
-        ]
-        combined_text = " ".join(text_parts)
+        combined_text = job_embedding_text(job_title, job_description, tags, location, salary, company_size, job_type)
         
         if combined_text.strip():
-            vector_new = embedding_model.encode([combined_text])[0]
-            # Normalize the vector to unit length
-            norm = np.linalg.norm(vector_new)
-            if norm > 0:
-                return (vector_new / norm).tolist()
-            else:
-                return vector_new.tolist()
+            return encode_one(combined_text)
         return None
     except Exception as e:
         print(f"Error generating job embedding: {e}")
@@ -96,29 +112,36 @@ def apply_to_job(request):
         
         job_posting = JobPosting.objects.get(id=job_id)
         
-        if not applicant_profile.vector_embedding:
+        if not has_embedding(applicant_profile.vector_embedding):
             return Response({
                 'status': 'error',
                 'message': 'User does not have an embedding vector'
             }, status=400)
             
-        if not job_posting.vector_embedding:
+        if not has_embedding(job_posting.vector_embedding):
             return Response({
                 'status': 'error',
                 'message': 'Job posting does not have an embedding vector'
             }, status=400)
         
-        user_embedding = np.array(applicant_profile.vector_embedding)
-        job_embedding = np.array(job_posting.vector_embedding)
-        
-        new_embedding = increase_similarity(user_embedding, job_embedding)
-        
-        applicant_profile.vector_embedding = new_embedding.tolist()
-        applicant_profile.save()
+        if same_embedding_version(applicant_profile, job_posting):
+            user_embedding = applicant_profile.vector_embedding
+            job_embedding = job_posting.vector_embedding
+
+            new_embedding = increase_similarity(user_embedding, job_embedding)
 
-        job_posting.applicants.add(applicant_profile)
+            applicant_profile.vector_embedding = new_embedding
+            applicant_profile.save()
+            ranked_feed_cache.invalidate_user(applicant_profile.user_id)
 
-        db.collection("job_postings").document(str(job_id)).set(job_posting_to_dict(job_posting))
+        with transaction.atomic():
+            # the (posting, applicant) row is unique: of concurrent applications only one inserts it
+            _, newly_applied = JobPosting.applicants.through.objects.get_or_create(
+                jobposting=job_posting, applicantprofile=applicant_profile
+            )
+            if newly_applied:
+                # transforms, not a rewrite: the cost doesn't grow with the number of applicants
+                transaction.on_commit(lambda: add_applicant(job_posting, applicant_profile.user.email))
         
         return Response({
             'status': 'success',
@@ -157,31 +180,34 @@ def reject_job(request):
         
         job_posting = JobPosting.objects.get(id=job_id)
         
-        if not applicant_profile.vector_embedding:
+        if not has_embedding(applicant_profile.vector_embedding):
             return Response({
                 'status': 'error',
                 'message': 'User does not have an embedding vector'
             }, status=400)
             
-        if not job_posting.vector_embedding:
+        if not has_embedding(job_posting.vector_embedding):
             return Response({
                 'status': 'error',
                 'message': 'Job posting does not have an embedding vector'
             }, status=400)
         
-        user_embedding = np.array(applicant_profile.vector_embedding)
-        job_embedding = np.array(job_posting.vector_embedding)
-        
-        new_embedding = decrease_similarity(user_embedding, job_embedding)
-        
-        applicant_profile.vector_embedding = new_embedding.tolist()
-        applicant_profile.save()
+        if same_embedding_version(applicant_profile, job_posting):
+            user_embedding = applicant_profile.vector_embedding
+            job_embedding = job_posting.vector_embedding
+
+            new_embedding = decrease_similarity(user_embedding, job_embedding)
 
-        job_posting.num_rejects += 1
-        job_posting.save()
+            applicant_profile.vector_embedding = new_embedding
+            applicant_profile.save()
+            ranked_feed_cache.invalidate_user(user.id)
+
+        job_posting.num_rejects = models.F('num_rejects') + 1
+        job_posting.save(update_fields=["num_rejects"])
+        job_posting.refresh_from_db(fields=["num_rejects"])
 
         try:
-            db.collection("job_postings").document(str(job_id)).update({"num_rejects": int(job_posting.num_rejects)})
+            update_job_document(job_id, {"num_rejects": int(job_posting.num_rejects)})
         except Exception as e:
             return Response({'status': 'error', 'message': f'Firebase update failed'}, status=500)
 
@@ -241,218 +267,139 @@ def get_job_postings(request):
             if is_active is None:
                 return Response({"error": "is_active field required"}, status=400)
 
-            doc_ref = db.collection("job_postings").document(str(job_id))
-            doc = doc_ref.get()
-            if not doc.exists:
+            posting = JobPosting.objects.filter(id=job_id).first()
+            if posting is None:
                 return Response({"error": "Job not found"}, status=404)
 
-            doc_ref.update({"is_active": is_active})
-            return Response({"status": "success", "is_active": is_active})
+            posting.is_active = bool(is_active)
+            posting.save(update_fields=["is_active"])
+            ranked_feed_cache.invalidate_catalogue()
 
-        #Query Job Postings 
-        job_postings_ref = db.collection("job_postings")
-        job_postings_docs = job_postings_ref.stream()
-        
-
-        job_postings_list = []
-        for doc in job_postings_docs:
-            job_data = doc.to_dict()
-            job_data['id'] = doc.id  # Add the document ID
-            if job_data.get('is_active', True) or fetch_inactive:
-                job_postings_list.append(job_data)
+            # the mirror document may not exist yet if the job was just created
+            update_job_document(job_id, {"is_active": is_active})
 
+            return Response({"status": "success", "is_active": is_active})
 
-        # print(filters)
-        # print(job_postings_list)
-        if filters:
-            filtered_jobs = []
-            for job in job_postings_list:
-                for key, value in filters.items():
-                    if key in ["user_company", "user_id", "user_email"]:
-                        if job["posted_by"][key] == value:
-                            filtered_jobs.append(job)
-                            break
-                    # handle fields that do not exist
-                    if key not in job:
-                        continue
-                    elif job[key] == value:
-                        filtered_jobs.append(job)
-                        break
-            job_postings_list = filtered_jobs
-
-        print(f"Found {len(job_postings_list)} job postings from Firebase")
-        
-        # Get user UUID from query params and their embedding for similarity sorting
         user_uid = request.query_params.get('user_uid')
+        cursor = request.query_params.get('cursor')
+
+        resume_from = None
+        if cursor:
+            try:
+                resume_from = decode_cursor(cursor)
+            except InvalidCursor:
+                return Response({"Error": "Invalid cursor"}, status=400)
+
+        # Get user by UUID from query params (used for similarity sorting and like status)
         user = None
+        applicant_profile = None
         if user_uid:
             try:
-                # Get user by UUID
                 user = User.objects.get(id=user_uid)
-                
-                # Get applicant profile for the user
                 applicant_profile = ApplicantProfile.objects.filter(user=user).first()
-                if applicant_profile and applicant_profile.vector_embedding:
-                    user_embedding = np.array(applicant_profile.vector_embedding)
-                    
-                    # Calculate cosine similarity for each job posting
-                    for job in job_postings_list:
-                        if 'vector_embedding' in job and job['vector_embedding']:
-                            job_embedding = np.array(job['vector_embedding'])
-                            similarity = cosine_similarity(user_embedding, job_embedding)
-                            job['similarity_score'] = similarity
-                        else:
-                            job['similarity_score'] = 0.0
-                    
-                    # Sort by similarity score (highest first)
-                    job_postings_list = sorted(job_postings_list, key=lambda x: x.get('similarity_score', 0.0), reverse=True)
-                    print(f"Sorted job postings by similarity to user {user.id}")
             except User.DoesNotExist:
                 print(f"User with UUID {user_uid} not found")
-                for job in job_postings_list:
-                    job['similarity_score'] = 0.0
-            except Exception as e:
-                print(f"Error sorting by similarity: {e}")
-                for job in job_postings_list:
-                    job['similarity_score'] = 0.0
-        else:
-            # If no user_uid provided, add similarity_score of 0
-            for job in job_postings_list:
-                job['similarity_score'] = 0.0
-        
-        # add like status for each job posting if user is an applicant
-        if user and user.role == 'applicant':
-            # gets all job IDs that the user has liked
-            liked_job_ids = set(
-                JobLike.objects.filter(user=user).values_list('job_posting_id', flat=True)
-            )
-
-
-            # adds is_liked status + bookmark to each job posting
-            try:
-                applicant_profile = ApplicantProfile.objects.get(user=user)
-                bookmarked_job_ids = set(
-                    str(job_id) for job_id in applicant_profile.bookmarked_jobs.values_list('id', flat=True)
-                )
-            except ApplicantProfile.DoesNotExist:
-                bookmarked_job_ids = set()
-
-            # get all company ids the applicant follows
-            followed_company_ids = set(str(cid) for cid in applicant_profile.followed_companies.values_list("id", flat=True))
-
-            # adds is_liked and is_bookmarked status to each job posting
-            for job in job_postings_list:
-                job_id = job.get('id')
-                company_id = job.get('company_id')
-                job['is_liked'] = job.get('id') in liked_job_ids
-                job['is_bookmarked'] = job.get('id') in bookmarked_job_ids
-                job['is_following_company'] = company_id in followed_company_ids
-        else:
-            # if no user or not an applicant, set is_liked and is_bookmarked to false
-            for job in job_postings_list:
-                job['is_liked'] = False
-                job['is_bookmarked'] = False
-                job['is_following_company'] = False
-
-        # ensures likes_count is included (default to 0 if not present from Firebase)
-        for job in job_postings_list:
-            if 'likes_count' not in job:
-                job['likes_count'] = 0
 
+        ctx = FeedContext(
+            page_size=page_size,
+            start_index=(page - 1) * page_size,
+            filters=filters,
+            fetch_inactive=fetch_inactive,
+            get_applicant_info=get_applicant_info,
+            user=user,
+            applicant_profile=applicant_profile,
+            query_key=feed_query_key(user_uid, filters, fetch_inactive),
+            resume_from=resume_from,
+        )
+        try:
+            feed_pipeline.run(ctx)
+        except FeedError as e:
+            return Response({"error": e.message}, status=e.status)
+
+        paginated_job_postings = ctx.page_jobs
+        pagination = {
+            'current_page': ctx.start_index // page_size + 1,
+            'total_pages': (ctx.total_count + page_size - 1) // page_size,
+            'total_count': ctx.total_count,
+            'has_next': ctx.has_next,
+            'next_cursor': encode_cursor(
+                ctx.snapshot.id,
+                ctx.end_index,
+                ctx.snapshot.scores[ctx.end_index - 1],
+                ctx.snapshot.job_ids[ctx.end_index - 1],
+                ctx.snapshot.scored_at,
+            ) if ctx.has_next and ctx.snapshot is not None else None,
+        }
 
-        # get applicant info if requested
         if get_applicant_info:
-            unique_applicants = {}
-            for job in job_postings_list:
-                for applicant in job["applicants"]:
-                    unique_applicants[applicant] = None
-
-            for applicant in unique_applicants:
-                try:
-                    user = ApplicantProfile.objects.get(user__email = applicant)
-                    unique_applicants[applicant] = {
-                        "first_name": user.user.first_name or "",
-                        "last_name": user.user.last_name or "",
-                        "email": user.user.email or "",
-                        "major" : user.major or "",
-                        "school": user.school or "",
-                        "skills": user.skills or [],
-                        "personality_type": user.personality_type or "",
-                        "resume_url": user.resume_file.url or "",
-                        "portfolio_url": user.portfolio_url or "",
-                        "profile_image": user.profile_image.url if user.profile_image else "",
-                        "bio": user.bio or "",
-                        "reports": user.reports or 0,
-                    }
-                except ApplicantProfile.DoesNotExist:
-                    return Response({"error": f"applicant {applicant} not found"}, status=404)
-            
-            
-            for job in job_postings_list:
-                job["applicants"] = [unique_applicants[applicant] for applicant in job["applicants"]]
+            response = Response({
+                'job_postings': paginated_job_postings,
+                'applicant_stats': ctx.applicant_stats,
+                'pagination': pagination
+            }, status=200)
+        else:
+            response = Response({
+                'job_postings': paginated_job_postings,
+                'pagination': pagination
+            }, status=200)
+        response['Server-Timing'] = ctx.server_timing()
+        return response
+    except Exception as e:
+        return Response({"Error": str(e)}, status=500)
 
-        
-        total_count = len(job_postings_list)
-        total_pages = (total_count + page_size - 1) // page_size
-        
-        start_index = (page - 1) * page_size
-        end_index = start_index + page_size
-        paginated_job_postings = job_postings_list[start_index:end_index]
+@api_view(['GET'])
+def get_feed_cache_stats(request):
+    """Hit/miss counters of the per-user ranked feed cache, for sizing it, and the filter keys that fell back to memory."""
+    return Response({
+        'status': 'success',
+        'feed_cache': ranked_feed_cache.stats(),
+        'filter_fallbacks': filter_fallback_stats(),
+    }, status=200)
 
+@api_view(['GET'])
+def get_embedding_stats(request):
+    """Batch-size and queue-wait counters of the embedding micro-batcher."""
+    return Response({'status': 'success', 'embeddings': embedding_stats()}, status=200)
 
-        if get_applicant_info:
-            # compute applicant stats
-            num_unique_applicants = len(unique_applicants)
-
-            major_count = {}
-            school_count = {}
-            personality_count = {}
-
-            for stats in unique_applicants.values():
-                if stats is None:
-                    continue
-                if stats['major'] != "" and stats['major'] != None:
-                    major_count[stats['major']] = major_count.get(stats['major'], 0) + 1
-                if stats['school'] != "" and stats['school'] != None:
-                    school_count[stats['school']] = school_count.get(stats['school'], 0) + 1
-                if stats['personality_type'] != "" and stats['personality_type'] != None:
-                    personality_count[stats['personality_type']] = personality_count.get(stats['personality_type'], 0) + 1
-
-            most_common_majors = list(sorted(major_count.items(), key = lambda x: x[1]))[::-1]
-            most_common_schools = list(sorted(school_count.items(), key = lambda x: x[1]))[::-1]
-            most_common_personalities = list(sorted(personality_count.items(), key = lambda x: x[1]))[::-1]
-            
-            most_common_majors = most_common_majors if len(most_common_majors) <= 5 else most_common_majors[:5]
-            most_common_schools = most_common_schools if len(most_common_schools) <= 5 else most_common_schools[:5]
-            most_common_personalities = most_common_personalities if len(most_common_personalities) <= 5 else most_common_personalities[:5]
+@api_view(['GET'])
+def get_notification_stream_stats(request):
+    """Open notification streams on the worker that served the request (see accounts/scripts/notification_stream_load.py)."""
+    return Response({'status': 'success', 'notification_stream': get_broker().stats()}, status=200)
 
+@api_view(['GET'])
+def get_job_applicants(request, job_id):
+    """
+    A job's applicants, a page at a time in the order they applied.
 
-            return Response({
-                'job_postings': paginated_job_postings,
-                'applicant_stats': {
-                    'unique_applicants': num_unique_applicants,
-                    'most_common_majors': most_common_majors,
-                    'most_common_schools': most_common_schools,
-                    'most_common_personalities': most_common_personalities
-                },
-                'pagination': {
-                    'current_page': page,
-                    'total_pages': total_pages,
-                    'total_count': total_count,
-                    'has_next': page < total_pages,
-                }
-            }, status=200)
-        
-        paginated_job_postings.sort(key=lambda x: x.get('likes_count', 0), reverse=True)
+    Query params:
+        cursor: next_cursor from the previous page
+        limit: page size (default JOB_APPLICANTS_PAGE_SIZE, at most 100)
+    """
+    try:
+        if not JobPosting.objects.filter(id=job_id).exists():
+            return Response({"error": "Job not found"}, status=404)
 
+        try:
+            limit = int(request.query_params.get('limit', APPLICANTS_PAGE_SIZE))
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=400)
+        limit = max(1, min(limit, APPLICANTS_MAX_PAGE_SIZE))
+
+        after = None
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            after = decode_applicants_cursor(cursor, job_id)
+            if after is None:
+                return Response({"Error": "Invalid cursor"}, status=400)
+
+        applicants, last_row_id = page_job_applicants(job_id, after=after, limit=limit)
         return Response({
-            'job_postings': paginated_job_postings,
+            'applicants': applicants,
+            'num_applicants': JobPosting.applicants.through.objects.filter(jobposting_id=job_id).count(),
             'pagination': {
-                'current_page': page,
-                'total_pages': total_pages,
-                'total_count': total_count,
-                'has_next': page < total_pages,
-            }
+                'has_next': last_row_id is not None,
+                'next_cursor': encode_applicants_cursor(job_id, last_row_id) if last_row_id is not None else None,
+            },
         }, status=200)
     except Exception as e:
         return Response({"Error": str(e)}, status=500)
@@ -523,8 +470,6 @@ def create_job_posting(request):
                     status=404
                 )
 
-        company_size = company.size or ""
-
     except:
         return Response({"Error": "Invalid or missing body parameters"}, status=400)
     
@@ -573,14 +518,14 @@ def create_job_posting(request):
                     PersonalityType.objects.filter(types__in=personality_types)
                 )
 
-            # Regenerate embedding for updated job posting
-            embedding = generate_job_embedding(job_title=job_title, job_description=job_description, tags=tags, location=location, salary=salary, company_size=company_size, job_type=job_type)
-            posting.vector_embedding = embedding
             # posting.posted_by = posted_by
             posting.media_items.set(media_arr)
             posting.save()
+            ranked_feed_cache.invalidate_catalogue()
 
-            db.collection("job_postings").document(str(posting.id)).set(job_posting_to_dict(posting), merge=True)
+            # the embedding is regenerated (and the Firestore mirror updated) by run_workers
+            enqueue("job_posting.mirror", job_id=str(posting.id), vector=False)
+            enqueue("job_posting.embed", job_id=str(posting.id))
         except:
             return Response({"Error": "Error while editing job posting"}, status=500)
         
@@ -589,7 +534,6 @@ def create_job_posting(request):
             'posting id': posting.id 
         }, status=200)
 
-    embedding = generate_job_embedding(job_title=job_title, job_description=job_description, tags=tags, location=location, salary=salary, company_size=company_size, job_type=job_type)
     posting = JobPosting(
         company_logo=logo,
         job_title=job_title,
@@ -600,7 +544,6 @@ def create_job_posting(request):
         tags=tags,
         job_description=job_description,
         posted_by = posted_by,
-        vector_embedding=embedding,
     )
     posting.save()
 
@@ -610,18 +553,12 @@ def create_job_posting(request):
         )
 
     posting.media_items.set(media_arr)
+    ranked_feed_cache.invalidate_catalogue()
 
-    db.collection("job_postings").document(str(posting.id)).set(job_posting_to_dict(posting))
-
-    try:
-        notify_similar_applicants(posting)
-    except Exception as e:
-        print(f"Error notifying similar applicants: {e}")
-
-    try:
-        notify_company_followers(posting)
-    except Exception as e:
-        print(f"Error notifying company followers: {e}")
+    # embedding, the Firestore mirror and notifications run on run_workers (see job_tasks.py)
+    enqueue("job_posting.mirror", job_id=str(posting.id), vector=False)
+    enqueue("job_posting.embed", job_id=str(posting.id), notify=True)
+    enqueue("job_posting.notify_followers", job_id=str(posting.id))
 
     return Response({
         'status': 'success',
@@ -643,6 +580,11 @@ def create_media_item(file_type, file_size, file_name, download_link):
 def find_similar_applicants(job_posting, similarity_threshold=0.35, max_notifications=50):
     """
     Find applicants with similar vector embeddings to a job posting.
+
+    Applicants are scored against the job with one matrix product per chunk
+    of the in-memory applicant vector index or, with APPLICANT_INDEX_IN_MEMORY
+    off (or for a job still on an older embedding model version), of
+    applicant vectors streamed from the database.
     
     Args:
         job_posting: JobPosting instance with vector_embedding
@@ -650,136 +592,38 @@ def find_similar_applicants(job_posting, similarity_threshold=0.35, max_notifica
         max_notifications: Maximum number of notifications to create
     
     Returns:
-        List of ApplicantProfile instances that match the criteria
+        List of ApplicantProfile instances that match the criteria, best first
     """
-    if not job_posting.vector_embedding:
+    if not has_embedding(job_posting.vector_embedding):
         return []
-    
-    job_embedding = np.array(job_posting.vector_embedding)
-    
-    applicants = ApplicantProfile.objects.filter(
-        vector_embedding__isnull=False,
-        notifications_enabled=True,
-        user__role='applicant'
-    ).exclude(
-        vector_embedding=[]
-    ).select_related('user')
-    
-    similar_applicants = []
-    
-    for applicant in applicants:
-        if not applicant.vector_embedding:
-            continue
-            
-        try:
-            applicant_embedding = np.array(applicant.vector_embedding)
-            similarity = cosine_similarity(job_embedding, applicant_embedding)
-            
-            if similarity >= similarity_threshold:
-                similar_applicants.append((applicant, similarity))
-        except Exception as e:
-            print(f"Error calculating similarity for applicant {applicant.user.id}: {e}")
-            continue
-    
-    similar_applicants.sort(key=lambda x: x[1], reverse=True)
-    return [app[0] for app in similar_applicants[:max_notifications]]
-
-
-def notify_similar_applicants(job_posting):
-    """
-    Create notifications for applicants who might be interested in a job posting.
-    
-    Args:
-        job_posting: JobPosting instance
-    """
-    try:
-        if not job_posting.is_active:
-            return 0
-            
-        employer_user_id = None
-        if job_posting.posted_by and job_posting.posted_by.user:
-            employer_user_id = job_posting.posted_by.user.id
-        
-        similar_applicants = find_similar_applicants(job_posting, similarity_threshold=0.35, max_notifications=50)
-        
-        notifications_created = 0
-        for applicant in similar_applicants:
-            if employer_user_id and applicant.user.id == employer_user_id:
-                continue
-                
-            existing_notification = Notification.objects.filter(
-                user=applicant.user,
-                job_posting=job_posting,
-                read=False
-            ).exists()
-            
-            if existing_notification:
-                continue
-            
-            try:
-                Notification.objects.create(
-                    user=applicant.user,
-                    title=f"New Job Match: {job_posting.job_title}",
-                    message=f"A new {job_posting.job_title} position at {job_posting.company} might be a good fit for you!",
-                    notification_type='success',
-                    job_posting=job_posting,
-                    read=False
-                )
-                notifications_created += 1
-            except Exception as e:
-                print(f"Error creating notification for applicant {applicant.user.id}: {e}")
-                continue
-        
-        print(f"Created {notifications_created} notifications for job posting {job_posting.id}")
-        return notifications_created
-    except Exception as e:
-        print(f"Error in notify_similar_applicants: {e}")
-        return 0
 
+    chunk_size = getattr(settings, "APPLICANT_INDEX_CHUNK_SIZE", 50000)
+    version = job_posting.embedding_model_version
+    if is_current(version) and getattr(settings, "APPLICANT_INDEX_IN_MEMORY", True):
+        matches = applicant_vector_index.above(
+            job_posting.vector_embedding, similarity_threshold, k=max_notifications, chunk_size=chunk_size
+        )
+    else:
+        # only vectors from the same embedding model version are comparable
+        rows = ApplicantProfile.objects.filter(
+            vector_embedding__isnull=False,
+            embedding_model_version=version,
+            notifications_enabled=True,
+            user__role='applicant'
+        ).values_list('pk', 'vector_embedding').iterator(chunk_size=2000)
+        matches = scan_chunks(
+            job_posting.vector_embedding, stream_vectors(rows, chunk_size), similarity_threshold, max_notifications
+        )
 
-def find_similar_applicants(job_posting, similarity_threshold=0.35, max_notifications=50):
-    """
-    Find applicants with similar vector embeddings to a job posting.
-    
-    Args:
-        job_posting: JobPosting instance with vector_embedding
-        similarity_threshold: Minimum cosine similarity score (0-1)
-        max_notifications: Maximum number of notifications to create
-    
-    Returns:
-        List of ApplicantProfile instances that match the criteria
-    """
-    if not job_posting.vector_embedding:
-        return []
-    
-    job_embedding = np.array(job_posting.vector_embedding)
-    
-    applicants = ApplicantProfile.objects.filter(
-        vector_embedding__isnull=False,
+    # the index can lag writes made by other processes, so re-check the matches
+    ids = [pk for pk, _ in matches]
+    profiles = ApplicantProfile.objects.filter(
+        pk__in=ids,
         notifications_enabled=True,
         user__role='applicant'
-    ).exclude(
-        vector_embedding=[]
     ).select_related('user')
-    
-    similar_applicants = []
-    
-    for applicant in applicants:
-        if not applicant.vector_embedding:
-            continue
-            
-        try:
-            applicant_embedding = np.array(applicant.vector_embedding)
-            similarity = cosine_similarity(job_embedding, applicant_embedding)
-            
-            if similarity >= similarity_threshold:
-                similar_applicants.append((applicant, similarity))
-        except Exception as e:
-            print(f"Error calculating similarity for applicant {applicant.user.id}: {e}")
-            continue
-    
-    similar_applicants.sort(key=lambda x: x[1], reverse=True)
-    return [app[0] for app in similar_applicants[:max_notifications]]
+    by_pk = {str(profile.pk): profile for profile in profiles}
+    return [by_pk[str(pk)] for pk in ids if str(pk) in by_pk]
 
 
 def notify_similar_applicants(job_posting):
@@ -799,33 +643,20 @@ def notify_similar_applicants(job_posting):
         
         similar_applicants = find_similar_applicants(job_posting, similarity_threshold=0.35, max_notifications=50)
         
-        notifications_created = 0
-        for applicant in similar_applicants:
-            if employer_user_id and applicant.user.id == employer_user_id:
-                continue
-                
-            existing_notification = Notification.objects.filter(
-                user=applicant.user,
-                job_posting=job_posting,
-                read=False
-            ).exists()
-            
-            if existing_notification:
-                continue
-            
-            try:
-                Notification.objects.create(
-                    user=applicant.user,
-                    title=f"New Job Match: {job_posting.job_title}",
-                    message=f"A new {job_posting.job_title} position at {job_posting.company} might be a good fit for you!",
-                    notification_type='success',
-                    job_posting=job_posting,
-                    read=False
-                )
-                notifications_created += 1
-            except Exception as e:
-                print(f"Error creating notification for applicant {applicant.user.id}: {e}")
-                continue
+        notifications_created = create_job_notifications(
+            job_posting,
+            [
+                applicant.user_id for applicant in similar_applicants
+                if not (employer_user_id and applicant.user_id == employer_user_id)
+            ],
+            fanout='match',
+            notification_type='success',
+            title=f"New Job Match: {job_posting.job_title}",
+            message=f"A new {job_posting.job_title} position at {job_posting.company} might be a good fit for you!",
+            # one unread notification per job is enough, whichever path created it
+            skip_any_unread=True,
+            digest_reason='match',
+        )
         
         print(f"Created {notifications_created} notifications for job posting {job_posting.id}")
         return notifications_created
@@ -836,65 +667,47 @@ def notify_similar_applicants(job_posting):
 
 def notify_company_followers(job_posting):
     # Create notifications for applicants who are following the company that posted the job.
-    try:
-        if not job_posting.is_active:
-            return 0
-
-        if not job_posting.company:
-            print(f"Job posting {job_posting.id} has no company")
-            return 0
-
-        # Get all applicants who follow this company
-        followers = ApplicantProfile.objects.filter(
-            followed_companies=job_posting.company,
-            notifications_enabled=True,
-            user__role='applicant'
-        ).select_related('user')
-
-        notifications_created = 0
-        employer_user_id = None
-        if job_posting.posted_by and job_posting.posted_by.user:
-            employer_user_id = job_posting.posted_by.user.id
-
-        for follower in followers:
-            # Don't notify if the follower is the employer who posted the job
-            if employer_user_id and follower.user.id == employer_user_id:
-                continue
-
-            # Check if follower notification already exists (check for same type to allow multiple notification types for same job)
-            existing_notification = Notification.objects.filter(
-                user=follower.user,
-                job_posting=job_posting,
-                notification_type='info',  # Only check for follower notifications (type 'info')
-                read=False
-            ).exists()
+    # Followers are streamed in chunks (run_fanout); errors propagate so the task is retried
+    # and the fan-out resumes after the last committed chunk.
+    if not job_posting.is_active:
+        return 0
 
-            if existing_notification:
-                continue
+    if not job_posting.company:
+        print(f"Job posting {job_posting.id} has no company")
+        return 0
 
-            try:
-                Notification.objects.create(
-                    user=follower.user,
-                    title=f"{job_posting.company.name} posted a new job!",
-                    message=f"{job_posting.company.name} just posted a new {job_posting.job_title} position. Check it out!",
-                    notification_type='info',
-                    job_posting=job_posting,
-                    read=False
-                )
-                notifications_created += 1
-            except Exception as e:
-                print(f"Error creating notification for follower {follower.user.id}: {e}")
-                continue
+    employer_user_id = None
+    if job_posting.posted_by and job_posting.posted_by.user:
+        employer_user_id = job_posting.posted_by.user.id
+
+    # Follow rows of applicants who follow this company, keyed by the follow row id
+    follows = ApplicantProfile.followed_companies.through.objects.filter(
+        company=job_posting.company,
+        applicantprofile__notifications_enabled=True,
+        applicantprofile__user__role='applicant'
+    ).values_list('id', 'applicantprofile__user_id')
+
+    def notify(user_ids):
+        # Don't notify the employer who posted the job
+        return create_job_notifications(
+            job_posting,
+            [user_id for user_id in user_ids if user_id != employer_user_id],
+            fanout='follow',
+            notification_type='info',
+            title=f"{job_posting.company.name} posted a new job!",
+            message=f"{job_posting.company.name} just posted a new {job_posting.job_title} position. Check it out!",
+            digest_reason='follow',
+        )
 
-        print(f"Created {notifications_created} follower notifications for job posting {job_posting.id}")
-        return notifications_created
-    except Exception as e:
-        print(f"Error in notify_company_followers: {e}")
-        return 0
+    progress = run_fanout(job_posting, 'company_followers', follows, notify)
+    print(f"Created {progress.notified} follower notifications for job posting {job_posting.id}")
+    return progress.notified
 
 
 def job_posting_to_dict(posting):
     company = posting.company
+    # iterated once, so the feed source's prefetch (with the users) covers it
+    applicants = [str(applicant.user.email) for applicant in posting.applicants.all()]
 
     return {
         "id": str(posting.id),
@@ -936,13 +749,17 @@ def job_posting_to_dict(posting):
             "user_linkedin_url": posting.posted_by.linkedin_url if posting.posted_by else None
         } if posting.posted_by else None,
         "is_active": posting.is_active,
-        "vector_embedding": posting.vector_embedding,
-        "applicants": [str(user.user.email) for user in posting.applicants.all()],
-        "personality_preferences": list(posting.personality_preferences.values_list("types", flat=True)),
+        "vector_embedding": (
+            np.asarray(posting.vector_embedding, dtype=np.float32).tolist()
+            if has_embedding(posting.vector_embedding) else None
+        ),
+        "embedding_model_version": posting.embedding_model_version,
+        "applicants": applicants,
+        "personality_preferences": [p.types for p in posting.personality_preferences.all()],
         "likes_count": posting.likes_count,
         "impressions": posting.impressions,
         "num_rejects": posting.num_rejects,
-        "num_applicants": len(posting.applicants.all())
+        "num_applicants": len(applicants)
     }
 
 @api_view(['GET'])
@@ -1016,7 +833,7 @@ def like_job_posting(request):
 
         # Mirror to Firebase (best-effort)
         try:
-            db.collection("job_postings").document(str(job_id)).update({"likes_count": int(job_posting.likes_count)})
+            update_job_document(job_id, {"likes_count": int(job_posting.likes_count)})
         except Exception as e:
             print(f"[warn] Firebase mirror failed: {e}")
 
@@ -1046,15 +863,15 @@ def add_impression(request):
     try:
         job = JobPosting.objects.get(id=job_id)
 
-        job.impressions += 1
-
-        job.save()
+        job.impressions = models.F('impressions') + 1
+        job.save(update_fields=["impressions"])
+        job.refresh_from_db(fields=["impressions"])
 
     except JobPosting.DoesNotExist:
         return Response({'status': 'error', 'message': 'Job posting not found'}, status=404)
     
     try:
-        db.collection("job_postings").document(str(job_id)).update({"impressions": int(job.impressions)})
+        update_job_document(job_id, {"impressions": int(job.impressions)})
     except Exception as e:
         return Response({'status': 'error', 'message': f'Firebase update failed'}, status=500)
 
@@ -0,0 +1,85 @@
+"""
+Background side effects of creating or editing a job posting.
+
+create_job_posting saves the row and returns; embedding, the Firestore
+mirror and applicant notifications run here, on `manage.py run_workers`.
+
+The posting is mirrored right away without its vector (mirror with
+vector=False), independently of the embedding; once the embedding is
+stored, a full mirror adds it. A posting whose embedding keeps failing
+still reaches Firestore.
+"""
+from .embeddings import current_version
+from .firestore_mirror import job_document
+from .job_postings import (
+    generate_job_embedding,
+    job_posting_to_dict,
+    notify_company_followers,
+    notify_similar_applicants,
+)
+from .models import JobPosting
+from .tasks import enqueue, task
+
+
+def _get_posting(job_id):
+    return (
+        JobPosting.objects
+        .select_related('company', 'posted_by__user', 'posted_by__company')
+        .filter(id=job_id)
+        .first()
+    )
+
+
+@task("job_posting.embed", concurrency=2, visibility_timeout=120)
+def embed_job_posting(job_id, notify=False):
+    posting = _get_posting(job_id)
+    if posting is None:
+        return
+
+    company_size = posting.company.size if posting.company else ""
+    embedding = generate_job_embedding(
+        job_title=posting.job_title,
+        job_description=posting.job_description,
+        tags=posting.tags,
+        location=posting.location,
+        salary=posting.salary,
+        company_size=company_size or "",
+        job_type=posting.job_type,
+    )
+    if embedding is None:
+        # generate_job_embedding logs and swallows the error; fail so the task is retried
+        raise RuntimeError(f"Could not generate an embedding for job posting {job_id}")
+
+    posting.vector_embedding = embedding
+    posting.embedding_model_version = current_version().name
+    posting.save(update_fields=["vector_embedding", "embedding_model_version"])
+
+    enqueue("job_posting.mirror", job_id=str(job_id))
+    if notify:
+        enqueue("job_posting.notify_similar", job_id=str(job_id))
+
+
+@task("job_posting.mirror", concurrency=4, visibility_timeout=60)
+def mirror_job_posting(job_id, vector=True):
+    posting = _get_posting(job_id)
+    if posting is None:
+        return
+    document = job_posting_to_dict(posting)
+    if not vector:
+        # leave the document's vector to the mirror queued after embedding (merge keeps it)
+        del document["vector_embedding"], document["embedding_model_version"]
+    job_document(posting.id).set(document, merge=True)
+
+
+@task("job_posting.notify_similar", max_attempts=3, visibility_timeout=300)
+def notify_similar(job_id):
+    posting = _get_posting(job_id)
+    if posting is not None:
+        notify_similar_applicants(posting)
+
+
+@task("job_posting.notify_followers", max_attempts=5, visibility_timeout=900)
+def notify_followers(job_id):
+    posting = _get_posting(job_id)
+    if posting is not None:
+        notify_company_followers(posting)
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.embeddings import EMBEDDING_BACKENDS, make_provider
+from accounts.embeddings.benchmark import parity, throughput
+from accounts.models import JobPosting
+
+SAMPLE_TEXTS = [
+    "Job Title: Backend Engineer Description: Build Django APIs Location: Remote Job Type: Full-time",
+    "Job Title: Data Analyst Description: SQL dashboards and reporting Location: Austin Job Type: Internship",
+    "Computer science student with React Native, Python and machine learning projects",
+    "Job Title: Product Designer Description: Mobile-first UX research Location: New York Job Type: Part-time",
+]
+
+
+class Command(BaseCommand):
+    help = "Compare embedding backends: encodes/sec for each, and vector parity against PyTorch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backends", default="torch,onnx", help="Comma-separated backends to benchmark.")
+        parser.add_argument("--texts", type=int, default=256, help="Number of texts to encode.")
+        parser.add_argument("--batch-size", type=int, default=32)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--min-cosine", type=float, default=0.99,
+                            help="Fail if any vector's cosine to the PyTorch vector is below this.")
+
+    def _texts(self, count):
+        # real job descriptions where there are any, padded with samples
+        texts = [
+            f"Job Title: {title} Description: {description or ''}"
+            for title, description in JobPosting.objects.values_list("job_title", "job_description")[:count]
+        ]
+        while len(texts) < count:
+            texts.append(SAMPLE_TEXTS[len(texts) % len(SAMPLE_TEXTS)] + f" #{len(texts)}")
+        return texts
+
+    def handle(self, *args, **options):
+        backends = [b.strip() for b in options["backends"].split(",") if b.strip()]
+        unknown = set(backends) - set(EMBEDDING_BACKENDS)
+        if unknown:
+            raise CommandError(f"Unknown backends: {', '.join(sorted(unknown))}")
+
+        texts = self._texts(options["texts"])
+        reference = None
+        failed = False
+        for backend in backends:
+            # no fallback: benchmark the backend asked for, exporting the ONNX model if needed
+            provider = make_provider(backend, fallback=False)
+            rate = throughput(provider, texts, options["batch_size"], options["repeat"])
+            line = f"{provider.cache_namespace:<40} {rate:9.1f} encodes/sec"
+
+            vectors = provider.encode_batch(texts)
+            if backend == "torch":
+                reference = vectors
+            elif reference is not None:
+                agreement = parity(reference, vectors)
+                line += f"   cosine to torch: min {agreement['min_cosine']:.4f}, mean {agreement['mean_cosine']:.4f}"
+                failed |= agreement["min_cosine"] < options["min_cosine"]
+            self.stdout.write(line)
+
+        if failed:
+            raise CommandError(f"Parity check failed: a vector's cosine to PyTorch is below {options['min_cosine']}")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from accounts.retention import NotificationRetention
+
+
+def _policy(value):
+    """None (from the settings) or a negative value (from the command line) turns a policy off."""
+    return None if value is None or value < 0 else value
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete old notifications: read ones past NOTIFICATION_RETENTION_READ_DAYS and each user's "
+        "beyond NOTIFICATION_RETENTION_MAX_PER_USER, in small batches."
+    )
+
+    def add_arguments(self, parser):
+        retention = NotificationRetention.from_settings()
+        parser.add_argument("--read-days", type=int, default=retention.read_days,
+                            help="Delete read notifications older than this (-1 disables).")
+        parser.add_argument("--max-per-user", type=int, default=retention.max_per_user,
+                            help="Keep each user's newest N notifications (-1 disables).")
+        parser.add_argument("--batch-size", type=int, default=retention.batch_size, help="Rows per delete transaction.")
+        parser.add_argument("--pause", type=float, default=retention.pause, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted.")
+
+    def handle(self, *args, **options):
+        retention = NotificationRetention(
+            read_days=_policy(options["read_days"]),
+            max_per_user=_policy(options["max_per_user"]),
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+        )
+        removed = retention.run(dry_run=options["dry_run"])
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        for policy, count in removed.items():
+            self.stdout.write(f"{policy}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"{verb} {sum(removed.values())} notifications"))
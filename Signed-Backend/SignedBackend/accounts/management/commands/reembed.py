@@ -0,0 +1,184 @@
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.embedding_tasks import stale_rows
+from accounts.embeddings import current_version, encode_batch, make_provider
+from accounts.embeddings.texts import applicant_embedding_text, job_posting_embedding_text
+from accounts.models import ApplicantProfile, JobPosting
+
+# Firestore caps a batched write at 500 operations
+FIRESTORE_BATCH_LIMIT = 500
+
+_worker_provider = None
+
+
+def _init_worker(settings_module):
+    # the pool spawns its workers (see handle), so each one sets Django up itself
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+def _encode_in_worker(texts):
+    global _worker_provider
+    if _worker_provider is None:
+        _worker_provider = make_provider()
+    return _worker_provider.encode_batch(texts)
+
+
+class Checkpoint:
+    """The last primary key written per model, saved after every batch."""
+
+    def __init__(self, path, restart=False):
+        self.path = Path(path)
+        self.state = {}
+        if self.path.exists() and not restart:
+            self.state = json.loads(self.path.read_text())
+
+    def last_pk(self, label):
+        return self.state.get(label)
+
+    def advance(self, label, pk):
+        self.state[label] = str(pk)
+        self._save()
+
+    def finish(self, label):
+        self.state.pop(label, None)
+        self._save()
+
+    def _save(self):
+        if self.state:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.state))
+            tmp.replace(self.path)
+        elif self.path.exists():
+            self.path.unlink()
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute vector_embedding for every JobPosting and ApplicantProfile, e.g. after a model change. "
+        "Resumable: progress is checkpointed after every batch. Applicant vectors are rebuilt from their "
+        "resume, which discards the adjustments made by applying to / rejecting jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--models", default="jobs,applicants", help="Comma-separated: jobs, applicants.")
+        parser.add_argument("--batch-size", type=int, default=256, help="Texts per encode call.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched per database round trip.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Encoder processes (0 encodes in this process, through the embedding cache).")
+        parser.add_argument("--checkpoint", default=".reembed_checkpoint.json", help="Progress file.")
+        parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+        parser.add_argument("--stale", action="store_true",
+                            help="Only rows whose vector is from an older embedding model version.")
+        parser.add_argument("--mirror", action="store_true",
+                            help="Also write the new job vectors to the Firestore mirror.")
+
+    def handle(self, *args, **options):
+        rows = stale_rows if options["stale"] else (lambda model: model.objects.all())
+        targets = {
+            "jobs": (JobPosting, rows(JobPosting).select_related("company"), job_posting_embedding_text),
+            "applicants": (ApplicantProfile, rows(ApplicantProfile), applicant_embedding_text),
+        }
+        labels = [m.strip() for m in options["models"].split(",") if m.strip()]
+        unknown = set(labels) - set(targets)
+        if unknown:
+            raise CommandError(f"Unknown models: {', '.join(sorted(unknown))}")
+
+        self.options = options
+        self.version = current_version().name
+        self.checkpoint = Checkpoint(options["checkpoint"], restart=options["restart"])
+        self.pool = None
+        if options["workers"] > 0:
+            # spawn, not Linux's default fork: a forked worker would inherit this process's
+            # open database connection and any loaded model
+            self.pool = ProcessPoolExecutor(
+                max_workers=options["workers"],
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "settings"),),
+            )
+        try:
+            for label in labels:
+                model, queryset, text_for = targets[label]
+                self._reembed(label, queryset, text_for, mirror=options["mirror"] and model is JobPosting)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+
+    def _batches(self, label, queryset, text_for):
+        last_pk = self.checkpoint.last_pk(label)
+        if last_pk is not None:
+            self.stdout.write(f"{label}: resuming after {last_pk}")
+            queryset = queryset.filter(pk__gt=last_pk)
+
+        rows, texts = [], []
+        for row in queryset.order_by("pk").iterator(chunk_size=self.options["chunk_size"]):
+            text = text_for(row)
+            if not text.strip():
+                continue
+            rows.append(row)
+            texts.append(text)
+            if len(rows) >= self.options["batch_size"]:
+                yield rows, texts
+                rows, texts = [], []
+        if rows:
+            yield rows, texts
+
+    def _reembed(self, label, queryset, text_for, mirror):
+        # keep a bounded number of batches in flight and write them back in order,
+        # so the checkpoint only ever covers rows that are saved
+        max_in_flight = max(2 * (self.options["workers"] or 1), 2)
+        pending = deque()
+        done = 0
+
+        for rows, texts in self._batches(label, queryset, text_for):
+            if self.pool is not None:
+                pending.append((rows, self.pool.submit(_encode_in_worker, texts)))
+            else:
+                pending.append((rows, encode_batch(texts)))
+            while len(pending) >= max_in_flight:
+                done += self._write(label, *pending.popleft(), mirror=mirror)
+
+        while pending:
+            done += self._write(label, *pending.popleft(), mirror=mirror)
+        self.checkpoint.finish(label)
+        self.stdout.write(self.style.SUCCESS(f"{label}: re-embedded {done} rows"))
+
+    def _write(self, label, rows, vectors, mirror):
+        if hasattr(vectors, "result"):
+            vectors = vectors.result()
+        for row, vector in zip(rows, vectors):
+            row.vector_embedding = vector
+            row.embedding_model_version = self.version
+        rows[0].__class__.objects.bulk_update(rows, ["vector_embedding", "embedding_model_version"], batch_size=500)
+        if mirror:
+            self._mirror(rows)
+        self.checkpoint.advance(label, rows[-1].pk)
+        self.stdout.write(f"{label}: up to {rows[-1].pk} ({len(rows)} rows)")
+        return len(rows)
+
+    def _mirror(self, postings):
+        from accounts.firebase_admin import db
+        from accounts.firestore_mirror import job_document
+
+        for i in range(0, len(postings), FIRESTORE_BATCH_LIMIT):
+            batch = db.batch()
+            for posting in postings[i:i + FIRESTORE_BATCH_LIMIT]:
+                batch.set(
+                    job_document(posting.pk),
+                    {
+                        "vector_embedding": posting.vector_embedding.tolist(),
+                        "embedding_model_version": posting.embedding_model_version,
+                    },
+                    merge=True,
+                )
+            batch.commit()
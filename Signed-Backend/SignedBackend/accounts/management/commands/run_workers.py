@@ -0,0 +1,61 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from accounts.embedding_tasks import schedule_sweep
+from accounts.notification_tasks import schedule_retention
+from accounts.tasks import autodiscover, registered_task_types
+from accounts.tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Run background task workers (job embedding, Firestore mirroring, notifications, re-embedding, notification retention)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=2, help="Worker threads in this process.")
+        parser.add_argument("--types", default="", help="Comma-separated task types to run (default: all).")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Run until no task is due, then exit.")
+
+    def handle(self, *args, **options):
+        autodiscover()
+        task_types = [t.strip() for t in options["types"].split(",") if t.strip()] or None
+        unknown = set(task_types or []) - set(registered_task_types())
+        if unknown:
+            self.stderr.write(f"Unknown task types: {', '.join(sorted(unknown))}")
+            return
+
+        # rows left on an older embedding model version are re-embedded in the background
+        if (task_types is None or "embeddings.sweep" in task_types) and schedule_sweep():
+            self.stdout.write("Queued embeddings.sweep for stale embeddings")
+        if (task_types is None or "notifications.retention" in task_types) and schedule_retention():
+            self.stdout.write("Queued notifications.retention")
+
+        if options["once"]:
+            worker = Worker(task_types=task_types)
+            count = 0
+            while worker.run_once():
+                count += 1
+            self.stdout.write(f"Ran {count} tasks")
+            return
+
+        workers = [
+            Worker(task_types=task_types, poll_interval=options["poll_interval"])
+            for _ in range(options["threads"])
+        ]
+        threads = [threading.Thread(target=w.run_forever, name=f"task-worker-{i}") for i, w in enumerate(workers)]
+        self.stdout.write(
+            f"Running {len(workers)} workers for {', '.join(task_types or sorted(registered_task_types()))}"
+        )
+        for t in threads:
+            t.start()
+        try:
+            for t in threads:
+                while t.is_alive():
+                    t.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping workers after their current task...")
+            for w in workers:
+                w.stop()
+            for t in threads:
+                t.join()
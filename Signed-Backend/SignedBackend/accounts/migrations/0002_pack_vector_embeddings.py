@@ -0,0 +1,80 @@
+import numpy as np
+from django.db import migrations
+
+import accounts.fields
+
+BATCH_SIZE = 500
+
+
+def _copy(apps, source, target, convert):
+    for model_name in ("ApplicantProfile", "JobPosting"):
+        model = apps.get_model("accounts", model_name)
+        batch = []
+        rows = model.objects.exclude(**{f"{source}__isnull": True}).only("pk", source)
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            setattr(row, target, convert(getattr(row, source)))
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, [target])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, [target])
+
+
+def _to_packed(value):
+    if not value:
+        return None
+    return np.asarray(value, dtype=np.float32)
+
+
+def _to_json(value):
+    if value is None or len(value) == 0:
+        return None
+    return np.asarray(value, dtype=np.float32).tolist()
+
+
+def pack_embeddings(apps, schema_editor):
+    _copy(apps, "vector_embedding", "vector_embedding_packed", _to_packed)
+
+
+def unpack_embeddings(apps, schema_editor):
+    _copy(apps, "vector_embedding_packed", "vector_embedding", _to_json)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='vector_embedding_packed',
+            field=accounts.fields.EmbeddingField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='vector_embedding_packed',
+            field=accounts.fields.EmbeddingField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_embeddings, unpack_embeddings),
+        migrations.RemoveField(
+            model_name='applicantprofile',
+            name='vector_embedding',
+        ),
+        migrations.RemoveField(
+            model_name='jobposting',
+            name='vector_embedding',
+        ),
+        migrations.RenameField(
+            model_name='applicantprofile',
+            old_name='vector_embedding_packed',
+            new_name='vector_embedding',
+        ),
+        migrations.RenameField(
+            model_name='jobposting',
+            old_name='vector_embedding_packed',
+            new_name='vector_embedding',
+        ),
+    ]
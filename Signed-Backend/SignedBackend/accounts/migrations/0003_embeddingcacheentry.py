@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+import accounts.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_pack_vector_embeddings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmbeddingCacheEntry',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('model_name', models.CharField(max_length=255)),
+                ('vector', accounts.fields.EmbeddingField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+# every vector stored so far came from all-MiniLM-L6-v2 (accounts/embeddings/versions.py)
+INITIAL_VERSION = "minilm-l6-v1"
+
+
+def tag_existing_embeddings(apps, schema_editor):
+    for model_name in ("ApplicantProfile", "JobPosting"):
+        model = apps.get_model("accounts", model_name)
+        model.objects.filter(vector_embedding__isnull=False).update(embedding_model_version=INITIAL_VERSION)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_backgroundtask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='embedding_model_version',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='embedding_model_version',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.RunPython(tag_existing_embeddings, migrations.RunPython.noop),
+    ]
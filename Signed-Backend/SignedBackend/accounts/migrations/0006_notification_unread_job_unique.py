@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def drop_duplicate_unread(apps, schema_editor):
+    """Keep only the newest unread notification per (user, job_posting, notification_type)."""
+    Notification = apps.get_model("accounts", "Notification")
+    duplicated = (
+        Notification.objects
+        .filter(read=False, job_posting__isnull=False)
+        .values("user_id", "job_posting_id", "notification_type")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+    )
+    for group in duplicated.iterator():
+        rows = Notification.objects.filter(
+            read=False,
+            user_id=group["user_id"],
+            job_posting_id=group["job_posting_id"],
+            notification_type=group["notification_type"],
+        ).order_by("-created_at", "-id")
+        stale = list(rows.values_list("id", flat=True)[1:])
+        Notification.objects.filter(id__in=stale).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_embedding_model_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_unread, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('job_posting__isnull', False), ('read', False)),
+                fields=('user', 'job_posting', 'notification_type'),
+                name='accounts_notification_unread_job_uniq',
+            ),
+        ),
+    ]
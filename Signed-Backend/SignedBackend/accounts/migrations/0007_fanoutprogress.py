@@ -0,0 +1,34 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_notification_unread_job_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FanoutProgress',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('company_followers', 'Company followers')], max_length=50)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('done', 'Done')], default='running', max_length=10)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('processed', models.IntegerField(default=0)),
+                ('notified', models.IntegerField(default=0)),
+                ('chunks', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fanouts', to='accounts.jobposting')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job_posting', 'kind'), name='accounts_fanout_job_kind_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_fanoutprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='notification_delivery',
+            field=models.CharField(choices=[('instant', 'Instant'), ('digest', 'Digest')], default='instant', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='digest_window',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='NotificationDigestJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('match', 'Job match'), ('follow', 'Followed company')], max_length=10)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.jobposting')),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='digest_items', to='accounts.notification')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('notification', 'job_posting'), name='accounts_digest_job_uniq')],
+            },
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='digest_jobs',
+            field=models.ManyToManyField(blank=True, related_name='+', through='accounts.NotificationDigestJob', to='accounts.jobposting'),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('digest_window__isnull', False)),
+                fields=('user', 'digest_window'),
+                name='accounts_notification_digest_uniq',
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_notificationcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='fanout',
+            field=models.CharField(blank=True, choices=[('match', 'Job match'), ('follow', 'Followed company')], default='', max_length=10),
+        ),
+        migrations.RemoveConstraint(
+            model_name='notification',
+            name='accounts_notification_unread_job_uniq',
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('job_posting__isnull', False), ('read', False), models.Q(('fanout', ''), _negated=True)),
+                fields=('user', 'job_posting', 'notification_type'),
+                name='accounts_notification_unread_job_uniq',
+            ),
+        ),
+    ]
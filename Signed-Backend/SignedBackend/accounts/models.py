@@ -9,6 +9,7 @@ import secrets
 import string
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from .fields import EmbeddingField
 
 
 class CustomUserManager(BaseUserManager):
@@ -82,9 +83,15 @@ class ApplicantProfile(models.Model):
     portfolio_url = models.URLField(blank=True, null=True)
     profile_image = models.ImageField(upload_to="applicant_profiles/", blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
-    vector_embedding = models.JSONField(null=True, blank=True)
+    vector_embedding = EmbeddingField(null=True, blank=True)
+    # accounts/embeddings/versions.py entry that produced vector_embedding
+    embedding_model_version = models.CharField(max_length=64, blank=True, default="", db_index=True)
     personality_type = models.CharField(max_length=255, blank=True, null=True)
     notifications_enabled = models.BooleanField(default=True)
+    # job match / company follow notifications one by one, or rolled into one digest per window
+    notification_delivery = models.CharField(
+        max_length=10, choices=(('instant', 'Instant'), ('digest', 'Digest')), default='instant'
+    )
     bookmarked_jobs = models.ManyToManyField('JobPosting', related_name='bookmarked_by_applicants', blank=True)
     followed_companies = models.ManyToManyField(Company, related_name="followers", blank=True)
     reports = models.IntegerField(default=0)
@@ -125,7 +132,9 @@ class JobPosting(models.Model):
     tags = models.JSONField(default=list, blank=True)
     job_description = models.TextField(null=True)
     posted_by = models.ForeignKey(EmployerProfile, on_delete=models.CASCADE, related_name="job_postings", null=True)
-    vector_embedding = models.JSONField(null=True, blank=True)
+    vector_embedding = EmbeddingField(null=True, blank=True)
+    # accounts/embeddings/versions.py entry that produced vector_embedding
+    embedding_model_version = models.CharField(max_length=64, blank=True, default="", db_index=True)
     applicants = models.ManyToManyField(ApplicantProfile, blank=True, related_name="applied_jobs")
     personality_preferences = models.ManyToManyField(PersonalityType, blank=True)
 
@@ -220,6 +229,10 @@ class Notification(models.Model):
         ('warning', 'Warning'),
         ('error', 'Error'),
     )
+    FANOUT_CHOICES = (
+        ('match', 'Job match'),
+        ('follow', 'Followed company'),
+    )
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
@@ -232,6 +245,15 @@ class Notification(models.Model):
     
     job_posting = models.ForeignKey(JobPosting, on_delete=models.SET_NULL, null=True, blank=True, related_name='notifications')
     related_user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='notifications_received')
+
+    # fan-out that created the notification (new-job match, company followers); blank for the rest
+    fanout = models.CharField(max_length=10, choices=FANOUT_CHOICES, blank=True, default='')
+
+    # digest notifications: start of the window they aggregate, and the jobs they cover
+    digest_window = models.DateTimeField(null=True, blank=True)
+    digest_jobs = models.ManyToManyField(
+        JobPosting, through='NotificationDigestJob', blank=True, related_name='+'
+    )
     
     class Meta:
         ordering = ['-created_at']
@@ -239,7 +261,128 @@ class Notification(models.Model):
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['user', 'read']),
         ]
+        constraints = [
+            # at most one unread fan-out notification of each type per user and job (bulk
+            # fan-outs rely on it); notifications created through the API aren't deduplicated
+            models.UniqueConstraint(
+                fields=['user', 'job_posting', 'notification_type'],
+                condition=models.Q(read=False, job_posting__isnull=False) & ~models.Q(fanout=''),
+                name='accounts_notification_unread_job_uniq',
+            ),
+            # one digest per user and window
+            models.UniqueConstraint(
+                fields=['user', 'digest_window'],
+                condition=models.Q(digest_window__isnull=False),
+                name='accounts_notification_digest_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.title} ({'read' if self.read else 'unread'})"
 
+
+
+class NotificationDigestJob(models.Model):
+    """A job posting rolled into a digest notification."""
+    REASON_CHOICES = (
+        ('match', 'Job match'),
+        ('follow', 'Followed company'),
+    )
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='digest_items')
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='+')
+    reason = models.CharField(max_length=10, choices=REASON_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['notification', 'job_posting'], name='accounts_digest_job_uniq'),
+        ]
+
+
+class NotificationCounter(models.Model):
+    """A user's unread notification count, kept in step with their notifications (see accounts.notifications)."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter')
+    unread = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
+class EmbeddingCacheEntry(models.Model):
+    """An embedding keyed by the SHA-256 of the model name and the exact text encoded."""
+    key = models.CharField(max_length=64, primary_key=True)
+    model_name = models.CharField(max_length=255)
+    vector = EmbeddingField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.model_name} {self.key[:12]}"
+
+
+class BackgroundTask(models.Model):
+    """A unit of deferred work, claimed and run by `manage.py run_workers`."""
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_after = models.DateTimeField()
+    # a running task whose lock has expired is considered abandoned and is run again
+    locked_by = models.CharField(max_length=255, blank=True, default="")
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='accounts_task_due_idx'),
+            models.Index(fields=['task_type', 'status', 'locked_until'], name='accounts_task_lock_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_type} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
+
+
+class FanoutProgress(models.Model):
+    """How far a notification fan-out for a job posting has got; a rerun resumes after last_id."""
+    KIND_CHOICES = (
+        ('company_followers', 'Company followers'),
+    )
+    STATUS_CHOICES = (
+        ('running', 'Running'),
+        ('done', 'Done'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='fanouts')
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
+    # keyset position: id of the last recipient row processed
+    last_id = models.BigIntegerField(default=0)
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    notified = models.IntegerField(default=0)
+    chunks = models.IntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job_posting', 'kind'], name='accounts_fanout_job_kind_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.job_posting_id}: {self.processed}/{self.total} ({self.status})"
+
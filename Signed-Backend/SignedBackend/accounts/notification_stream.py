@@ -0,0 +1,281 @@
+"""
+Push of new notifications to connected clients (server-sent events).
+
+GET notifications/stream/ holds the connection open under ASGI and writes
+one `notification` event per unread notification created for the user,
+plus a comment line every NOTIFICATION_STREAM_KEEPALIVE seconds. The
+Firebase token is verified once per connection instead of once per poll.
+
+Events travel through a broker keyed by user id. The broker class comes
+from settings.NOTIFICATION_BROKER (a dotted path):
+
+    TablePollingBroker  the default, a stand-in for an external broker:
+                        job-match and follower notifications are created
+                        by run_workers processes, so each server process
+                        reads the rows of its connected users every
+                        NOTIFICATION_STREAM_POLL_INTERVAL seconds, one
+                        query for all of them.
+    InProcessBroker     fans out to the streams of this process only.
+                        Paths that create notifications call
+                        publish_on_commit, so it is enough when everything
+                        runs in the serving process (TASKS_EAGER).
+
+Either way the notifications table stays the source of truth: a client
+that reconnects refetches GET notifications/ to catch up.
+"""
+import asyncio
+import json
+import os
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.renderers import BaseRenderer
+
+from .models import Notification
+
+DEFAULT_NOTIFICATION_BROKER = "accounts.notification_stream.TablePollingBroker"
+
+# user ids per IN (...) lookup, under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Subscription:
+    """One connected stream: a bounded queue fed from any thread, read on the event loop."""
+
+    def __init__(self, broker, channel, loop, queue_size):
+        self.broker = broker
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # a client this far behind refetches the list when it catches up
+            self.broker.dropped += 1
+
+    async def get(self, timeout):
+        """The next event, or None if none arrived within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Fan-out of events to the subscriptions of this process."""
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or getattr(settings, "NOTIFICATION_STREAM_QUEUE_SIZE", 100)
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, channel):
+        """Subscribe to channel; must be called on the event loop that will read the events."""
+        subscription = Subscription(self, str(channel), asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.channel]
+
+    def subscribed(self, channels):
+        """The subset of channels publish() should be called for."""
+        with self._lock:
+            return {str(channel) for channel in channels if str(channel) in self._subscriptions}
+
+    def channels(self):
+        with self._lock:
+            return list(self._subscriptions)
+
+    def connections(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def publish(self, channel, event):
+        """Queue event for every subscription to channel; safe to call from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(str(channel), ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription._put, event)
+        self.published += len(subscriptions)
+        return len(subscriptions)
+
+    def stats(self):
+        with self._lock:
+            channels = len(self._subscriptions)
+        return {
+            "broker": type(self).__name__,
+            "pid": os.getpid(),
+            "connections": self.connections(),
+            "channels": channels,
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+class TablePollingBroker(InProcessBroker):
+    """
+    InProcessBroker fed by reading the notifications table.
+
+    publish_on_commit is a no-op with this broker (subscribed() is always
+    empty); a poller on the event loop instead reads the unread rows of
+    every connected user updated since the last poll. Each poll looks back
+    NOTIFICATION_STREAM_POLL_OVERLAP seconds so rows from transactions
+    that committed late are not missed, and skips rows already sent.
+    """
+
+    def __init__(self, queue_size=None, interval=None, overlap=None):
+        super().__init__(queue_size)
+        self.interval = interval or getattr(settings, "NOTIFICATION_STREAM_POLL_INTERVAL", 2)
+        self.overlap = timedelta(seconds=overlap or getattr(settings, "NOTIFICATION_STREAM_POLL_OVERLAP", 60))
+        self._poller = None
+        self._watermark = None
+        self._sent = {}
+
+    def subscribe(self, channel):
+        subscription = super().subscribe(channel)
+        if self._poller is None or self._poller.done():
+            self._watermark = timezone.now()
+            self._poller = subscription.loop.create_task(self._poll())
+        return subscription
+
+    def subscribed(self, channels):
+        return set()
+
+    async def _poll(self):
+        while self.channels():
+            await asyncio.sleep(self.interval)
+            try:
+                events = await sync_to_async(self.fetch)(self.channels())
+            except Exception as e:
+                print(f"[notification-stream] poll failed: {e}")
+                continue
+            for channel, event in events:
+                InProcessBroker.publish(self, channel, event)
+
+    def fetch(self, channels):
+        """(channel, event) pairs for the unread rows of channels not sent yet."""
+        since = self._watermark - self.overlap
+        rows = []
+        for chunk in _chunks(channels, LOOKUP_CHUNK_SIZE):
+            rows.extend(
+                Notification.objects
+                .filter(user_id__in=chunk, read=False, updated_at__gte=since)
+                .prefetch_related('digest_items__job_posting')
+                .order_by('updated_at')
+            )
+        fresh = [row for row in rows if self._sent.get(row.id) != row.updated_at]
+        for row in fresh:
+            self._sent[row.id] = row.updated_at
+            self._watermark = max(self._watermark, row.updated_at)
+        self._sent = {key: updated_at for key, updated_at in self._sent.items() if updated_at >= since}
+        return [(str(row.user_id), event) for row, event in zip(fresh, notification_events(fresh))]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, "NOTIFICATION_BROKER", DEFAULT_NOTIFICATION_BROKER))()
+    return _broker
+
+
+def notification_events(notifications):
+    from .serializers import NotificationSerializer
+
+    return NotificationSerializer(notifications, many=True).data
+
+
+def publish_notifications(notifications):
+    """
+    Push notifications, given as (id, user id) pairs, to their users' streams.
+
+    Only rows of users the broker has subscribers for are loaded, so a
+    fan-out to users who aren't connected costs no queries.
+    """
+    broker = get_broker()
+    notifications = list(notifications)
+    wanted = broker.subscribed({user_id for _, user_id in notifications})
+    ids = [notification_id for notification_id, user_id in notifications if str(user_id) in wanted]
+    for chunk in _chunks(ids, LOOKUP_CHUNK_SIZE):
+        rows = list(
+            Notification.objects
+            .filter(id__in=chunk, read=False)
+            .prefetch_related('digest_items__job_posting')
+            .order_by('created_at')
+        )
+        for row, event in zip(rows, notification_events(rows)):
+            broker.publish(row.user_id, event)
+
+
+def publish_on_commit(notifications):
+    """publish_notifications once the surrounding transaction (if any) commits."""
+    notifications = list(notifications)
+    if notifications:
+        transaction.on_commit(lambda: publish_notifications(notifications))
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF accept `Accept: text/event-stream`; error responses are written as a JSON body."""
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode(self.charset)
+
+
+def format_event(event, name=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if name is not None:
+        lines.append(f"event: {name}")
+    lines.append(f"data: {json.dumps(event, cls=DjangoJSONEncoder)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(broker, channel, keepalive=None):
+    """Server-sent events for channel until the client disconnects."""
+    keepalive = keepalive or getattr(settings, "NOTIFICATION_STREAM_KEEPALIVE", 15)
+    subscription = broker.subscribe(channel)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            event = await subscription.get(keepalive)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event, name="notification", event_id=event.get("id"))
+    finally:
+        subscription.close()
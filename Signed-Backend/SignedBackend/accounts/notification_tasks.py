@@ -0,0 +1,25 @@
+"""Periodic notification housekeeping, run by `manage.py run_workers`."""
+from django.conf import settings
+
+from .models import BackgroundTask
+from .retention import NotificationRetention
+from .tasks import enqueue, task
+
+
+@task("notifications.retention", max_attempts=3, visibility_timeout=1800)
+def apply_notification_retention(reschedule=True):
+    removed = NotificationRetention.from_settings().run()
+    print(f"[retention] removed {sum(removed.values())} notifications: {removed}")
+    # eager mode would run the rescheduled task straight away, forever
+    if reschedule and not getattr(settings, "TASKS_EAGER", False):
+        enqueue("notifications.retention", delay=getattr(settings, "NOTIFICATION_RETENTION_INTERVAL", 6 * 3600))
+    return removed
+
+
+def schedule_retention():
+    """Queue the retention task unless it is queued already."""
+    pending = BackgroundTask.objects.filter(task_type="notifications.retention", status__in=("queued", "running"))
+    if pending.exists():
+        return False
+    enqueue("notifications.retention")
+    return True
@@ -0,0 +1,369 @@
+"""
+Bulk creation of job notifications.
+
+A fan-out (new-job matches, company followers) creates one unread
+notification per recipient for a job posting. Recipients that already
+have an unread notification of that type for the job are looked up in one
+query per chunk and skipped, and the rest are inserted with bulk_create.
+The unread-notification unique constraint on (user, job_posting,
+notification_type) over fan-out rows backs this up: inserts that lose a
+race with a concurrent fan-out are dropped by the database
+(ignore_conflicts). Notifications created through the API carry no
+fanout and are never deduplicated.
+
+Applicants whose notification_delivery is "digest" get no per-job rows:
+each job is added to one digest notification per user and window
+(NOTIFICATION_DIGEST_WINDOW_MINUTES) that lists its jobs through the
+NotificationDigestJob join table.
+
+Large fan-outs (a company's followers) are streamed by run_fanout: the
+recipients are walked in id order in fixed-size chunks, each chunk is
+committed in its own transaction together with a FanoutProgress record,
+and a rerun resumes after the last committed chunk.
+
+Each user's unread count is kept in a NotificationCounter row so the
+app's badge poll is a primary-key lookup. The row is created from a
+COUNT the first time it is read; after that every path that creates,
+reads or deletes notifications adjusts it with an F() update (a no-op
+for users that have no counter yet). recount_unread rebuilds counters
+from the table when they may have drifted.
+
+New rows are handed to accounts.notification_stream (publish_on_commit)
+for the users connected to GET notifications/stream/.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ApplicantProfile, FanoutProgress, Notification, NotificationCounter, NotificationDigestJob
+from .notification_stream import publish_on_commit
+
+# user ids per IN (...) lookup, under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+NOTIFICATIONS_PAGE_SIZE = getattr(settings, "NOTIFICATIONS_PAGE_SIZE", 50)
+NOTIFICATIONS_MAX_PAGE_SIZE = 200
+NOTIFICATIONS_CURSOR_SALT = "accounts.notifications.cursor"
+
+# ids accepted by the bulk endpoints, so each is one IN (...) statement
+BULK_NOTIFICATION_MAX_IDS = LOOKUP_CHUNK_SIZE
+
+DIGEST_TITLE = "Your job digest"
+DIGEST_MESSAGE = "New job matches and new jobs from companies you follow."
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def adjust_unread(user_ids, delta):
+    """Add delta to the unread counters of the (distinct) user_ids that have one."""
+    for chunk in _chunks(list(user_ids), LOOKUP_CHUNK_SIZE):
+        NotificationCounter.objects.filter(user_id__in=chunk).update(
+            unread=F('unread') + delta, updated_at=timezone.now()
+        )
+
+
+def unread_count(user_id):
+    """The user's unread notification count, counted once and then read from their counter."""
+    counter = NotificationCounter.objects.filter(user_id=user_id).values_list('unread', flat=True).first()
+    if counter is None:
+        counter, _ = NotificationCounter.objects.get_or_create(
+            user_id=user_id,
+            defaults={'unread': Notification.objects.filter(user_id=user_id, read=False).count()},
+        )
+        counter = counter.unread
+    return max(counter, 0)
+
+
+def recount_unread(user_ids):
+    """Rebuild the existing unread counters of user_ids from the notifications table."""
+    unread = (
+        Notification.objects
+        .filter(user_id=OuterRef('user_id'), read=False)
+        .values('user_id')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    for chunk in _chunks(list(user_ids), LOOKUP_CHUNK_SIZE):
+        NotificationCounter.objects.filter(user_id__in=chunk).update(
+            unread=Coalesce(Subquery(unread), 0), updated_at=timezone.now()
+        )
+
+
+def _user_selection(user_id, notification_ids=None, before=None):
+    notifications = Notification.objects.filter(user_id=user_id)
+    if notification_ids is not None:
+        notifications = notifications.filter(id__in=notification_ids)
+    if before is not None:
+        notifications = notifications.filter(created_at__lte=before)
+    return notifications
+
+
+def mark_read(user_id, notification_ids=None, before=None):
+    """
+    Mark the user's notifications read, by id or all created at or before `before`.
+
+    Returns:
+        number of notifications that were unread
+    """
+    with transaction.atomic():
+        updated = (
+            _user_selection(user_id, notification_ids, before)
+            .filter(read=False)
+            .update(read=True, updated_at=timezone.now())
+        )
+        if updated:
+            adjust_unread([user_id], -updated)
+    return updated
+
+
+def delete_notifications(user_id, notification_ids=None, before=None):
+    """
+    Delete the user's notifications, by id or all created at or before `before`.
+
+    Returns:
+        number of notifications deleted
+    """
+    with transaction.atomic():
+        deleted = _user_selection(user_id, notification_ids, before).delete()[1].get(Notification._meta.label, 0)
+        if deleted:
+            recount_unread([user_id])
+    return deleted
+
+
+def encode_notifications_cursor(user_id, notification):
+    return signing.dumps(
+        {"u": str(user_id), "c": notification.created_at.isoformat(), "i": str(notification.id)},
+        salt=NOTIFICATIONS_CURSOR_SALT,
+    )
+
+
+def decode_notifications_cursor(token, user_id):
+    """The (created_at, id) to continue before, or None if the token isn't valid for this user."""
+    try:
+        data = signing.loads(token, salt=NOTIFICATIONS_CURSOR_SALT)
+        if data["u"] != str(user_id):
+            return None
+        created_at = parse_datetime(data["c"])
+        if created_at is None:
+            return None
+        return created_at, data["i"]
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+def page_notifications(user_id, before=None, limit=NOTIFICATIONS_PAGE_SIZE, read=None):
+    """
+    One page of a user's notifications, newest first.
+
+    Pages are keyed on (created_at, id), so each page is a range scan of
+    the (user, -created_at) index starting where the previous one ended.
+
+    Returns:
+        (list of notifications, the last one or None if there are no more)
+    """
+    notifications = Notification.objects.filter(user_id=user_id)
+    if read is not None:
+        notifications = notifications.filter(read=read)
+    if before is not None:
+        created_at, notification_id = before
+        notifications = notifications.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=notification_id)
+        )
+    rows = list(
+        notifications.prefetch_related('digest_items__job_posting').order_by('-created_at', '-id')[:limit + 1]
+    )
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    return rows, (rows[-1] if has_next else None)
+
+
+def users_with_unread(job_posting, user_ids, notification_type=None):
+    """The subset of user_ids with an unread notification for the job (of the type, if given)."""
+    existing = set()
+    for chunk in _chunks(user_ids, LOOKUP_CHUNK_SIZE):
+        unread = Notification.objects.filter(job_posting=job_posting, read=False, user_id__in=chunk)
+        if notification_type is not None:
+            unread = unread.filter(notification_type=notification_type)
+        existing.update(unread.values_list('user_id', flat=True))
+    return existing
+
+
+def digest_window(now=None):
+    """Start of the digest window now falls in."""
+    seconds = getattr(settings, "NOTIFICATION_DIGEST_WINDOW_MINUTES", 60) * 60
+    now = now or timezone.now()
+    return datetime.fromtimestamp(int(now.timestamp()) // seconds * seconds, tz=dt_timezone.utc)
+
+
+def digest_users(user_ids):
+    """The subset of user_ids that take job notifications as digests."""
+    digest = set()
+    for chunk in _chunks(user_ids, LOOKUP_CHUNK_SIZE):
+        digest.update(
+            ApplicantProfile.objects
+            .filter(user_id__in=chunk, notification_delivery='digest')
+            .values_list('user_id', flat=True)
+        )
+    return digest
+
+
+def add_to_digests(job_posting, user_ids, reason, now=None):
+    """
+    Roll job_posting into each user's digest for the current window.
+
+    Creates the digests that don't exist yet, adds the job to the ones
+    that don't list it yet and marks those unread again, a fixed number of
+    queries per chunk of users. A digest that already lists the job is
+    left as it is, read or not.
+
+    Returns:
+        number of users whose digest now lists the job
+    """
+    window = digest_window(now)
+    for chunk in _chunks(list(user_ids), LOOKUP_CHUNK_SIZE):
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    user_id=user_id,
+                    title=DIGEST_TITLE,
+                    message=DIGEST_MESSAGE,
+                    notification_type='info',
+                    digest_window=window,
+                )
+                for user_id in chunk
+            ],
+            ignore_conflicts=True,
+        )
+        digests = dict(
+            Notification.objects.filter(user_id__in=chunk, digest_window=window).values_list('id', 'user_id')
+        )
+        listed = set(
+            NotificationDigestJob.objects
+            .filter(notification_id__in=list(digests), job_posting=job_posting)
+            .values_list('notification_id', flat=True)
+        )
+        gained = {digest_id: user_id for digest_id, user_id in digests.items() if digest_id not in listed}
+        if not gained:
+            continue
+        NotificationDigestJob.objects.bulk_create(
+            [
+                NotificationDigestJob(notification_id=digest_id, job_posting=job_posting, reason=reason)
+                for digest_id in gained
+            ],
+            ignore_conflicts=True,
+        )
+        Notification.objects.filter(id__in=list(gained), read=True).update(read=False, updated_at=timezone.now())
+        recount_unread(gained.values())
+        publish_on_commit(gained.items())
+    return len(user_ids)
+
+
+def create_job_notifications(job_posting, user_ids, *, fanout, notification_type, title, message,
+                             skip_any_unread=False, digest_reason=None, batch_size=None):
+    """
+    Create an unread notification about job_posting for each of user_ids.
+
+    fanout ("match" or "follow") is recorded on the rows; the unread-job
+    unique constraint only covers fan-out rows.
+
+    Users that already have an unread one of notification_type for the job
+    are skipped (of any type with skip_any_unread). With digest_reason
+    ("match" or "follow"), users who chose digests get the job added to
+    their current digest instead.
+
+    Returns:
+        number of notifications written; rows a concurrent fan-out beat us
+        to are dropped by the database and left out of this count, the
+        unread counters and the stream
+    """
+    batch_size = batch_size or getattr(settings, "NOTIFICATION_BULK_BATCH_SIZE", 500)
+    user_ids = list(dict.fromkeys(user_ids))
+    digested = 0
+    if digest_reason is not None:
+        digest = digest_users(user_ids)
+        if digest:
+            digested = add_to_digests(job_posting, [user_id for user_id in user_ids if user_id in digest], digest_reason)
+            user_ids = [user_id for user_id in user_ids if user_id not in digest]
+    existing = users_with_unread(job_posting, user_ids, None if skip_any_unread else notification_type)
+
+    pending = [
+        Notification(
+            user_id=user_id,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            job_posting=job_posting,
+            fanout=fanout,
+            read=False,
+        )
+        for user_id in user_ids
+        if user_id not in existing
+    ]
+    created = digested
+    for batch in _chunks(pending, batch_size):
+        Notification.objects.bulk_create(batch, ignore_conflicts=True)
+        # ids are generated client-side, so the ones that exist now are the rows that went in
+        inserted = list(
+            Notification.objects
+            .filter(id__in=[notification.id for notification in batch])
+            .values_list('id', 'user_id')
+        )
+        adjust_unread([user_id for _, user_id in inserted], 1)
+        publish_on_commit(inserted)
+        created += len(inserted)
+    return created
+
+
+def run_fanout(job_posting, kind, recipients, notify, chunk_size=None):
+    """
+    Notify every recipient of a fan-out, chunk_size rows per transaction.
+
+    Args:
+        job_posting: the JobPosting the fan-out is about
+        kind: FanoutProgress.kind of the fan-out
+        recipients: queryset of (row id, user id) pairs; the row id is the
+            keyset the walk resumes from, so it must be unique and stable
+        notify: called with each chunk's user ids; returns how many
+            notifications it created
+
+    Returns:
+        the FanoutProgress record, finished unless an error was raised
+    """
+    chunk_size = chunk_size or getattr(settings, "NOTIFICATION_FANOUT_CHUNK_SIZE", 1000)
+    progress, created = FanoutProgress.objects.get_or_create(job_posting=job_posting, kind=kind)
+    if progress.status == 'done':
+        return progress
+    if created:
+        progress.total = recipients.count()
+        progress.save(update_fields=['total', 'updated_at'])
+    else:
+        print(f"[fanout] resuming {progress}")
+
+    while True:
+        with transaction.atomic():
+            progress = FanoutProgress.objects.select_for_update().get(pk=progress.pk)
+            if progress.status == 'done':
+                return progress
+            rows = list(recipients.filter(id__gt=progress.last_id).order_by('id')[:chunk_size])
+            if not rows:
+                progress.status = 'done'
+                progress.finished_at = timezone.now()
+                progress.save()
+                print(f"[fanout] finished {progress}")
+                return progress
+
+            progress.notified += notify([user_id for _, user_id in rows])
+            progress.last_id = rows[-1][0]
+            progress.processed += len(rows)
+            progress.chunks += 1
+            progress.save()
+
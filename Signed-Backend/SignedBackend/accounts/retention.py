@@ -0,0 +1,109 @@
+"""
+Retention for Notification rows.
+
+Two policies, each optional (None turns it off):
+
+    read_days       delete read notifications older than this many days
+    max_per_user    keep only each user's newest max_per_user notifications
+
+Matching rows are deleted in small batches, each in its own short
+transaction with a pause in between, so a run never holds the SQLite
+write lock for long. Batches are walked by primary key, a stable keyset
+but not an age order (ids are random UUIDs): a batch is an arbitrary
+slice of the matching rows. Run it with `manage.py prune_notifications`
+or let the notifications.retention task (scheduled by run_workers) do it
+periodically. Read-expired rows never touch the unread counters; users
+trimmed to max_per_user get theirs recounted.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Notification
+from .notifications import recount_unread
+
+
+class NotificationRetention:
+    def __init__(self, read_days=30, max_per_user=500, batch_size=500, pause=0.05):
+        self.read_days = read_days
+        self.max_per_user = max_per_user
+        self.batch_size = batch_size
+        self.pause = pause
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            read_days=getattr(settings, "NOTIFICATION_RETENTION_READ_DAYS", 30),
+            max_per_user=getattr(settings, "NOTIFICATION_RETENTION_MAX_PER_USER", 500),
+            batch_size=getattr(settings, "NOTIFICATION_RETENTION_BATCH_SIZE", 500),
+            pause=getattr(settings, "NOTIFICATION_RETENTION_PAUSE", 0.05),
+        )
+
+    def run(self, now=None, dry_run=False):
+        """
+        Apply every policy once.
+
+        Returns:
+            {policy: rows removed (or that would be, with dry_run)}
+        """
+        removed = {}
+        if self.read_days is not None:
+            cutoff = (now or timezone.now()) - timedelta(days=self.read_days)
+            removed["read_expired"] = self._delete(
+                Notification.objects.filter(read=True, created_at__lt=cutoff), dry_run
+            )
+        if self.max_per_user is not None:
+            users = self._users_over_limit()
+            removed["over_user_limit"] = sum(self._delete(self._beyond_limit(user_id), dry_run) for user_id in users)
+            if not dry_run:
+                # the trimmed rows may have been unread
+                recount_unread(users)
+        return removed
+
+    def _users_over_limit(self):
+        return list(
+            Notification.objects
+            .values('user_id')
+            .annotate(total=Count('id'))
+            .filter(total__gt=self.max_per_user)
+            .values_list('user_id', flat=True)
+        )
+
+    def _beyond_limit(self, user_id):
+        """The user's notifications older than their max_per_user-th newest."""
+        notifications = Notification.objects.filter(user_id=user_id)
+        if self.max_per_user <= 0:
+            return notifications
+        # the oldest row to keep, found by walking the (user, -created_at) index
+        boundary = list(
+            notifications
+            .order_by('-created_at', '-id')
+            .values_list('created_at', 'id')[self.max_per_user - 1:self.max_per_user]
+        )
+        if not boundary:
+            return notifications.none()
+        created_at, boundary_id = boundary[0]
+        return notifications.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=boundary_id))
+
+    def _delete(self, queryset, dry_run):
+        if dry_run:
+            return queryset.count()
+
+        removed = 0
+        last_id = None
+        while True:
+            batch = queryset.order_by('pk')
+            if last_id is not None:
+                batch = batch.filter(pk__gt=last_id)
+            ids = list(batch.values_list('pk', flat=True)[:self.batch_size])
+            if not ids:
+                return removed
+            with transaction.atomic():
+                removed += Notification.objects.filter(pk__in=ids).delete()[1].get(Notification._meta.label, 0)
+            last_id = ids[-1]
+            if self.pause and len(ids) == self.batch_size:
+                time.sleep(self.pause)
@@ -0,0 +1,153 @@
+"""
+Load test for GET notifications/stream/.
+
+Opens --connections server-sent-event streams (ramped over --ramp seconds),
+holds them for --duration seconds and reports how many were accepted, what
+they received, and how the open streams are spread over the server's
+worker processes (from notification-stream-stats/, which answers from
+whichever worker the request lands on).
+
+Run the server under ASGI, e.g.
+
+    uvicorn asgi:application --workers 4 --port 8000
+
+then
+
+    python accounts/scripts/notification_stream_load.py --tokens-file tokens.txt --connections 2000
+
+Tokens are Firebase ID tokens, one per line; connections cycle through
+them, so a handful of test users is enough. Raise the open-file limit
+(ulimit -n) of both sides above the connection count.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from datetime import datetime
+
+import httpx
+
+BASE_URL = "http://127.0.0.1:8000/api/v1/users/"
+
+
+class Results:
+    def __init__(self):
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.open = 0
+        self.peak_open = 0
+        self.events = 0
+        self.keepalives = 0
+        self.latencies = []
+        self.connect_times = []
+
+
+async def hold_stream(client, url, token, duration, results):
+    started = time.perf_counter()
+    try:
+        async with client.stream(
+            "GET", url, headers={"Authorization": f"Bearer {token}", "Accept": "text/event-stream"}
+        ) as response:
+            results.statuses[response.status_code] += 1
+            if response.status_code != 200:
+                return
+            results.connect_times.append(time.perf_counter() - started)
+            results.open += 1
+            results.peak_open = max(results.peak_open, results.open)
+            try:
+                await asyncio.wait_for(read_events(response, results), duration)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                results.open -= 1
+    except httpx.HTTPError as e:
+        results.errors[type(e).__name__] += 1
+
+
+async def read_events(response, results):
+    async for line in response.aiter_lines():
+        if line.startswith(":"):
+            results.keepalives += 1
+        elif line.startswith("data:"):
+            results.events += 1
+            event = json.loads(line[len("data:"):])
+            created_at = event.get("created_at")
+            if created_at:
+                sent = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+                results.latencies.append(time.time() - sent.timestamp())
+
+
+async def sample_workers(client, url, samples):
+    """{pid: open streams} as seen by the workers the samples landed on."""
+    workers = {}
+    for _ in range(samples):
+        try:
+            stats = (await client.get(url)).json()["notification_stream"]
+            workers[stats["pid"]] = stats
+        except (httpx.HTTPError, ValueError, KeyError):
+            pass
+    return workers
+
+
+async def run(args):
+    tokens = list(args.token or [])
+    if args.tokens_file:
+        with open(args.tokens_file) as f:
+            tokens.extend(line.strip() for line in f if line.strip())
+    if not tokens:
+        raise SystemExit("pass --token or --tokens-file")
+
+    results = Results()
+    limits = httpx.Limits(max_connections=args.connections + 10, max_keepalive_connections=0)
+    timeout = httpx.Timeout(args.timeout, read=None)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        streams = []
+        for i in range(args.connections):
+            streams.append(asyncio.create_task(
+                hold_stream(client, args.base_url + "notifications/stream/", tokens[i % len(tokens)],
+                            args.duration, results)
+            ))
+            if args.ramp:
+                await asyncio.sleep(args.ramp / args.connections)
+
+        # let the last streams settle before looking at the workers
+        await asyncio.sleep(min(5, args.duration / 2))
+        held = results.open
+        async with httpx.AsyncClient(timeout=args.timeout) as stats_client:
+            workers = await sample_workers(stats_client, args.base_url + "notification-stream-stats/", args.samples)
+        await asyncio.gather(*streams)
+
+    print(f"connections attempted: {args.connections}")
+    print(f"responses:             {dict(results.statuses)}")
+    if results.errors:
+        print(f"errors:                {dict(results.errors)}")
+    print(f"open after ramp:       {held} (peak {results.peak_open})")
+    if results.connect_times:
+        print(f"connect time:          median {statistics.median(results.connect_times) * 1000:.0f} ms, "
+              f"max {max(results.connect_times) * 1000:.0f} ms")
+    print(f"events received:       {results.events} (+{results.keepalives} keepalives)")
+    if results.latencies:
+        print(f"event latency:         median {statistics.median(results.latencies) * 1000:.0f} ms, "
+              f"max {max(results.latencies) * 1000:.0f} ms")
+    print(f"workers seen:          {len(workers)}")
+    for pid, stats in sorted(workers.items()):
+        print(f"  pid {pid}: {stats['connections']} streams for {stats['channels']} users ({stats['broker']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--token", action="append", help="Firebase ID token (repeatable)")
+    parser.add_argument("--tokens-file", help="file of Firebase ID tokens, one per line")
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which to open the streams")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to hold each stream")
+    parser.add_argument("--samples", type=int, default=50, help="stats requests used to find the workers")
+    parser.add_argument("--timeout", type=float, default=30.0, help="connect timeout in seconds")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import User, EmployerProfile, ApplicantProfile, Company, Notification
+from .models import User, EmployerProfile, ApplicantProfile, Company, Notification, NotificationDigestJob
+from .embeddings import current_version, encode_one
+from .notifications import BULK_NOTIFICATION_MAX_IDS
 import os
 import fitz
 import numpy as np
@@ -7,9 +9,6 @@ from docx import Document
 import mimetypes
 import subprocess, os
 
-from sentence_transformers import SentenceTransformer
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
-
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -43,14 +42,31 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
         # to update employer profile fields
         return super().update(instance, validated_data)
 
+class EmbeddingSerializerField(serializers.Field):
+    """Exposes an EmbeddingField as the JSON list of floats the API has always returned."""
+
+    def to_representation(self, value):
+        return np.asarray(value, dtype=np.float32).tolist()
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (list, tuple)):
+            raise serializers.ValidationError("Expected a list of numbers.")
+        try:
+            return np.asarray(data, dtype=np.float32)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError("Expected a list of numbers.")
+
 class ApplicantProfileSerializer(serializers.ModelSerializer):
+    vector_embedding = EmbeddingSerializerField(required=False, allow_null=True)
+
     class Meta:
         model = ApplicantProfile
-        fields = ["major", "school", "bio", "resume", "resume_file", "skills", "portfolio_url", "profile_image", "vector_embedding", "personality_type", "notifications_enabled", "reports"]
+        fields = ["major", "school", "bio", "resume", "resume_file", "skills", "portfolio_url", "profile_image", "vector_embedding", "personality_type", "notifications_enabled", "notification_delivery", "reports"]
 
     def update(self, instance, validated_data):
-        # Remove notifications_enabled from update to prevent overwriting it
+        # Remove the notification preferences from update to prevent overwriting them
         validated_data.pop("notifications_enabled", None)
+        validated_data.pop("notification_delivery", None)
         return super().update(instance, validated_data)
         
 class MeSerializer(serializers.ModelSerializer):
@@ -187,13 +203,7 @@ class ApplicantSignupSerializer(serializers.ModelSerializer):
             try:
                 text = extract_text_from_resume(resume_file)
                 if text.strip():  # Only process if text was extracted
-                    vector_new = embedding_model.encode([text])[0]
-                    # Normalize the vector to unit length
-                    norm = np.linalg.norm(vector_new)
-                    if norm > 0:
-                        vector_embedding = (vector_new / norm).tolist()
-                    else:
-                        vector_embedding = vector_new.tolist()
+                    vector_embedding = encode_one(text)
             except Exception as e:
                 # Log the error but don't fail the user creation
                 print(f"Error processing resume for vector embedding: {e}")
@@ -211,16 +221,38 @@ class ApplicantSignupSerializer(serializers.ModelSerializer):
             resume_file=resume_file,
             skills=skills,
             portfolio_url=portfolio_url,
-            vector_embedding=vector_embedding
+            vector_embedding=vector_embedding,
+            embedding_model_version=current_version().name if vector_embedding is not None else "",
         )
         return user
 
+class NotificationDigestJobSerializer(serializers.ModelSerializer):
+    job_title = serializers.CharField(source='job_posting.job_title', read_only=True)
+
+    class Meta:
+        model = NotificationDigestJob
+        fields = ['job_posting', 'job_title', 'reason']
+
 class NotificationSerializer(serializers.ModelSerializer):
+    digest_jobs = NotificationDigestJobSerializer(source='digest_items', many=True, read_only=True)
+
     class Meta:
         model = Notification
-        fields = ['id', 'title', 'message', 'notification_type', 'read', 'created_at', 'updated_at', 'job_posting', 'related_user']
+        fields = ['id', 'title', 'message', 'notification_type', 'read', 'created_at', 'updated_at', 'job_posting', 'related_user', 'digest_window', 'digest_jobs']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+class BulkNotificationSerializer(serializers.Serializer):
+    """Selects the caller's notifications for a bulk update or delete: by id, or everything created at or before all_before."""
+    notification_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False, max_length=BULK_NOTIFICATION_MAX_IDS
+    )
+    all_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if ('notification_ids' in attrs) == ('all_before' in attrs):
+            raise serializers.ValidationError("Provide exactly one of notification_ids or all_before")
+        return attrs
+
 class CreateNotificationSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=255, required=True)
     message = serializers.CharField(required=True)
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .embeddings import is_current
+from .fields import has_embedding
+from .models import ApplicantProfile, JobPosting
+from .vector_index import applicant_vector_index, job_vector_index
+
+
+@receiver(post_save, sender=JobPosting)
+def sync_job_vector_index(sender, instance, update_fields=None, **kwargs):
+    # counters like likes_count/impressions don't change the ranking vectors
+    if update_fields is not None and not {"vector_embedding", "embedding_model_version", "is_active"} & set(update_fields):
+        return
+    # the index only holds vectors of the current embedding model version
+    if (
+        instance.is_active
+        and has_embedding(instance.vector_embedding)
+        and is_current(instance.embedding_model_version)
+    ):
+        job_vector_index.upsert(instance.id, instance.vector_embedding)
+    else:
+        job_vector_index.remove(instance.id)
+
+
+@receiver(post_delete, sender=JobPosting)
+def remove_job_from_vector_index(sender, instance, **kwargs):
+    job_vector_index.remove(instance.id)
+
+
+@receiver(post_save, sender=ApplicantProfile)
+def sync_applicant_vector_index(sender, instance, update_fields=None, **kwargs):
+    if not getattr(settings, "APPLICANT_INDEX_IN_MEMORY", True):
+        return
+    if update_fields is not None and not {
+        "vector_embedding", "embedding_model_version", "notifications_enabled"
+    } & set(update_fields):
+        return
+    if (
+        instance.notifications_enabled
+        and has_embedding(instance.vector_embedding)
+        and is_current(instance.embedding_model_version)
+    ):
+        applicant_vector_index.upsert(instance.pk, instance.vector_embedding)
+    else:
+        applicant_vector_index.remove(instance.pk)
+
+
+@receiver(post_delete, sender=ApplicantProfile)
+def remove_applicant_from_vector_index(sender, instance, **kwargs):
+    applicant_vector_index.remove(instance.pk)
@@ -0,0 +1,42 @@
+"""
+A small database-backed task queue for work that shouldn't hold up a request.
+
+Handlers are registered by name with @task(...) and queued with enqueue();
+`python manage.py run_workers` claims and runs them. There is no external
+broker: BackgroundTask rows are the queue.
+
+    @task("job_posting.embed", concurrency=2, visibility_timeout=120)
+    def embed_job_posting(job_id):
+        ...
+
+    enqueue("job_posting.embed", job_id=str(posting.id))
+
+Each task type has its own retry budget (max_attempts, with exponential
+backoff between attempts), visibility timeout (a claimed task not finished
+within it is handed to another worker) and concurrency limit across all
+workers. Handlers can run more than once, so they must be idempotent.
+"""
+from .registry import TaskType, get_task_type, registered_task_types, task
+from .queue import enqueue
+
+TASK_MODULES = ["accounts.job_tasks", "accounts.embedding_tasks", "accounts.notification_tasks"]
+
+
+def autodiscover():
+    """Import the modules that register task handlers."""
+    from importlib import import_module
+
+    from django.conf import settings
+
+    for module in getattr(settings, "TASK_MODULES", TASK_MODULES):
+        import_module(module)
+
+
+__all__ = [
+    "TaskType",
+    "autodiscover",
+    "enqueue",
+    "get_task_type",
+    "registered_task_types",
+    "task",
+]
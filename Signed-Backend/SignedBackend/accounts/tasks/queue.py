@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .registry import get_task_type
+
+
+def enqueue(task_type, delay=0, **payload):
+    """
+    Queue a task. Inside a transaction the row commits (and becomes visible
+    to workers) together with the caller's writes.
+
+    With TASKS_EAGER the handler instead runs inline on commit (for tests and
+    local setups without a worker).
+    """
+    if getattr(settings, "TASKS_EAGER", False):
+        transaction.on_commit(lambda: run_eagerly(task_type, payload))
+        return None
+
+    from ..models import BackgroundTask
+
+    registered = get_task_type(task_type)
+    task_row = BackgroundTask.objects.create(
+        task_type=task_type,
+        payload=payload,
+        max_attempts=registered.max_attempts if registered else 5,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    return task_row
+
+
+def run_eagerly(task_type, payload):
+    from . import autodiscover
+
+    autodiscover()
+    registered = get_task_type(task_type)
+    if registered is None:
+        print(f"[tasks] no handler registered for {task_type}")
+        return
+    try:
+        registered.handler(**payload)
+    except Exception as e:
+        print(f"[tasks] {task_type} failed: {e}")
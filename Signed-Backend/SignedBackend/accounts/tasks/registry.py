@@ -0,0 +1,33 @@
+class TaskType:
+    def __init__(self, name, handler, max_attempts=5, concurrency=1, visibility_timeout=300,
+                 backoff_base=5, backoff_max=3600):
+        self.name = name
+        self.handler = handler
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def backoff(self, attempts):
+        """Seconds to wait before the next attempt, after `attempts` failures."""
+        return min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+
+
+_registry = {}
+
+
+def task(name, **options):
+    """Register the decorated function as the handler for task type `name`."""
+    def decorator(handler):
+        _registry[name] = TaskType(name, handler, **options)
+        return handler
+    return decorator
+
+
+def get_task_type(name):
+    return _registry.get(name)
+
+
+def registered_task_types():
+    return dict(_registry)
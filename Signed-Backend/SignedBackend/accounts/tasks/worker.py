@@ -0,0 +1,124 @@
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .registry import get_task_type, registered_task_types
+
+
+class Worker:
+    """
+    Claims due tasks and runs them, one at a time.
+
+    A task is due when it is queued and its run_after has passed, or when it
+    is running but its lock (visibility timeout) expired because the worker
+    that claimed it died. Claims are conditional updates, so two workers can
+    never run the same attempt; a task type's concurrency limit counts the
+    live locks of that type across every worker.
+    """
+
+    def __init__(self, task_types=None, poll_interval=1.0, name=None):
+        self.task_types = list(task_types) if task_types else None
+        self.poll_interval = poll_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _types(self):
+        registered = registered_task_types()
+        if self.task_types is None:
+            return registered
+        return {name: registered[name] for name in self.task_types if name in registered}
+
+    def claim(self):
+        """Lock the next due task for this worker and return it, or None."""
+        from ..models import BackgroundTask
+
+        now = timezone.now()
+        for task_type in self._types().values():
+            with transaction.atomic():
+                running = BackgroundTask.objects.filter(
+                    task_type=task_type.name, status='running', locked_until__gt=now
+                ).count()
+                if running >= task_type.concurrency:
+                    continue
+
+                due = BackgroundTask.objects.filter(task_type=task_type.name).filter(
+                    Q(status='queued', run_after__lte=now) | Q(status='running', locked_until__lte=now)
+                ).order_by('run_after')
+                if connection.features.has_select_for_update_skip_locked:
+                    due = due.select_for_update(skip_locked=True)
+                candidate = due.first()
+                if candidate is None:
+                    continue
+
+                claimed = BackgroundTask.objects.filter(
+                    id=candidate.id, status=candidate.status, attempts=candidate.attempts
+                ).update(
+                    status='running',
+                    attempts=candidate.attempts + 1,
+                    locked_by=self.name,
+                    locked_until=now + timedelta(seconds=task_type.visibility_timeout),
+                )
+                if claimed:
+                    candidate.refresh_from_db()
+                    return candidate
+        return None
+
+    def run_task(self, task_row):
+        from ..models import BackgroundTask
+
+        task_type = get_task_type(task_row.task_type)
+        mine = BackgroundTask.objects.filter(id=task_row.id, locked_by=self.name, attempts=task_row.attempts)
+        started = time.perf_counter()
+        try:
+            task_type.handler(**task_row.payload)
+        except Exception as e:
+            error = "".join(traceback.format_exception(e))[-4000:]
+            if task_row.attempts >= task_row.max_attempts:
+                mine.update(status='failed', last_error=error, locked_until=None, finished_at=timezone.now())
+                print(f"[tasks] {task_row.task_type} {task_row.id} failed for good: {e}")
+            else:
+                # exponential backoff with jitter so retries of a burst don't line up
+                delay = task_type.backoff(task_row.attempts) * random.uniform(0.8, 1.2)
+                mine.update(
+                    status='queued',
+                    last_error=error,
+                    locked_until=None,
+                    run_after=timezone.now() + timedelta(seconds=delay),
+                )
+                print(f"[tasks] {task_row.task_type} {task_row.id} attempt {task_row.attempts} failed, retrying in {delay:.0f}s: {e}")
+            return False
+
+        mine.update(status='done', locked_until=None, finished_at=timezone.now())
+        print(f"[tasks] {task_row.task_type} {task_row.id} done in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return True
+
+    def run_once(self):
+        """Run at most one task; returns True if one was run."""
+        close_old_connections()
+        task_row = self.claim()
+        if task_row is None:
+            return False
+        self.run_task(task_row)
+        return True
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception as e:
+                print(f"[tasks] worker {self.name} error: {e}")
+                worked = False
+            if not worked:
+                self._stop.wait(self.poll_interval)
+        close_old_connections()
@@ -23,6 +23,10 @@ from .views import (
     GetNotificationsView,
     MarkNotificationReadView,
     DeleteNotificationView,
+    BulkMarkNotificationsReadView,
+    BulkDeleteNotificationsView,
+    NotificationUnreadCountView,
+    NotificationStreamView,
     FollowCompanyToggleView,
     FollowCompanyStatusView,
     GetFollowedCompaniesView,
@@ -38,7 +42,11 @@ from .job_postings import (
     add_impression,
     export_metrics_csv,
     export_metrics_pdf,
-    get_liked_job_postings
+    get_liked_job_postings,
+    get_feed_cache_stats,
+    get_embedding_stats,
+    get_notification_stream_stats,
+    get_job_applicants,
 )
 from .verification_code import (
     send_verification_email,
@@ -57,6 +65,10 @@ urlpatterns = [
     path('auth/sign-in/', AuthLoginExisitingUserView.as_view(), name='auth-login-user'),
     path('create-job-posting/', create_job_posting, name='create-job-posting'),
     path('get-job-postings/', get_job_postings, name='get-job-postings'),
+    path('feed-cache-stats/', get_feed_cache_stats, name='feed-cache-stats'),
+    path('embedding-stats/', get_embedding_stats, name='embedding-stats'),
+    path('notification-stream-stats/', get_notification_stream_stats, name='notification-stream-stats'),
+    path('jobs/<uuid:job_id>/applicants/', get_job_applicants, name='job-applicants'),
     path('apply-to-job/', apply_to_job, name='apply-to-job'),
     path('reject-job/', reject_job, name='reject-job'),
     path('send-verification-email/', send_verification_email, name='send-verification-email'),
@@ -82,8 +94,12 @@ urlpatterns = [
     path('bookmark-job-posting/', BookmarkJobPostingView.as_view(), name='bookmark-job-posting'),
     path('notifications/create/', CreateNotificationView.as_view(), name='create-notification'),
     path('notifications/', GetNotificationsView.as_view(), name='get-notifications'),
+    path('notifications/unread-count/', NotificationUnreadCountView.as_view(), name='notification-unread-count'),
+    path('notifications/stream/', NotificationStreamView.as_view(), name='notification-stream'),
     path('notifications/mark-read/', MarkNotificationReadView.as_view(), name='mark-notification-read'),
+    path('notifications/mark-read/bulk/', BulkMarkNotificationsReadView.as_view(), name='bulk-mark-notifications-read'),
     path('notifications/delete/', DeleteNotificationView.as_view(), name='delete-notification'),
+    path('notifications/delete/bulk/', BulkDeleteNotificationsView.as_view(), name='bulk-delete-notifications'),
     path("resume/", ResumeSubmitView.as_view(), name="resume-submit"),
     path('add-impression/', add_impression, name='add-impression'),
     path("report/", ReportUserView.as_view(), name="report-submit"),
@@ -0,0 +1,355 @@
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+
+def top_k_indices(scores, k):
+    """
+    Return the indices of the k highest scores, highest first.
+
+    Uses argpartition so only the k winners are fully sorted. Equal scores
+    keep index order, also across the k-th place, so the result is the
+    first k of a stable full sort.
+    """
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    above = np.flatnonzero(scores > kth)
+    top = np.concatenate([above, np.flatnonzero(scores == kth)[:k - len(above)]])
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def scan_chunks(query, chunks, threshold=None, k=None):
+    """
+    Return up to k (id, score) pairs scoring at least threshold, best first.
+
+    chunks is an iterable of (id array, unit-length row matrix) pairs. Each
+    chunk is scored with one matrix-vector product and only the running
+    top k survive between chunks, so memory stays bounded by the chunk
+    size (plus k) however many rows are scanned.
+    """
+    q = VectorIndex._normalize(query)
+    best_ids = np.empty(0, dtype=object)
+    best_scores = np.empty(0, dtype=np.float32)
+    for ids, matrix in chunks:
+        if not len(ids) or matrix.shape[1] != q.shape[0]:
+            continue
+        scores = matrix @ q
+        if threshold is not None:
+            keep = scores >= threshold
+            ids, scores = ids[keep], scores[keep]
+        best_ids = np.concatenate([best_ids, ids])
+        best_scores = np.concatenate([best_scores, scores])
+        if k is not None and len(best_scores) > k:
+            top = top_k_indices(best_scores, k)
+            best_ids, best_scores = best_ids[top], best_scores[top]
+    order = top_k_indices(best_scores, k)
+    return [(best_ids[i], float(best_scores[i])) for i in order]
+
+
+def stream_vectors(rows, chunk_size=10000):
+    """(id array, unit-length row matrix) chunks of an iterable of (id, vector) pairs."""
+    keys = []
+    vectors = []
+    for key, vector in rows:
+        if vector is None or len(vector) == 0:
+            continue
+        keys.append(str(key))
+        vectors.append(np.asarray(vector, dtype=np.float32))
+        if len(keys) >= chunk_size:
+            yield _chunk(keys, vectors)
+            keys, vectors = [], []
+    if keys:
+        yield _chunk(keys, vectors)
+
+
+def _chunk(keys, vectors):
+    ids = np.empty(len(keys), dtype=object)
+    ids[:] = keys
+    matrix = np.vstack(vectors)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return ids, np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class VectorIndex:
+    """
+    Process-level matrix of unit-length embeddings keyed by id.
+
+    Rows live in one contiguous float32 matrix (with spare capacity so
+    upserts don't reallocate every time) next to an id array, so a query
+    is a single matrix-vector product instead of a Python loop of
+    cosine_similarity calls.
+
+    generation moves only when the contents do (a new, changed or removed
+    vector), not on every write or reload, so callers can key caches on it.
+    """
+
+    def __init__(self, loader=None, ttl=None):
+        self._loader = loader
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        # held for a whole reload, so only one thread runs the loader
+        self._reload_lock = threading.Lock()
+        # upserts/removes that arrive while the loader runs, replayed onto its result
+        self._pending = None
+        self._matrix = None
+        self._ids = np.empty(0, dtype=object)
+        self._rows = {}
+        self._size = 0
+        self._loaded_at = None
+        self.generation = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return str(key) in self._rows
+
+    @staticmethod
+    def _normalize(vector):
+        v = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(v)
+        if norm > 0:
+            v = v / norm
+        return v
+
+    def _grow(self, dim, needed):
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        matrix = np.zeros((new_capacity, dim), dtype=np.float32)
+        ids = np.empty(new_capacity, dtype=object)
+        if self._size:
+            matrix[:self._size] = self._matrix[:self._size]
+            ids[:self._size] = self._ids[:self._size]
+        self._matrix = matrix
+        self._ids = ids
+
+    def load(self, rows):
+        """Replace the index contents with an iterable of (id, vector) pairs."""
+        keys = []
+        vectors = []
+        for key, vector in rows:
+            if vector is None or len(vector) == 0:
+                continue
+            keys.append(str(key))
+            vectors.append(self._normalize(vector))
+
+        matrix = np.vstack(vectors) if vectors else None
+
+        with self._lock:
+            changed = not self._holds(keys, matrix)
+            self._matrix = None
+            self._ids = np.empty(0, dtype=object)
+            self._rows = {}
+            self._size = 0
+            if vectors:
+                self._grow(matrix.shape[1], len(vectors))
+                self._matrix[:len(vectors)] = matrix
+                self._ids[:len(keys)] = keys
+                self._rows = {key: row for row, key in enumerate(keys)}
+                self._size = len(keys)
+            pending, self._pending = self._pending, None
+            for key, vector in (pending or {}).items():
+                if vector is None:
+                    changed = self._remove(key) or changed
+                else:
+                    changed = self._upsert(key, vector) or changed
+            self._loaded_at = time.monotonic()
+            if changed:
+                self.generation += 1
+
+    def _holds(self, keys, matrix):
+        """True if the index contains exactly these rows (in any order)."""
+        if len(keys) != self._size or set(keys) != self._rows.keys():
+            return False
+        if not keys:
+            return True
+        if self._matrix.shape[1] != matrix.shape[1]:
+            return False
+        positions = np.fromiter((self._rows[key] for key in keys), dtype=np.int64, count=len(keys))
+        return np.array_equal(self._matrix[positions], matrix)
+
+    def _stale(self):
+        return self._loaded_at is None or (self._ttl is not None and time.monotonic() - self._loaded_at > self._ttl)
+
+    def ensure_loaded(self):
+        if self._loader is None or not self._stale():
+            return
+        # with something loaded, serve it while another thread reloads
+        if not self._reload_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if not self._stale():
+                return
+            with self._lock:
+                self._pending = {}
+            # the scan and unpack run outside self._lock: scoring and upserts go on meanwhile
+            self.load(self._loader())
+        finally:
+            with self._lock:
+                self._pending = None
+            self._reload_lock.release()
+
+    def invalidate(self):
+        """Force a reload from the loader on next access."""
+        with self._lock:
+            self._loaded_at = None
+
+    def upsert(self, key, vector):
+        key = str(key)
+        if vector is None or len(vector) == 0:
+            self.remove(key)
+            return
+        v = self._normalize(vector)
+        with self._lock:
+            if self._pending is not None:
+                self._pending[key] = v
+            if self._upsert(key, v):
+                self.generation += 1
+
+    def _upsert(self, key, v):
+        if self._matrix is not None and self._matrix.shape[1] != v.shape[0]:
+            print(f"[warn] Vector index dimension mismatch for {key}: {v.shape[0]} != {self._matrix.shape[1]}")
+            return False
+        row = self._rows.get(key)
+        if row is None:
+            self._grow(v.shape[0], self._size + 1)
+            row = self._size
+            self._ids[row] = key
+            self._rows[key] = row
+            self._size += 1
+        elif np.array_equal(self._matrix[row], v):
+            # e.g. a post_save for a counter: same vector, nothing to invalidate
+            return False
+        self._matrix[row] = v
+        return True
+
+    def remove(self, key):
+        key = str(key)
+        with self._lock:
+            if self._pending is not None:
+                self._pending[key] = None
+            if self._remove(key):
+                self.generation += 1
+
+    def _remove(self, key):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        last = self._size - 1
+        if row != last:
+            # swap the last row into the hole to keep the matrix dense
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids[last] = None
+        self._size = last
+        return True
+
+    def scores(self, query, keys):
+        """
+        Score the given ids against a query vector.
+
+        Returns a float32 array aligned with keys; ids that are not in the
+        index get NaN so callers can fall back for them.
+        """
+        self.ensure_loaded()
+        q = self._normalize(query)
+        keys = [str(k) for k in keys]
+        out = np.full(len(keys), np.nan, dtype=np.float32)
+        with self._lock:
+            if not self._size or self._matrix.shape[1] != q.shape[0]:
+                return out
+            positions = np.fromiter((self._rows.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+            hits = positions >= 0
+            if hits.any():
+                out[hits] = self._matrix[positions[hits]] @ q
+        return out
+
+    def top_k(self, query, k=None, keys=None):
+        """
+        Return up to k (id, score) pairs most similar to the query, best first.
+
+        If keys is given the search is restricted to those ids.
+        """
+        self.ensure_loaded()
+        q = self._normalize(query)
+        with self._lock:
+            if not self._size or self._matrix.shape[1] != q.shape[0]:
+                return []
+            if keys is None:
+                ids = self._ids[:self._size]
+                scores = self._matrix[:self._size] @ q
+            else:
+                positions = np.fromiter(
+                    (self._rows[str(k)] for k in keys if str(k) in self._rows),
+                    dtype=np.int64,
+                )
+                ids = self._ids[positions]
+                scores = self._matrix[positions] @ q
+        order = top_k_indices(scores, k)
+        return [(ids[i], float(scores[i])) for i in order]
+
+    def above(self, query, threshold, k=None, chunk_size=50000):
+        """
+        Return up to k (id, score) pairs scoring at least threshold, best first.
+
+        The matrix is scanned chunk_size rows at a time (see scan_chunks),
+        so scoring never allocates more than one chunk's worth of scores.
+        """
+        self.ensure_loaded()
+        with self._lock:
+            chunks = (
+                (self._ids[start:min(start + chunk_size, self._size)],
+                 self._matrix[start:min(start + chunk_size, self._size)])
+                for start in range(0, self._size, chunk_size)
+            )
+            return scan_chunks(query, chunks, threshold, k)
+
+
+def _load_active_job_vectors():
+    from .embeddings import current_version
+    from .models import JobPosting
+
+    return (
+        JobPosting.objects
+        .filter(is_active=True, vector_embedding__isnull=False, embedding_model_version=current_version().name)
+        .values_list("id", "vector_embedding")
+        .iterator(chunk_size=2000)
+    )
+
+
+def _load_notifiable_applicant_vectors():
+    from .embeddings import current_version
+    from .models import ApplicantProfile
+
+    return (
+        ApplicantProfile.objects
+        .filter(
+            notifications_enabled=True,
+            user__role='applicant',
+            vector_embedding__isnull=False,
+            embedding_model_version=current_version().name,
+        )
+        .values_list("pk", "vector_embedding")
+        .iterator(chunk_size=2000)
+    )
+
+
+job_vector_index = VectorIndex(
+    loader=_load_active_job_vectors,
+    ttl=getattr(settings, "JOB_VECTOR_INDEX_TTL", 300),
+)
+# applicants that can be notified about a new job (find_similar_applicants)
+applicant_vector_index = VectorIndex(
+    loader=_load_notifiable_applicant_vectors,
+    ttl=getattr(settings, "APPLICANT_VECTOR_INDEX_TTL", 600),
+)
@@ -9,7 +9,23 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from .models import User, ApplicantProfile, EmployerProfile, Company, Notification, JobPosting
-from .serializers import UserSerializer, EmployerSignupSerializer, ApplicantSignupSerializer, MeSerializer, ApplicantProfileSerializer, EmployerProfileSerializer, NotificationSerializer, CreateNotificationSerializer
+from .serializers import UserSerializer, EmployerSignupSerializer, ApplicantSignupSerializer, MeSerializer, ApplicantProfileSerializer, EmployerProfileSerializer, NotificationSerializer, CreateNotificationSerializer, BulkNotificationSerializer
+from .notifications import (
+  BULK_NOTIFICATION_MAX_IDS,
+  NOTIFICATIONS_MAX_PAGE_SIZE,
+  NOTIFICATIONS_PAGE_SIZE,
+  adjust_unread,
+  decode_notifications_cursor,
+  delete_notifications,
+  encode_notifications_cursor,
+  mark_read,
+  page_notifications,
+  unread_count,
+)
+from .notification_stream import EventStreamRenderer, event_stream, get_broker, publish_on_commit
+from rest_framework.renderers import JSONRenderer
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -1338,8 +1354,12 @@ class NotificationPreferenceView(APIView):
       type=openapi.TYPE_OBJECT,
       properties={
         'notifications_enabled': openapi.Schema(type=openapi.TYPE_BOOLEAN, description='Enable or disable notifications'),
+        'notification_delivery': openapi.Schema(
+          type=openapi.TYPE_STRING,
+          enum=['instant', 'digest'],
+          description='Applicants: job notifications one by one, or one digest per window',
+        ),
       },
-      required=['notifications_enabled'],
     ),
     responses={200: "Notification preference updated", 400: "Bad request"},
   )
@@ -1349,10 +1369,18 @@ class NotificationPreferenceView(APIView):
       return err
 
     notifications_enabled = request.data.get('notifications_enabled')
+    notification_delivery = request.data.get('notification_delivery')
 
-    if notifications_enabled is None:
+    if notifications_enabled is None and notification_delivery is None:
+      return Response(
+        {'status': 'failed', 'message': 'notifications_enabled or notification_delivery is required'},
+        status=status.HTTP_400_BAD_REQUEST,
+      )
+    if notification_delivery is not None and (
+      dj_user.role == 'employer' or notification_delivery not in ('instant', 'digest')
+    ):
       return Response(
-        {'status': 'failed', 'message': 'notifications_enabled field is required'},
+        {'status': 'failed', 'message': "notification_delivery must be 'instant' or 'digest' (applicants only)"},
         status=status.HTTP_400_BAD_REQUEST,
       )
 
@@ -1362,17 +1390,20 @@ class NotificationPreferenceView(APIView):
       else:
         profile = dj_user.applicant_profile
 
-      profile.notifications_enabled = notifications_enabled
+      if notifications_enabled is not None:
+        profile.notifications_enabled = notifications_enabled
+      if notification_delivery is not None:
+        profile.notification_delivery = notification_delivery
       profile.save()
 
-      return Response(
-        {
-          'status': 'success',
-          'message': 'Notification preference updated successfully.',
-          'notifications_enabled': profile.notifications_enabled,
-        },
-        status=status.HTTP_200_OK,
-      )
+      data = {
+        'status': 'success',
+        'message': 'Notification preference updated successfully.',
+        'notifications_enabled': profile.notifications_enabled,
+      }
+      if dj_user.role != 'employer':
+        data['notification_delivery'] = profile.notification_delivery
+      return Response(data, status=status.HTTP_200_OK)
     except Exception as e:
       return Response(
         {'status': 'failed', 'message': str(e)},
@@ -1551,7 +1582,7 @@ class CreateNotificationView(APIView):
       },
       required=['user_id', 'title', 'message'],
     ),
-    responses={201: NotificationSerializer(many=False), 400: "Bad request", 404: "User not found"},
+    responses={201: NotificationSerializer(many=False), 200: "Unread notification for the job already exists", 400: "Bad request", 404: "User not found"},
   )
   def post(self, request: Request):
     # Verify the authenticated user (the one creating the notification)
@@ -1613,7 +1644,10 @@ class CreateNotificationView(APIView):
           status=status.HTTP_404_NOT_FOUND,
         )
 
-    notification = Notification.objects.create(**notification_data)
+    with transaction.atomic():
+      notification = Notification.objects.create(**notification_data)
+      adjust_unread([target_user.id], 1)
+      publish_on_commit([(notification.id, target_user.id)])
     response_serializer = NotificationSerializer(notification)
 
     return Response(
@@ -1677,7 +1711,7 @@ class GetNotificationsView(APIView):
   permission_classes = [IsAuthenticated]
 
   @swagger_auto_schema(
-    operation_summary='Get all notifications for the authenticated user',
+    operation_summary='Get the authenticated user\'s notifications, newest first, a page at a time',
     tags=['Notifications'],
     manual_parameters=[
       openapi.Parameter(
@@ -1694,8 +1728,22 @@ class GetNotificationsView(APIView):
         type=openapi.TYPE_BOOLEAN,
         required=False,
       ),
+      openapi.Parameter(
+        "before",
+        openapi.IN_QUERY,
+        description="next_cursor from the previous page",
+        type=openapi.TYPE_STRING,
+        required=False,
+      ),
+      openapi.Parameter(
+        "limit",
+        openapi.IN_QUERY,
+        description=f"Page size (default {NOTIFICATIONS_PAGE_SIZE}, at most {NOTIFICATIONS_MAX_PAGE_SIZE})",
+        type=openapi.TYPE_INTEGER,
+        required=False,
+      ),
     ],
-    responses={200: NotificationSerializer(many=True), 401: "Unauthorized"},
+    responses={200: NotificationSerializer(many=True), 400: "Bad request", 401: "Unauthorized"},
   )
   def get(self, request: Request):
     dj_user, ctx, err = _verify_and_get_user(request)
@@ -1704,23 +1752,121 @@ class GetNotificationsView(APIView):
 
     # Get optional read filter from query params
     read_filter = request.query_params.get('read')
-    notifications = Notification.objects.filter(user=dj_user)
+    read_bool = None if read_filter is None else read_filter.lower() == 'true'
 
-    if read_filter is not None:
-      read_bool = read_filter.lower() == 'true'
-      notifications = notifications.filter(read=read_bool)
+    try:
+      limit = int(request.query_params.get('limit', NOTIFICATIONS_PAGE_SIZE))
+    except ValueError:
+      return Response(
+        {'status': 'failed', 'message': 'limit must be an integer'},
+        status=status.HTTP_400_BAD_REQUEST,
+      )
+    limit = max(1, min(limit, NOTIFICATIONS_MAX_PAGE_SIZE))
+
+    before = None
+    cursor = request.query_params.get('before')
+    if cursor:
+      before = decode_notifications_cursor(cursor, dj_user.id)
+      if before is None:
+        return Response(
+          {'status': 'failed', 'message': 'Invalid cursor'},
+          status=status.HTTP_400_BAD_REQUEST,
+        )
 
+    notifications, last = page_notifications(dj_user.id, before=before, limit=limit, read=read_bool)
     serializer = NotificationSerializer(notifications, many=True)
     return Response(
       {
         'status': 'success',
         'count': len(serializer.data),
         'notifications': serializer.data,
+        'pagination': {
+          'has_next': last is not None,
+          'next_cursor': encode_notifications_cursor(dj_user.id, last) if last is not None else None,
+        },
       },
       status=status.HTTP_200_OK,
     )
 
 
+class NotificationUnreadCountView(APIView):
+  authentication_classes = [FirebaseAuthentication]
+  permission_classes = [IsAuthenticated]
+
+  @swagger_auto_schema(
+    operation_summary='Get the number of unread notifications for the authenticated user',
+    tags=['Notifications'],
+    manual_parameters=[
+      openapi.Parameter(
+        "Authorization",
+        openapi.IN_HEADER,
+        description="Bearer <Firebase ID Token>",
+        type=openapi.TYPE_STRING,
+        required=True,
+      ),
+    ],
+    responses={200: "Unread notification count", 401: "Unauthorized"},
+  )
+  def get(self, request: Request):
+    dj_user, ctx, err = _verify_and_get_user(request)
+    if err:
+      return err
+
+    return Response(
+      {'status': 'success', 'unread_count': unread_count(dj_user.id)},
+      status=status.HTTP_200_OK,
+    )
+
+
+class NotificationStreamView(APIView):
+  authentication_classes = [FirebaseAuthentication]
+  permission_classes = [IsAuthenticated]
+  renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+  @swagger_auto_schema(
+    operation_summary='Stream new notifications for the authenticated user (server-sent events)',
+    tags=['Notifications'],
+    manual_parameters=[
+      openapi.Parameter(
+        "Authorization",
+        openapi.IN_HEADER,
+        description="Bearer <Firebase ID Token>",
+        type=openapi.TYPE_STRING,
+        required=True,
+      ),
+    ],
+    responses={
+      200: "text/event-stream of `notification` events",
+      401: "Unauthorized",
+      501: "Not served over ASGI",
+      503: "Too many open streams on this worker",
+    },
+  )
+  def get(self, request: Request):
+    dj_user, ctx, err = _verify_and_get_user(request)
+    if err:
+      return err
+
+    # under WSGI the response would be buffered to completion, i.e. forever
+    if not isinstance(request._request, ASGIRequest):
+      return Response(
+        {'status': 'failed', 'message': 'Notification streaming requires the ASGI server'},
+        status=status.HTTP_501_NOT_IMPLEMENTED,
+      )
+
+    broker = get_broker()
+    if broker.connections() >= getattr(settings, "NOTIFICATION_STREAM_MAX_CONNECTIONS", 5000):
+      return Response(
+        {'status': 'failed', 'message': 'Too many open notification streams, poll notifications/ instead'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+      )
+
+    response = StreamingHttpResponse(event_stream(broker, dj_user.id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 class MarkNotificationReadView(APIView):
   authentication_classes = [FirebaseAuthentication]
   permission_classes = [IsAuthenticated]
@@ -1751,8 +1897,8 @@ class MarkNotificationReadView(APIView):
 
     try:
       notification = Notification.objects.get(id=notification_id, user=dj_user)
-      notification.read = True
-      notification.save()
+      mark_read(dj_user.id, [notification.pk])
+      notification.refresh_from_db()
 
       serializer = NotificationSerializer(notification)
       return Response(
@@ -1770,6 +1916,53 @@ class MarkNotificationReadView(APIView):
       )
 
 
+class BulkMarkNotificationsReadView(APIView):
+  authentication_classes = [FirebaseAuthentication]
+  permission_classes = [IsAuthenticated]
+
+  @swagger_auto_schema(
+    operation_summary='Mark several notifications as read',
+    tags=['Notifications'],
+    request_body=openapi.Schema(
+      type=openapi.TYPE_OBJECT,
+      properties={
+        'notification_ids': openapi.Schema(
+          type=openapi.TYPE_ARRAY,
+          items=openapi.Schema(type=openapi.TYPE_STRING),
+          description=f'IDs of the notifications (at most {BULK_NOTIFICATION_MAX_IDS})',
+        ),
+        'all_before': openapi.Schema(
+          type=openapi.TYPE_STRING,
+          format=openapi.FORMAT_DATETIME,
+          description='Instead of ids: every notification created at or before this time, e.g. the newest one loaded',
+        ),
+      },
+    ),
+    responses={200: "Number of notifications marked as read", 400: "Bad request"},
+  )
+  def post(self, request: Request):
+    dj_user, ctx, err = _verify_and_get_user(request)
+    if err:
+      return err
+
+    serializer = BulkNotificationSerializer(data=request.data)
+    if not serializer.is_valid():
+      return Response(
+        {'status': 'failed', 'message': 'Invalid data', 'errors': serializer.errors},
+        status=status.HTTP_400_BAD_REQUEST,
+      )
+
+    updated = mark_read(
+      dj_user.id,
+      notification_ids=serializer.validated_data.get('notification_ids'),
+      before=serializer.validated_data.get('all_before'),
+    )
+    return Response(
+      {'status': 'success', 'updated': updated},
+      status=status.HTTP_200_OK,
+    )
+
+
 class DeleteNotificationView(APIView):
   authentication_classes = [FirebaseAuthentication]
   permission_classes = [IsAuthenticated]
@@ -1793,17 +1986,6 @@ class DeleteNotificationView(APIView):
         required=True,
       ),
     ],
-    responses={
-      200: 'Job posting details',
-      404: 'Job posting not found',
-    },
-  )
-  def get(self, request: Request):
-    token = request.query_params.get('token')
-
-    if not token:
-      return Response(
-        {'status': 'error', 'message': 'token parameter is required'},
     responses={200: "Notification deleted", 400: "Bad request", 404: "Notification not found"},
   )
   def delete(self, request: Request):
@@ -1820,95 +2002,66 @@ class DeleteNotificationView(APIView):
       )
 
     try:
-      from accounts.models import JobPosting
-      job = JobPosting.objects.get(share_token=token)
+      notification = Notification.objects.get(id=notification_id, user=dj_user)
+    except Notification.DoesNotExist:
+      return Response(
+        {'status': 'failed', 'message': 'Notification not found'},
+        status=status.HTTP_404_NOT_FOUND,
+      )
 
-      # Build response with job details
-      from accounts.serializers import JobPostingSerializer
+    delete_notifications(dj_user.id, [notification.pk])
+
+    return Response(
+      {'status': 'success', 'message': 'Notification deleted'},
+      status=status.HTTP_200_OK,
+    )
 
-      # Add user-specific data if authenticated
-      is_liked = False
-      is_bookmarked = False
 
-      if request.user and request.user.is_authenticated:
-        try:
-          dj_user, ctx, err = _verify_and_get_user(request)
-          if not err:
-            is_liked = job.likes.filter(user=dj_user).exists()
-            if dj_user.role == 'applicant':
-              is_bookmarked = dj_user.applicant_profile.bookmarked_jobs.filter(id=job.id).exists()
-        except:
-          pass
-
-      job_data = {
-        'id': str(job.id),
-        'job_title': job.job_title,
-        'company': job.company,
-        'location': job.location,
-        'job_type': job.job_type,
-        'salary': job.salary,
-        'company_size': job.company.size,
-        'tags': job.tags,
-        'job_description': job.job_description,
-        'date_posted': job.date_posted.isoformat(),
-        'date_updated': job.date_updated.isoformat(),
-        'is_active': job.is_active,
-        'likes_count': job.likes_count,
-        'is_liked': is_liked,
-        'is_bookmarked': is_bookmarked,
-      }
+class BulkDeleteNotificationsView(APIView):
+  authentication_classes = [FirebaseAuthentication]
+  permission_classes = [IsAuthenticated]
 
-      # Add media items
-      media_items = []
-      for item in job.media_items.all():
-        media_items.append({
-          'file_name': item.file_name,
-          'file_type': item.file_type,
-          'file_size': item.file_size,
-          'download_link': item.download_link,
-        })
-      job_data['media_items'] = media_items
-
-      # Add company logo
-      if job.company_logo:
-        job_data['company_logo'] = {
-          'file_name': job.company_logo.file_name,
-          'file_type': job.company_logo.file_type,
-          'file_size': job.company_logo.file_size,
-          'download_link': job.company_logo.download_link,
-        }
-      else:
-        job_data['company_logo'] = None
-
-      # Add employer info
-      if job.posted_by:
-        job_data['posted_by'] = {
-          'user_id': str(job.posted_by.user.id),
-          'user_email': job.posted_by.user.email,
-          'user_company': job.posted_by.company.name if job.posted_by.company else '',
-          'user_linkedin_url': job.posted_by.linkedin_url or '',
-        }
-      notification = Notification.objects.get(id=notification_id, user=dj_user)
-      notification.delete()
+  @swagger_auto_schema(
+    operation_summary='Delete several notifications',
+    tags=['Notifications'],
+    request_body=openapi.Schema(
+      type=openapi.TYPE_OBJECT,
+      properties={
+        'notification_ids': openapi.Schema(
+          type=openapi.TYPE_ARRAY,
+          items=openapi.Schema(type=openapi.TYPE_STRING),
+          description=f'IDs of the notifications (at most {BULK_NOTIFICATION_MAX_IDS})',
+        ),
+        'all_before': openapi.Schema(
+          type=openapi.TYPE_STRING,
+          format=openapi.FORMAT_DATETIME,
+          description='Instead of ids: every notification created at or before this time, e.g. the newest one loaded',
+        ),
+      },
+    ),
+    responses={200: "Number of notifications deleted", 400: "Bad request"},
+  )
+  def post(self, request: Request):
+    dj_user, ctx, err = _verify_and_get_user(request)
+    if err:
+      return err
 
+    serializer = BulkNotificationSerializer(data=request.data)
+    if not serializer.is_valid():
       return Response(
-        {
-          'status': 'success',
-          'job_posting': job_data,
-        },
-        status=status.HTTP_200_OK,
+        {'status': 'failed', 'message': 'Invalid data', 'errors': serializer.errors},
+        status=status.HTTP_400_BAD_REQUEST,
       )
 
-    except JobPosting.DoesNotExist:
-      return Response(
-        {'status': 'error', 'message': 'Job posting not found'},
-        status=status.HTTP_404_NOT_FOUND,
-      )
-    except Exception as e:
-      return Response(
-        {'status': 'error', 'message': str(e)},
-        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-      )
+    deleted = delete_notifications(
+      dj_user.id,
+      notification_ids=serializer.validated_data.get('notification_ids'),
+      before=serializer.validated_data.get('all_before'),
+    )
+    return Response(
+      {'status': 'success', 'deleted': deleted},
+      status=status.HTTP_200_OK,
+    )
 
 
 from django.views import View
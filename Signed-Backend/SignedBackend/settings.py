@@ -177,4 +177,117 @@ EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = env_config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = env_config("EMAIL_HOST_PASSWORD")
-DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
\ No newline at end of file
+DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Job feed ranking
+# seconds before the in-process job vector index is rebuilt from the database,
+# so writes made by other worker processes are eventually picked up
+JOB_VECTOR_INDEX_TTL = 300
+
+# per-user ranked feed cache (bounded LRU with a TTL, per worker process)
+FEED_CACHE_MAX_ENTRIES = 2000
+FEED_CACHE_TTL = 600
+
+# New-job notifications
+# find_similar_applicants keeps notifiable applicant vectors in memory (~1.5 KB each) and
+# scans them APPLICANT_INDEX_CHUNK_SIZE rows at a time; set APPLICANT_INDEX_IN_MEMORY = False
+# at millions of applicants to stream them from the database in chunks instead
+APPLICANT_INDEX_IN_MEMORY = True
+APPLICANT_INDEX_CHUNK_SIZE = 50000
+APPLICANT_VECTOR_INDEX_TTL = 600
+# notifications inserted per bulk_create by a fan-out
+NOTIFICATION_BULK_BATCH_SIZE = 500
+# follower fan-outs commit (and record progress) every this many followers
+NOTIFICATION_FANOUT_CHUNK_SIZE = 1000
+# applicants with notification_delivery = "digest" get one notification per window listing the jobs
+NOTIFICATION_DIGEST_WINDOW_MINUTES = 60
+# retention (accounts/retention.py): delete read notifications after this many days and keep
+# each user's newest NOTIFICATION_RETENTION_MAX_PER_USER (None disables a policy); applied
+# every NOTIFICATION_RETENTION_INTERVAL seconds by the workers or by `manage.py prune_notifications`
+NOTIFICATION_RETENTION_READ_DAYS = 30
+NOTIFICATION_RETENTION_MAX_PER_USER = 500
+NOTIFICATION_RETENTION_BATCH_SIZE = 500
+NOTIFICATION_RETENTION_PAUSE = 0.05
+NOTIFICATION_RETENTION_INTERVAL = 6 * 3600
+# default page size of GET notifications/ (?before=<cursor>&limit=, at most 200)
+NOTIFICATIONS_PAGE_SIZE = 50
+# push of new notifications over GET notifications/stream/ (accounts/notification_stream.py, ASGI only,
+# e.g. `uvicorn asgi:application`). TablePollingBroker picks up the notifications run_workers
+# creates; InProcessBroker only reaches ones created in the serving process (TASKS_EAGER)
+NOTIFICATION_BROKER = "accounts.notification_stream.TablePollingBroker"
+NOTIFICATION_STREAM_KEEPALIVE = 15
+# open streams per worker process before new ones get a 503
+NOTIFICATION_STREAM_MAX_CONNECTIONS = 5000
+# events buffered per stream; a client further behind misses events and refetches the list
+NOTIFICATION_STREAM_QUEUE_SIZE = 100
+# TablePollingBroker: seconds between reads, and how far each read looks back for late commits
+NOTIFICATION_STREAM_POLL_INTERVAL = 2
+NOTIFICATION_STREAM_POLL_OVERLAP = 60
+
+# Feed assembly stages, run in order by accounts.feed.pipeline
+FEED_PIPELINE_STAGES = [
+    "accounts.feed.stages.ResumeStage",
+    "accounts.feed.stages.CandidateStage",
+    "accounts.feed.stages.SimilarityStage",
+    "accounts.feed.stages.ScoringStage",
+    "accounts.feed.stages.FilterStage",
+    "accounts.feed.stages.PaginationStage",
+    "accounts.feed.stages.UserFlagsStage",
+    "accounts.feed.stages.DefaultsStage",
+    "accounts.feed.stages.ApplicantInfoStage",
+]
+
+# applicants inlined per job with get_applicant_info; the rest are paged by jobs/<id>/applicants/
+FEED_APPLICANT_PREVIEW_SIZE = 5
+JOB_APPLICANTS_PAGE_SIZE = 25
+
+# feed score = weighted blend of these signals (see accounts/feed/scoring.py);
+# likes/impressions/rejects are log-scaled to [0, 1] across the candidates
+FEED_SCORING_WEIGHTS = {
+    "similarity": 1.0,
+    "recency": 0.15,
+    "likes": 0.1,
+    "impressions": 0.0,
+    "rejects": -0.1,
+}
+# days for the recency signal to halve
+FEED_RECENCY_HALF_LIFE_DAYS = 14
+
+# where the feed reads job postings from: "database" (JobPosting) or "firestore"
+# (the mirror the mobile client reads); compare via the Server-Timing header
+FEED_DATA_SOURCE = "database"
+
+# Embeddings
+# entry of accounts/embeddings/versions.py new vectors are produced with; changing it
+# re-embeds existing rows lazily (feed reads + the embeddings.sweep task)
+EMBEDDING_MODEL_VERSION = "minilm-l6-v1"
+# stale rows seen by the feed are queued for re-embedding at most once per window (seconds)
+EMBEDDING_LAZY_REEMBED_WINDOW = 600
+# the embeddings.sweep task re-embeds this many stale rows of each model, then waits
+EMBEDDING_SWEEP_BATCH_SIZE = 64
+EMBEDDING_SWEEP_INTERVAL = 30
+# load the model (and run one forward pass) at startup instead of on first use
+EMBEDDING_WARMUP = env_config("EMBEDDING_WARMUP", default=False, cast=bool)
+# single-text encodes arriving within the window are run as one batch
+EMBEDDING_BATCHING = True
+EMBEDDING_BATCH_MAX_SIZE = 32
+EMBEDDING_BATCH_WINDOW_MS = 5
+# persistent embedding cache (EmbeddingCacheEntry), keyed by SHA-256 of model + text, LRU-evicted
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_MAX_ENTRIES = 50000
+# seconds between last_used_at refreshes of a cached entry
+EMBEDDING_CACHE_TOUCH_INTERVAL = 3600
+
+# Background tasks (accounts/tasks, run by `python manage.py run_workers`)
+# run task handlers inline on commit instead of queueing them (tests / no worker running)
+TASKS_EAGER = env_config("TASKS_EAGER", default=False, cast=bool)
+TASK_MODULES = ["accounts.job_tasks", "accounts.embedding_tasks", "accounts.notification_tasks"]
+# inference backend: "torch" (sentence-transformers) or "onnx" (onnxruntime). Export the ONNX model and
+# compare the two with `python manage.py embedding_benchmark`; until it is exported, "onnx" serves with torch
+EMBEDDING_BACKEND = env_config("EMBEDDING_BACKEND", default="torch")
+# where the ONNX export is written (created on first use)
+EMBEDDING_ONNX_DIR = BASE_DIR / "onnx_models"
+# int8 dynamic quantization of the ONNX weights
+EMBEDDING_ONNX_QUANTIZE = True
+# onnxruntime intra-op threads (0 = onnxruntime's default)
+EMBEDDING_ONNX_THREADS = 0
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import accounts.embeddings.onnx_backend as onnx_backend
+from accounts.embeddings import EmbeddingProvider, make_provider
+from accounts.embeddings.onnx_backend import OnnxEmbeddingProvider
+from accounts.embeddings.benchmark import parity
+
+
+def test_parity_reports_cosine_per_text():
+    reference = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    candidate = np.array([[1.0, 0.0], [0.6, 0.8]], dtype=np.float32)
+
+    agreement = parity(reference, candidate)
+
+    assert agreement["min_cosine"] == pytest.approx(0.8)
+    assert agreement["mean_cosine"] == pytest.approx(0.9)
+
+
+def test_backends_get_separate_cache_namespaces():
+    torch_provider = make_provider("torch", model_name="m")
+    onnx_provider = make_provider("onnx", model_name="m", fallback=False)
+
+    assert torch_provider.cache_namespace == "m"
+    assert onnx_provider.cache_namespace != torch_provider.cache_namespace
+    assert not onnx_provider.loaded
+
+    with pytest.raises(ValueError):
+        make_provider("tensorrt")
+
+
+def test_onnx_falls_back_to_torch_until_it_can_serve(monkeypatch, settings, tmp_path, capsys):
+    settings.EMBEDDING_ONNX_DIR = tmp_path
+    settings.EMBEDDING_ONNX_QUANTIZE = True
+
+    monkeypatch.setattr(onnx_backend, "onnx_available", lambda: False)
+    assert type(make_provider("onnx", model_name="org/m")) is EmbeddingProvider
+    assert "needs onnxruntime" in capsys.readouterr().out
+
+    monkeypatch.setattr(onnx_backend, "onnx_available", lambda: True)
+    assert make_provider("onnx", model_name="org/m").cache_namespace == "org/m"
+    assert "no ONNX export" in capsys.readouterr().out
+
+    export_dir = tmp_path / "org__m"
+    export_dir.mkdir()
+    (export_dir / onnx_backend.INT8_FILE).write_bytes(b"")
+    (export_dir / onnx_backend.CONFIG_FILE).write_text("{}")
+    assert isinstance(make_provider("onnx", model_name="org/m"), OnnxEmbeddingProvider)
@@ -0,0 +1,44 @@
+import threading
+
+import numpy as np
+import pytest
+
+from accounts.embeddings import MicroBatcher
+
+
+def test_concurrent_requests_share_a_batch():
+    calls = []
+
+    def encode_batch(texts):
+        calls.append(list(texts))
+        return np.array([[float(len(t))] for t in texts], dtype=np.float32)
+
+    batcher = MicroBatcher(encode_batch, max_batch_size=8, max_wait_ms=200)
+    results = {}
+    start = threading.Barrier(8)
+
+    def worker(text):
+        start.wait()
+        results[text] = batcher.encode(text, timeout=5)
+
+    texts = ["a" * i for i in range(1, 9)]
+    threads = [threading.Thread(target=worker, args=(t,)) for t in texts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert {text: float(vec[0]) for text, vec in results.items()} == {t: float(len(t)) for t in texts}
+    assert len(calls) < len(texts)
+    stats = batcher.stats()
+    assert stats["items"] == 8
+    assert stats["mean_batch_size"] > 1
+
+
+def test_batch_errors_reach_every_caller():
+    def encode_batch(texts):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(encode_batch, max_batch_size=4, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.encode("text", timeout=5)
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from django.utils import timezone
+
+import accounts.embeddings as embeddings
+from accounts.embeddings import EmbeddingCache, content_key
+from accounts.models import EmbeddingCacheEntry
+
+
+class CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+def test_key_depends_on_model_and_exact_text():
+    assert content_key("m", "text") == content_key("m", "text")
+    assert content_key("m", "text") != content_key("m", "text ")
+    assert content_key("m", "text") != content_key("other", "text")
+
+
+@pytest.mark.django_db
+def test_identical_text_is_encoded_once(monkeypatch):
+    model = CountingModel()
+    monkeypatch.setattr(embeddings.embedding_provider, "_model", model)
+
+    first = embeddings.encode_batch(["job a", "job b", "job a"])
+    second = embeddings.encode_batch(["job b", "job a"])
+
+    assert model.encoded == ["job a", "job b"]
+    assert np.allclose(first[0], second[1])
+    assert EmbeddingCacheEntry.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_eviction_drops_least_recently_used():
+    cache = EmbeddingCache(max_entries=2, evict_every=1000)
+    cache.put_many("m", {"old": np.ones(2, dtype=np.float32)})
+    cache.put_many("m", {"mid": np.ones(2, dtype=np.float32)})
+    cache.put_many("m", {"new": np.ones(2, dtype=np.float32)})
+    EmbeddingCacheEntry.objects.filter(key=content_key("m", "old")).update(
+        last_used_at=timezone.now() - timedelta(days=1)
+    )
+
+    assert cache.evict() == 1
+    assert set(EmbeddingCacheEntry.objects.values_list("key", flat=True)) == {
+        content_key("m", "mid"),
+        content_key("m", "new"),
+    }
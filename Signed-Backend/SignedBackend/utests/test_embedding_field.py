@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from accounts.fields import EmbeddingField, has_embedding
+from accounts.models import ApplicantProfile, User
+from accounts.serializers import ApplicantProfileSerializer
+
+
+def test_float32_round_trip_is_packed():
+    field = EmbeddingField()
+    vector = [0.25, -1.5, 3.0]
+
+    packed = field.get_prep_value(vector)
+    assert len(packed) == 3 * 4
+
+    loaded = field.from_db_value(packed, None, None)
+    assert loaded.dtype == np.float32
+    assert loaded.tolist() == vector
+
+
+def test_float16_halves_the_size_and_loads_as_float32():
+    field = EmbeddingField(dtype="float16")
+    packed = field.get_prep_value(np.array([0.5, 0.25], dtype=np.float32))
+
+    assert len(packed) == 2 * 2
+    assert field.from_db_value(packed, None, None).dtype == np.float32
+    assert field.deconstruct()[3]["dtype"] == "float16"
+
+
+def test_has_embedding():
+    assert not has_embedding(None)
+    assert not has_embedding([])
+    assert has_embedding(np.zeros(3, dtype=np.float32))
+
+
+@pytest.mark.django_db
+def test_api_shape_is_a_list_of_floats():
+    user = User.objects.create(email="vec@example.com", role="applicant")
+    ApplicantProfile.objects.create(user=user, major="CS", school="State", vector_embedding=[0.5, 0.25])
+
+    profile = ApplicantProfile.objects.get(user=user)
+    assert isinstance(profile.vector_embedding, np.ndarray)
+    assert ApplicantProfileSerializer(profile).data["vector_embedding"] == [0.5, 0.25]
@@ -0,0 +1,44 @@
+import threading
+
+import numpy as np
+
+from accounts.embeddings import EmbeddingProvider
+
+
+class FakeModel:
+    def encode(self, texts, convert_to_numpy=True):
+        return np.array([[3.0, 4.0] if text else [0.0, 0.0] for text in texts])
+
+
+class FakeProvider(EmbeddingProvider):
+    loads = 0
+
+    def _load(self):
+        FakeProvider.loads += 1
+        return FakeModel()
+
+
+def test_model_is_loaded_once_on_first_use():
+    FakeProvider.loads = 0
+    provider = FakeProvider("fake")
+    assert not provider.loaded
+
+    threads = [threading.Thread(target=provider.encode_one, args=("text",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert provider.loaded
+    assert FakeProvider.loads == 1
+
+
+def test_vectors_are_normalized_float32():
+    provider = FakeProvider("fake")
+
+    vector = provider.encode_one("text")
+    batch = provider.encode_batch(["a", ""])
+
+    assert vector.dtype == np.float32
+    assert np.allclose(vector, [0.6, 0.8])
+    assert np.allclose(batch, [[0.6, 0.8], [0.0, 0.0]])
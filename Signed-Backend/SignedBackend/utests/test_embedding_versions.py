@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import accounts.embedding_tasks as embedding_tasks
+from accounts.embeddings import EMBEDDING_VERSIONS, EmbeddingVersion, current_version
+from accounts.feed.stages import similarity_scores
+from accounts.models import ApplicantProfile, BackgroundTask, Company, JobPosting, User
+from accounts.vector_index import VectorIndex
+
+
+@pytest.fixture
+def new_version(settings, monkeypatch):
+    monkeypatch.setitem(EMBEDDING_VERSIONS, "test-v2", EmbeddingVersion("test-v2", "test-model", dim=3))
+    settings.EMBEDDING_MODEL_VERSION = "test-v2"
+    return "test-v2"
+
+
+def test_only_same_version_vectors_are_compared(new_version):
+    jobs = [
+        {"id": "a", "vector_embedding": [1.0, 0.0, 0.0], "embedding_model_version": "minilm-l6-v1"},
+        {"id": "b", "vector_embedding": [1.0, 0.0, 0.0], "embedding_model_version": new_version},
+    ]
+
+    scores = similarity_scores([1.0, 0.0, 0.0], jobs, "minilm-l6-v1")
+
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] == 0.0
+
+
+@pytest.mark.django_db
+def test_stale_jobs_are_reembedded_once(new_version, monkeypatch):
+    monkeypatch.setattr(embedding_tasks, "_requested", embedding_tasks.OrderedDict())
+    monkeypatch.setattr(
+        embedding_tasks, "encode_batch", lambda texts: np.ones((len(texts), 3), dtype=np.float32)
+    )
+    company = Company.objects.create(name="Acme")
+    job = JobPosting.objects.create(
+        company=company, job_title="Engineer", location="Remote", job_type="Full-time",
+        vector_embedding=[0.0, 1.0, 0.0], embedding_model_version="minilm-l6-v1",
+    )
+    assert list(embedding_tasks.stale_rows(JobPosting)) == [job]
+
+    assert embedding_tasks.request_reembed("jobs", [job.id]) == [str(job.id)]
+    assert embedding_tasks.request_reembed("jobs", [job.id]) == []
+    assert BackgroundTask.objects.filter(task_type="embeddings.reembed_jobs").count() == 1
+
+    embedding_tasks.reembed_jobs(ids=[str(job.id)])
+
+    job.refresh_from_db()
+    assert job.embedding_model_version == current_version().name
+    assert np.allclose(job.vector_embedding, 1.0)
+    assert not embedding_tasks.stale_rows(JobPosting).exists()
+
+
+@pytest.mark.django_db
+def test_reembedded_applicants_reach_the_notification_index(new_version, monkeypatch):
+    import accounts.signals as signals
+
+    index = VectorIndex()
+    monkeypatch.setattr(signals, "applicant_vector_index", index)
+    monkeypatch.setattr(
+        embedding_tasks, "encode_batch", lambda texts: np.ones((len(texts), 3), dtype=np.float32)
+    )
+    monkeypatch.setattr(embedding_tasks, "applicant_embedding_text", lambda profile: "Python and Django")
+    user = User.objects.create(email="a@example.com", role="applicant")
+    profile = ApplicantProfile.objects.create(
+        user=user, major="CS", school="State",
+        vector_embedding=[0.0, 1.0, 0.0], embedding_model_version="minilm-l6-v1",
+    )
+    assert profile.pk not in index
+
+    embedding_tasks.reembed_applicants(ids=[str(profile.pk)])
+
+    assert index.scores([1.0, 1.0, 1.0], [profile.pk])[0] == pytest.approx(1.0)
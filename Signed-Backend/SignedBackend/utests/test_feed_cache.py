@@ -0,0 +1,75 @@
+import pytest
+
+import accounts.feed.cache as feed_cache
+import accounts.signals as signals
+from accounts.embeddings import current_version
+from accounts.feed.cache import RankedFeedCache, vector_stamp
+from accounts.models import Company, JobPosting
+from accounts.vector_index import VectorIndex
+
+
+def test_hit_requires_matching_user_stamp():
+    cache = RankedFeedCache(max_entries=10, ttl=60)
+    cache.put("u1", "q", vector_stamp([0.1, 0.2]), "ranking")
+
+    assert cache.get("u1", "q", vector_stamp([0.1, 0.2])) == "ranking"
+    assert cache.get("u1", "q", vector_stamp([0.2, 0.1])) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_invalidate_user_only_drops_that_user():
+    cache = RankedFeedCache(max_entries=10, ttl=60)
+    cache.put("u1", "q", "s1", "a")
+    cache.put("u2", "q", "s2", "b")
+
+    cache.invalidate_user("u1")
+
+    assert cache.get("u1", "q", "s1") is None
+    assert cache.get("u2", "q", "s2") == "b"
+
+
+def test_invalidate_catalogue_drops_everything():
+    cache = RankedFeedCache(max_entries=10, ttl=60)
+    cache.put("u1", "q", "s1", "a")
+    cache.invalidate_catalogue()
+    assert cache.get("u1", "q", "s1") is None
+
+
+def test_lru_eviction_and_ttl():
+    cache = RankedFeedCache(max_entries=2, ttl=60)
+    cache.put("u1", "q", "s", "a")
+    cache.put("u2", "q", "s", "b")
+    cache.get("u1", "q", "s")
+    cache.put("u3", "q", "s", "c")
+
+    assert cache.get("u2", "q", "s") is None
+    assert cache.get("u1", "q", "s") == "a"
+    assert cache.stats()["evictions"] == 1
+
+    expired = RankedFeedCache(max_entries=2, ttl=-1)
+    expired.put("u1", "q", "s", "a")
+    assert expired.get("u1", "q", "s") is None
+
+
+@pytest.mark.django_db
+def test_counter_saves_keep_cached_feeds(monkeypatch):
+    index = VectorIndex()
+    monkeypatch.setattr(signals, "job_vector_index", index)
+    monkeypatch.setattr(feed_cache, "job_vector_index", index)
+    company = Company.objects.create(name="Acme")
+    job = JobPosting.objects.create(
+        company=company, job_title="Engineer", location="Remote", job_type="Full-time",
+        vector_embedding=[0.6, 0.8], embedding_model_version=current_version().name,
+    )
+    cache = RankedFeedCache(max_entries=10, ttl=60)
+    cache.put("u1", "q", "s", "ranking")
+
+    # a full save re-upserts the same vector into the index: nothing to invalidate
+    job.impressions += 1
+    job.save()
+    assert cache.get("u1", "q", "s") == "ranking"
+
+    job.vector_embedding = [0.8, 0.6]
+    job.save()
+    assert cache.get("u1", "q", "s") is None
@@ -0,0 +1,65 @@
+import pytest
+
+from accounts.feed.cursors import (
+    InvalidCursor,
+    RankingSnapshot,
+    decode_cursor,
+    encode_cursor,
+    feed_query_key,
+    seek_after,
+)
+
+
+def test_cursor_round_trip():
+    token = encode_cursor("snap", 15, 0.42, "job-15")
+    assert decode_cursor(token) == {
+        "snapshot_id": "snap",
+        "position": 15,
+        "score": 0.42,
+        "job_id": "job-15",
+        "scored_at": None,
+    }
+    assert decode_cursor(encode_cursor("snap", 15, 0.42, "job-15", 1700000000.5))["scored_at"] == 1700000000.5
+
+
+def test_tampered_cursor_is_rejected():
+    token = encode_cursor("snap", 15, 0.42, "job-15")
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token[:-2] + "xx")
+
+
+def test_seek_after_orders_by_score_then_id():
+    ids = ["a", "b", "c", "d"]
+    scores = [0.9, 0.5, 0.5, 0.1]
+    assert seek_after(ids, scores, 0.5, "b") == 2
+    assert seek_after(ids, scores, 0.5, "c") == 3
+    assert seek_after(ids, scores, 0.7, "zzz") == 1
+    assert seek_after(ids, scores, 0.0, "a") == 4
+
+
+def test_query_key_ignores_filter_key_order():
+    assert feed_query_key("u", {"a": 1, "b": 2}, False) == feed_query_key("u", {"b": 2, "a": 1}, False)
+    assert feed_query_key("u", None, False) != feed_query_key("u", None, True)
+
+
+def test_snapshot_resumes_from_stored_ranking():
+    ids = [f"job-{i}" for i in range(40)]
+    scores = [1.0 - i / 100 for i in range(40)]
+    snapshot = RankingSnapshot.create("key", ids, scores, total_count=40, scored_at=1700000000.5)
+
+    loaded = RankingSnapshot.load(snapshot.id, "key")
+    assert loaded.job_ids == ids
+    assert loaded.scored_at == 1700000000.5
+    assert RankingSnapshot.load(snapshot.id, "other-key") is None
+
+    cursor = decode_cursor(encode_cursor(snapshot.id, 15, scores[14], ids[14]))
+    assert loaded.resume_position(cursor, page_size=15) == 15
+
+
+def test_snapshot_asks_for_rerank_past_its_end():
+    ids = [f"job-{i}" for i in range(20)]
+    scores = [0.0] * 20
+    snapshot = RankingSnapshot.create("key", ids, scores, total_count=100)
+
+    cursor = decode_cursor(encode_cursor(snapshot.id, 15, 0.0, ids[14]))
+    assert snapshot.resume_position(cursor, page_size=15) is None
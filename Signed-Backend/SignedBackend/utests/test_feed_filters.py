@@ -0,0 +1,81 @@
+from django.db.models import Q
+
+from accounts.feed.filters import (
+    compile_django_filters,
+    compile_firestore_filters,
+    fallback_stats,
+    matches_filters,
+)
+
+JOB_ID = "3f2b8c1e-8a8e-4a53-9a7e-2b1b6f0c9d11"
+
+JOB = {
+    "id": JOB_ID,
+    "job_title": "Backend Engineer",
+    "location": "Remote",
+    "applicants": [],
+    "posted_by": {"user_company": "Google", "user_id": "u1", "user_email": "kerry@google.com"},
+}
+
+
+def test_matches_filters_uses_or_semantics():
+    assert matches_filters(JOB, {"location": "Chicago", "job_title": "Backend Engineer"})
+    assert matches_filters(JOB, {"user_company": "Google"})
+    assert not matches_filters(JOB, {"location": "Chicago", "user_email": "someone@else.com"})
+    assert not matches_filters(JOB, {"not_a_field": "x"})
+
+
+def test_django_filters_compile_to_or_of_q():
+    compiled = compile_django_filters({"user_email": "kerry@google.com", "location": "Remote"})
+    assert compiled.pushdown == Q(posted_by__user__email="kerry@google.com") | Q(location="Remote")
+    assert not compiled.needs_memory_filter
+
+
+def test_django_filters_drop_values_that_can_never_match():
+    compiled = compile_django_filters({"id": "not-a-uuid", "likes_count": "3"})
+    assert compiled.matches_nothing
+    assert compiled.apply([JOB]) == []
+
+
+def test_numeric_and_bool_values_match_like_the_feeds_equality():
+    compiled = compile_django_filters({"likes_count": 3.0, "is_active": 1, "impressions": True})
+    assert compiled.pushdown == Q(likes_count=3) | Q(is_active=True) | Q(impressions=1)
+    assert compiled.pushdown.children[1][1] is True
+    assert matches_filters({"likes_count": 3}, {"likes_count": 3.0})
+    assert matches_filters({"is_active": True}, {"is_active": 1})
+
+
+def test_numbers_that_cant_equal_the_field_are_dropped():
+    compiled = compile_django_filters({"likes_count": 3.5, "is_active": 2, "num_rejects": float("nan")})
+    assert compiled.matches_nothing
+
+    firestore = compile_firestore_filters({"is_active": 0, "likes_count": 2.5})
+    assert firestore.pushdown.field_path == "is_active"
+    assert firestore.pushdown.value is False
+
+
+def test_django_filters_fall_back_when_any_key_is_unmapped():
+    compiled = compile_django_filters({"location": "Remote", "applicants": []})
+    assert compiled.pushdown is None
+    assert compiled.fallback_keys == ["applicants"]
+    assert compiled.apply([JOB]) == [JOB]
+    assert fallback_stats()["django:applicants"] >= 1
+
+
+def test_firestore_filters_use_posted_by_paths():
+    compiled = compile_firestore_filters({"user_company": "Google"})
+    assert compiled.pushdown.field_path == "posted_by.user_company"
+    assert compiled.pushdown.value == "Google"
+
+
+def test_firestore_filters_fall_back_for_map_values():
+    compiled = compile_firestore_filters({"posted_by": {"user_company": "Google"}, "id": JOB_ID})
+    assert compiled.pushdown is None
+    assert compiled.fallback_keys == ["posted_by"]
+    assert compiled.apply([JOB]) == [JOB]
+
+
+def test_no_filters_compile_to_nothing():
+    compiled = compile_django_filters(None)
+    assert compiled.pushdown is None
+    assert compiled.apply([JOB]) == [JOB]
@@ -0,0 +1,45 @@
+import pytest
+
+from accounts.feed.pipeline import FeedContext, FeedError, FeedPipeline, FeedStage
+
+
+class AddCandidates(FeedStage):
+    name = "candidates"
+
+    def run(self, ctx):
+        ctx.candidates = [{"id": str(i)} for i in range(30)]
+        ctx.total_count = len(ctx.candidates)
+
+
+class PageWindow(FeedStage):
+    name = "pagination"
+
+    def run(self, ctx):
+        ctx.page_jobs = ctx.candidates[ctx.start_index:ctx.end_index]
+
+
+class Fail(FeedStage):
+    name = "fail"
+
+    def run(self, ctx):
+        raise FeedError("nope", status=404)
+
+
+def test_stages_run_in_order_and_are_timed():
+    ctx = FeedContext(page_size=15, start_index=15)
+    FeedPipeline([AddCandidates(), PageWindow()]).run(ctx)
+
+    assert [job["id"] for job in ctx.page_jobs] == [str(i) for i in range(15, 30)]
+    assert not ctx.has_next
+    assert list(ctx.timings) == ["candidates", "pagination"]
+    assert ctx.server_timing().startswith("candidates;dur=")
+
+
+def test_feed_error_stops_the_pipeline():
+    ctx = FeedContext(page_size=15, start_index=0)
+    with pytest.raises(FeedError) as excinfo:
+        FeedPipeline([Fail(), AddCandidates()]).run(ctx)
+
+    assert excinfo.value.status == 404
+    assert ctx.candidates == []
+    assert "fail" in ctx.timings
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from accounts.feed.pipeline import FeedContext
+from accounts.feed.scoring import ScoringEngine, feed_scoring_engine
+from accounts.feed.stages import ScoringStage
+
+NOW = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+
+def _job(days_old=0, likes=0, impressions=0, rejects=0):
+    return {
+        "date_posted": (NOW - timedelta(days=days_old)).isoformat(),
+        "likes_count": likes,
+        "impressions": impressions,
+        "num_rejects": rejects,
+    }
+
+
+def test_similarity_only_weights_reproduce_similarity():
+    engine = ScoringEngine(weights={"similarity": 1.0})
+    similarity = np.array([0.2, 0.9, 0.5], dtype=np.float32)
+    scores = engine.score([_job(), _job(), _job()], similarity, now=NOW)
+    assert np.allclose(scores, similarity)
+
+
+def test_recency_halves_every_half_life():
+    engine = ScoringEngine(weights={"recency": 1.0}, recency_half_life_days=10)
+    scores = engine.score([_job(0), _job(10), _job(20), {"date_posted": None}], np.zeros(4), now=NOW)
+    assert np.allclose(scores, [1.0, 0.5, 0.25, 0.0])
+
+
+def test_engagement_signals_are_log_scaled_and_rejects_penalise():
+    engine = ScoringEngine(weights={"likes": 1.0, "rejects": -1.0})
+    jobs = [_job(likes=0), _job(likes=99), _job(likes=99, rejects=5)]
+    scores = engine.score(jobs, np.zeros(3), now=NOW)
+    assert scores[0] == 0.0
+    assert scores[1] == pytest.approx(1.0)
+    assert scores[2] == pytest.approx(0.0)
+
+
+def test_unknown_signal_is_rejected():
+    with pytest.raises(ValueError):
+        ScoringEngine(weights={"salary": 1.0})
+
+
+def test_a_cursor_rerank_scores_as_of_the_first_page():
+    cursor = {"snapshot_id": "gone", "position": 15, "score": 0.5, "job_id": "job-14", "scored_at": NOW.timestamp()}
+    ctx = FeedContext(page_size=15, start_index=0, resume_from=cursor)
+    ctx.candidates = [_job(0), _job(3, likes=4), _job(30)]
+    ctx.similarities = np.array([0.1, 0.5, 0.9], dtype=np.float32)
+
+    ScoringStage().run(ctx)
+
+    assert np.array_equal(ctx.scores, feed_scoring_engine.score(ctx.candidates, ctx.similarities, now=NOW))
@@ -0,0 +1,78 @@
+import pytest
+
+from accounts.feed.sources import RANKING_FIELDS, DatabaseFeedSource, get_feed_source
+from accounts.models import ApplicantProfile, Company, JobPosting, User
+
+
+@pytest.fixture
+def postings(db):
+    company = Company.objects.create(name="Acme")
+    make = lambda title, **kw: JobPosting.objects.create(
+        company=company, job_title=title, location="Remote", job_type="Full-time", **kw
+    )
+    return [make("Backend"), make("Frontend"), make("Paused", is_active=False)]
+
+
+def test_database_source_filters_in_the_query(postings, django_assert_max_num_queries):
+    source = DatabaseFeedSource()
+
+    with django_assert_max_num_queries(1):
+        jobs, compiled = source.candidates({"job_title": "Backend", "location": "Nowhere"}, fetch_inactive=False)
+
+    assert [job["id"] for job in jobs] == [str(postings[0].id)]
+    assert not compiled.needs_memory_filter
+
+
+def test_database_candidates_carry_only_the_ranking_fields(postings):
+    postings[0].vector_embedding = [0.6, 0.8]
+    postings[0].save()
+
+    jobs, _ = DatabaseFeedSource().candidates(None, fetch_inactive=False)
+
+    assert all(set(job) == set(RANKING_FIELDS) for job in jobs)
+    assert {job["id"]: job["has_vector"] for job in jobs} == {str(postings[0].id): True, str(postings[1].id): False}
+    assert DatabaseFeedSource().vectors([postings[0].id])[str(postings[0].id)].tolist() == pytest.approx([0.6, 0.8])
+
+
+def test_filters_the_query_cant_evaluate_are_applied_by_the_source(postings):
+    jobs, compiled = DatabaseFeedSource().candidates({"media_items": []}, fetch_inactive=True)
+
+    assert len(jobs) == 3
+    assert not compiled.needs_memory_filter
+    assert set(jobs[0]) == set(RANKING_FIELDS)
+
+
+def test_database_source_skips_inactive_unless_asked(postings):
+    source = DatabaseFeedSource()
+
+    active, _ = source.candidates(None, fetch_inactive=False)
+    everything, _ = source.candidates(None, fetch_inactive=True)
+
+    assert {job["id"] for job in active} == {str(postings[0].id), str(postings[1].id)}
+    assert len(everything) == 3
+    assert [job["id"] for job in everything] == sorted(job["id"] for job in everything)
+
+
+def test_database_source_fetch_keeps_requested_order(postings):
+    ids = [str(postings[1].id), "00000000-0000-0000-0000-000000000000", str(postings[0].id)]
+    jobs = DatabaseFeedSource().fetch(ids)
+    assert [job["id"] for job in jobs] == [ids[0], ids[2]]
+
+
+def test_unknown_source_is_rejected():
+    with pytest.raises(ValueError):
+        get_feed_source("redis")
+
+
+def test_database_source_loads_applicants_with_the_prefetch(postings, django_assert_num_queries):
+    users = [User.objects.create(email=f"applicant{i}@example.com", role="applicant") for i in range(3)]
+    profiles = [ApplicantProfile.objects.create(user=user) for user in users]
+    for i, posting in enumerate(postings):
+        posting.applicants.add(*profiles[: i + 1])
+
+    # the postings, then one prefetch each for media items, personality preferences and applicants
+    with django_assert_num_queries(4):
+        jobs = DatabaseFeedSource().fetch([str(posting.id) for posting in postings])
+
+    assert [job["num_applicants"] for job in jobs] == [1, 2, 3]
+    assert sorted(jobs[2]["applicants"]) == [user.email for user in users]
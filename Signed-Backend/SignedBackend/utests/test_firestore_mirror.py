@@ -0,0 +1,110 @@
+import pytest
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1 import ArrayUnion, Increment
+from rest_framework.test import APIRequestFactory
+
+import accounts.firestore_mirror as firestore_mirror
+import accounts.job_tasks as job_tasks
+from accounts.job_postings import apply_to_job
+from accounts.models import ApplicantProfile, Company, JobPosting, User
+
+
+class FakeDocument:
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+
+    def update(self, fields):
+        if self.key not in self.store:
+            raise NotFound(self.key)
+        self.store[self.key].append(("update", fields))
+
+    def set(self, fields, merge=False):
+        self.store[self.key] = [("set", fields)]
+
+
+class FakeDb:
+    def __init__(self, store):
+        self.store = store
+
+    def collection(self, name):
+        assert name == "job_postings"
+        return self
+
+    def document(self, key):
+        return FakeDocument(self.store, key)
+
+
+def test_existing_documents_get_only_the_field_transforms(monkeypatch):
+    store = {"job-1": []}
+    monkeypatch.setattr(firestore_mirror, "db", FakeDb(store))
+    rebuilt = []
+
+    assert firestore_mirror.update_job_document(
+        "job-1",
+        {"applicants": firestore_mirror.array_union("a@example.com"), "num_applicants": firestore_mirror.increment()},
+        rebuild=lambda: rebuilt.append("job-1"),
+    )
+
+    (op, fields), = store["job-1"]
+    assert op == "update"
+    assert isinstance(fields["applicants"], ArrayUnion)
+    assert fields["applicants"].values == ["a@example.com"]
+    assert isinstance(fields["num_applicants"], Increment)
+    assert rebuilt == []
+
+
+def test_missing_documents_are_rebuilt_or_left_alone(monkeypatch):
+    store = {}
+    monkeypatch.setattr(firestore_mirror, "db", FakeDb(store))
+
+    assert not firestore_mirror.update_job_document("job-1", {"likes_count": 3})
+    assert store == {}
+
+    assert not firestore_mirror.update_job_document("job-1", {"likes_count": 3}, rebuild=lambda: {"likes_count": 3})
+    assert store == {"job-1": [("set", {"likes_count": 3})]}
+
+
+@pytest.mark.django_db
+def test_apply_to_job_mirrors_only_the_application_that_inserted(monkeypatch, django_capture_on_commit_callbacks):
+    company = Company.objects.create(name="Acme")
+    job = JobPosting.objects.create(
+        company=company, job_title="Engineer", location="Remote", job_type="Full-time", vector_embedding=[1.0, 0.0]
+    )
+    user = User.objects.create(email="a@example.com", role="applicant")
+    ApplicantProfile.objects.create(user=user, major="CS", school="State", vector_embedding=[0.0, 1.0])
+    store = {str(job.id): []}
+    monkeypatch.setattr(firestore_mirror, "db", FakeDb(store))
+
+    request = lambda: apply_to_job(APIRequestFactory().get("/", {"job_id": str(job.id), "user_id": str(user.id)}))
+    with django_capture_on_commit_callbacks(execute=True):
+        assert request().status_code == 200
+    # applying again inserts nothing, so nothing is mirrored
+    with django_capture_on_commit_callbacks(execute=True):
+        assert request().status_code == 200
+
+    (op, fields), = store[str(job.id)]
+    assert op == "update"
+    assert fields["applicants"].values == ["a@example.com"]
+    assert isinstance(fields["num_applicants"], Increment)
+    assert list(job.applicants.values_list("user__email", flat=True)) == ["a@example.com"]
+
+
+@pytest.mark.django_db
+def test_postings_are_mirrored_without_waiting_for_their_embedding(monkeypatch):
+    company = Company.objects.create(name="Acme")
+    job = JobPosting.objects.create(
+        company=company, job_title="Engineer", location="Remote", job_type="Full-time", vector_embedding=[1.0, 0.0]
+    )
+    store = {}
+    monkeypatch.setattr(job_tasks, "job_document", FakeDb(store).document)
+
+    job_tasks.mirror_job_posting(job_id=str(job.id), vector=False)
+    (op, fields), = store[str(job.id)]
+    assert op == "set"
+    assert fields["job_title"] == "Engineer"
+    assert "vector_embedding" not in fields and "embedding_model_version" not in fields
+
+    job_tasks.mirror_job_posting(job_id=str(job.id))
+    (_, fields), = store[str(job.id)]
+    assert fields["vector_embedding"] == [1.0, 0.0]
@@ -0,0 +1,59 @@
+import pytest
+
+from accounts.feed.applicants import (
+    decode_applicants_cursor,
+    encode_applicants_cursor,
+    load_applicant_facets,
+    load_applicant_summaries,
+    page_job_applicants,
+)
+from accounts.models import ApplicantProfile, Company, JobPosting, User
+
+
+def _applicant(i):
+    user = User.objects.create(email=f"applicant{i}@example.com", first_name=f"A{i}", role="applicant")
+    return ApplicantProfile.objects.create(user=user, major=f"Major {i % 2}", school="State")
+
+
+@pytest.fixture
+def job_with_applicants(db):
+    company = Company.objects.create(name="Acme")
+    job = JobPosting.objects.create(company=company, job_title="Engineer", location="Remote", job_type="Full-time")
+    profiles = [_applicant(i) for i in range(7)]
+    for profile in profiles:
+        job.applicants.add(profile)
+    return job, profiles
+
+
+def test_bulk_loaders_use_one_query_per_chunk(job_with_applicants, django_assert_num_queries):
+    _, profiles = job_with_applicants
+    emails = [p.user.email for p in profiles] + ["missing@example.com"]
+
+    with django_assert_num_queries(1):
+        summaries = load_applicant_summaries(emails)
+    with django_assert_num_queries(1):
+        facets = load_applicant_facets(emails)
+
+    assert set(summaries) == set(emails[:-1])
+    assert summaries["applicant3@example.com"]["first_name"] == "A3"
+    assert facets["applicant1@example.com"] == ("Major 1", "State", "")
+
+
+def test_applicants_are_paged_in_application_order(job_with_applicants):
+    job, profiles = job_with_applicants
+
+    first, last_row = page_job_applicants(job.id, limit=5)
+    assert [a["email"] for a in first] == [p.user.email for p in profiles[:5]]
+    assert last_row is not None
+
+    after = decode_applicants_cursor(encode_applicants_cursor(job.id, last_row), job.id)
+    rest, last_row = page_job_applicants(job.id, after=after, limit=5)
+    assert [a["email"] for a in rest] == [p.user.email for p in profiles[5:]]
+    assert last_row is None
+
+
+def test_applicants_cursor_is_bound_to_its_job():
+    token = encode_applicants_cursor("job-a", 12)
+    assert decode_applicants_cursor(token, "job-a") == 12
+    assert decode_applicants_cursor(token, "job-b") is None
+    assert decode_applicants_cursor("garbage", "job-a") is None
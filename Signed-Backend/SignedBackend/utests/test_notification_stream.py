@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import pytest
+from django.utils import timezone
+
+import accounts.notification_stream as notification_stream
+from accounts.models import Notification, User
+from accounts.notification_stream import InProcessBroker, TablePollingBroker, event_stream, publish_notifications
+
+
+def test_broker_delivers_events_published_from_other_threads():
+    broker = InProcessBroker(queue_size=2)
+
+    async def scenario():
+        subscription = broker.subscribe("u1")
+        other = broker.subscribe("u2")
+        assert broker.subscribed(["u1", "u3"]) == {"u1"}
+
+        publisher = threading.Thread(target=lambda: [broker.publish("u1", {"n": i}) for i in range(3)])
+        publisher.start()
+        publisher.join()
+
+        received = [await subscription.get(1), await subscription.get(1), await subscription.get(0.01)]
+        assert await other.get(0.01) is None
+        subscription.close()
+        other.close()
+        return received
+
+    # the third event overflowed the two-event queue
+    assert asyncio.run(scenario()) == [{"n": 0}, {"n": 1}, None]
+    assert broker.dropped == 1
+    assert broker.connections() == 0
+
+
+def test_event_stream_unsubscribes_when_the_client_goes_away():
+    broker = InProcessBroker()
+
+    async def scenario():
+        stream = event_stream(broker, "u1", keepalive=0.01)
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        broker.publish("u1", {"id": "n1", "title": "New job"})
+        event = await stream.__anext__()
+        assert await stream.__anext__() == ": keepalive\n\n"
+        await stream.aclose()
+        return event
+
+    assert asyncio.run(scenario()) == 'id: n1\nevent: notification\ndata: {"id": "n1", "title": "New job"}\n\n'
+    assert broker.connections() == 0
+
+
+@pytest.mark.django_db
+def test_only_connected_users_notifications_are_loaded(monkeypatch, django_assert_num_queries):
+    connected, offline = [User.objects.create(email=f"user{i}@example.com", role="applicant") for i in range(2)]
+    rows = [Notification.objects.create(user=user, title="t", message="m") for user in (connected, offline)]
+
+    published = []
+
+    class RecordingBroker(InProcessBroker):
+        def subscribed(self, channels):
+            return {str(connected.id)} & {str(channel) for channel in channels}
+
+        def publish(self, channel, event):
+            published.append((str(channel), event["id"]))
+
+    monkeypatch.setattr(notification_stream, "_broker", RecordingBroker())
+    # the rows of the connected user, plus their digest items
+    with django_assert_num_queries(2):
+        publish_notifications([(row.id, row.user_id) for row in rows])
+
+    assert published == [(str(connected.id), str(rows[0].id))]
+
+
+@pytest.mark.django_db
+def test_polling_broker_picks_up_rows_written_by_other_processes_once():
+    user = User.objects.create(email="user@example.com", role="applicant")
+    broker = TablePollingBroker(interval=1, overlap=60)
+    broker._watermark = timezone.now()
+    # as if created by a run_workers process: nothing was published
+    notification = Notification.objects.create(user=user, title="New Job Match", message="m")
+
+    assert [(channel, event["id"]) for channel, event in broker.fetch([str(user.id)])] == [
+        (str(user.id), str(notification.id))
+    ]
+    assert broker.fetch([str(user.id)]) == []
+    assert broker.subscribed([user.id]) == set()
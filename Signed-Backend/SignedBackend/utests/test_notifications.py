@@ -0,0 +1,245 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from accounts.job_postings import notify_company_followers
+from accounts.models import ApplicantProfile, Company, FanoutProgress, JobPosting, Notification, User
+from accounts.notifications import (
+    create_job_notifications,
+    decode_notifications_cursor,
+    delete_notifications,
+    encode_notifications_cursor,
+    mark_read,
+    page_notifications,
+    run_fanout,
+    unread_count,
+)
+from accounts.retention import NotificationRetention
+
+
+@pytest.fixture
+def job(db):
+    company = Company.objects.create(name="Acme")
+    return JobPosting.objects.create(company=company, job_title="Engineer", location="Remote", job_type="Full-time")
+
+
+def _users(count):
+    return [User.objects.create(email=f"user{i}@example.com", role="applicant") for i in range(count)]
+
+
+def _notify(job, user_ids, **kwargs):
+    return create_job_notifications(
+        job, user_ids, fanout="follow", notification_type="info", title="New job", message="Check it out", **kwargs
+    )
+
+
+def test_fan_out_skips_users_with_an_unread_notification(job, django_assert_num_queries):
+    users = _users(5)
+    Notification.objects.create(user=users[0], job_posting=job, notification_type="info", title="t", message="m")
+    Notification.objects.create(user=users[1], job_posting=job, notification_type="info", title="t", message="m",
+                                read=True)
+
+    # one lookup for the existing unread rows, then two insert batches that each read back the
+    # rows that went in and bump their users' counters
+    with django_assert_num_queries(7):
+        created = _notify(job, [u.id for u in users] + [users[2].id], batch_size=2)
+
+    assert created == 4
+    assert Notification.objects.filter(job_posting=job, read=False).count() == 5
+    assert _notify(job, [u.id for u in users]) == 0
+
+
+def test_any_unread_type_can_block_a_fan_out(job):
+    user, = _users(1)
+    Notification.objects.create(user=user, job_posting=job, notification_type="success", title="t", message="m")
+
+    assert _notify(job, [user.id]) == 1
+    assert _notify(job, [user.id], skip_any_unread=True) == 0
+
+
+def test_database_rejects_duplicate_unread_fan_out_notifications(job):
+    user, = _users(1)
+    Notification.objects.create(user=user, job_posting=job, notification_type="info", title="t", message="m",
+                                fanout="follow")
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Notification.objects.create(user=user, job_posting=job, notification_type="info", title="t", message="m",
+                                    fanout="match")
+
+
+def test_notifications_outside_fan_outs_are_not_deduplicated(job):
+    user, = _users(1)
+    for _ in range(2):
+        Notification.objects.create(user=user, job_posting=job, notification_type="info", title="t", message="m")
+
+    assert Notification.objects.filter(user=user, job_posting=job, read=False).count() == 2
+
+
+def test_follower_fan_out_resumes_after_the_last_committed_chunk(job, settings):
+    settings.NOTIFICATION_FANOUT_CHUNK_SIZE = 2
+    for user in _users(5):
+        ApplicantProfile.objects.create(user=user, major="CS", school="State").followed_companies.add(job.company)
+
+    calls = []
+
+    def failing_notify(user_ids):
+        calls.append(user_ids)
+        if len(calls) == 2:
+            raise RuntimeError("worker died")
+        return _notify(job, user_ids)
+
+    follows = ApplicantProfile.followed_companies.through.objects.values_list('id', 'applicantprofile__user_id')
+    with pytest.raises(RuntimeError):
+        run_fanout(job, 'company_followers', follows, failing_notify)
+
+    progress = FanoutProgress.objects.get(job_posting=job)
+    assert (progress.status, progress.processed, progress.total) == ('running', 2, 5)
+
+    assert notify_company_followers(job) == 5
+    progress.refresh_from_db()
+    assert (progress.status, progress.processed, progress.chunks) == ('done', 5, 3)
+    assert Notification.objects.filter(job_posting=job, notification_type="info").count() == 5
+
+
+def test_digest_users_get_one_notification_per_window(job, settings):
+    # a window long enough that the test can't straddle two of them
+    settings.NOTIFICATION_DIGEST_WINDOW_MINUTES = 365 * 24 * 60
+    instant, digest = _users(2)
+    ApplicantProfile.objects.create(user=instant, major="CS", school="State")
+    ApplicantProfile.objects.create(user=digest, major="CS", school="State", notification_delivery="digest")
+    other_job = JobPosting.objects.create(company=job.company, job_title="Designer", location="Remote",
+                                          job_type="Full-time")
+
+    for posting in (job, other_job):
+        assert _notify(posting, [instant.id, digest.id], digest_reason="follow") == 2
+    Notification.objects.filter(user=digest).update(read=True)
+    assert unread_count(digest.id) == 0
+
+    # a job the digest already lists leaves it read
+    _notify(job, [digest.id], digest_reason="match")
+    digest_notification, = Notification.objects.filter(user=digest)
+    assert digest_notification.read
+    assert unread_count(digest.id) == 0
+
+    # a new one reopens it
+    third_job = JobPosting.objects.create(company=job.company, job_title="Analyst", location="Remote",
+                                          job_type="Full-time")
+    _notify(third_job, [digest.id], digest_reason="match")
+
+    assert Notification.objects.filter(user=instant).count() == 2
+    digest_notification, = Notification.objects.filter(user=digest)
+    assert not digest_notification.read
+    assert unread_count(digest.id) == 1
+    assert digest_notification.digest_window is not None
+    assert set(digest_notification.digest_items.values_list("job_posting_id", "reason")) == {
+        (job.id, "follow"),
+        (other_job.id, "follow"),
+        (third_job.id, "match"),
+    }
+
+
+def test_retention_removes_old_read_and_over_limit_notifications(job):
+    heavy, light = _users(2)
+    for i in range(6):
+        Notification.objects.create(user=heavy, title=f"n{i}", message="m", read=i % 2 == 0)
+    old_read = Notification.objects.create(user=light, title="old", message="m", read=True)
+    old_unread = Notification.objects.create(user=light, title="old unread", message="m")
+    Notification.objects.filter(id__in=[old_read.id, old_unread.id]).update(
+        created_at=timezone.now() - timedelta(days=40)
+    )
+    newest_heavy = list(Notification.objects.filter(user=heavy).order_by('-created_at', '-id')[:4])
+
+    retention = NotificationRetention(read_days=30, max_per_user=4, batch_size=1, pause=0)
+    assert retention.run(dry_run=True) == {"read_expired": 1, "over_user_limit": 2}
+    assert retention.run() == {"read_expired": 1, "over_user_limit": 2}
+
+    assert list(Notification.objects.filter(user=light)) == [old_unread]
+    assert set(Notification.objects.filter(user=heavy)) == set(newest_heavy)
+
+
+def test_unread_counter_follows_fan_outs_and_retention(job):
+    user, = _users(1)
+    Notification.objects.create(user=user, title="t", message="m")
+    assert unread_count(user.id) == 1
+
+    other_job = JobPosting.objects.create(company=job.company, job_title="Designer", location="Remote",
+                                          job_type="Full-time")
+    _notify(job, [user.id])
+    _notify(other_job, [user.id])
+    assert unread_count(user.id) == 3
+
+    NotificationRetention(read_days=None, max_per_user=1, pause=0).run()
+    assert unread_count(user.id) == 1
+
+
+def test_notifications_page_by_cursor(job):
+    user, other = _users(2)
+    for i in range(5):
+        Notification.objects.create(user=user, title=f"n{i}", message="m")
+    newest_first = list(Notification.objects.filter(user=user).order_by('-created_at', '-id'))
+
+    page, last = page_notifications(user.id, limit=2)
+    assert page == newest_first[:2]
+    cursor = encode_notifications_cursor(user.id, last)
+    assert decode_notifications_cursor(cursor, other.id) is None
+
+    page, last = page_notifications(user.id, before=decode_notifications_cursor(cursor, user.id), limit=3)
+    assert page == newest_first[2:]
+    assert last is None
+
+
+def test_bulk_mark_read_and_delete_are_scoped_to_the_user_and_keep_the_counter(job):
+    user, other = _users(2)
+    mine = [Notification.objects.create(user=user, title=f"n{i}", message="m") for i in range(4)]
+    theirs = Notification.objects.create(user=other, title="t", message="m")
+    Notification.objects.filter(id=mine[0].id).update(created_at=timezone.now() - timedelta(days=1))
+    assert unread_count(user.id) == 4
+
+    assert mark_read(user.id, notification_ids=[mine[1].id, mine[2].id, theirs.id]) == 2
+    assert mark_read(user.id, notification_ids=[mine[1].id]) == 0
+    assert unread_count(user.id) == 2
+
+    assert delete_notifications(user.id, before=timezone.now() - timedelta(hours=1)) == 1
+    assert unread_count(user.id) == 1
+    assert delete_notifications(user.id, notification_ids=[mine[1].id, theirs.id]) == 1
+    assert set(Notification.objects.filter(user=user)) == {mine[2], mine[3]}
+    assert Notification.objects.filter(id=theirs.id, read=False).exists()
+
+
+def test_mark_all_read_includes_the_newest_loaded_notification(job):
+    user, = _users(1)
+    loaded = Notification.objects.create(user=user, title="loaded", message="m")
+    arrived_later = Notification.objects.create(user=user, title="later", message="m")
+    Notification.objects.filter(id=arrived_later.id).update(created_at=loaded.created_at + timedelta(microseconds=1))
+
+    # what the client sends: the created_at of the newest notification it has
+    assert mark_read(user.id, before=loaded.created_at) == 1
+    assert set(Notification.objects.filter(user=user, read=False)) == {arrived_later}
+    assert unread_count(user.id) == 1
+
+
+def test_prune_command_skips_policies_disabled_in_settings(job, settings, capsys):
+    settings.NOTIFICATION_RETENTION_READ_DAYS = None
+    settings.NOTIFICATION_RETENTION_MAX_PER_USER = 1
+    user, = _users(1)
+    for i in range(3):
+        Notification.objects.create(user=user, title=f"n{i}", message="m", read=True)
+
+    call_command("prune_notifications", dry_run=True)
+
+    assert "over_user_limit: 2" in capsys.readouterr().out
+
+
+def test_rows_dropped_by_the_constraint_are_not_counted(job, monkeypatch):
+    user, = _users(1)
+    assert unread_count(user.id) == 0
+    # a concurrent fan-out wins the race after our unread lookup
+    Notification.objects.create(user=user, job_posting=job, notification_type="info", title="t", message="m",
+                                fanout="follow")
+    monkeypatch.setattr("accounts.notifications.users_with_unread", lambda *args, **kwargs: set())
+
+    assert _notify(job, [user.id]) == 0
+    assert unread_count(user.id) == 0
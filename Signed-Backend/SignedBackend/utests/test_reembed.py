@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+
+import accounts.management.commands.reembed as reembed
+from accounts.models import Company, JobPosting
+
+
+@pytest.fixture
+def jobs(db):
+    company = Company.objects.create(name="Acme")
+    return [
+        JobPosting.objects.create(company=company, job_title=f"Job {i}", location="Remote", job_type="Full-time")
+        for i in range(5)
+    ]
+
+
+def _fake_encode(calls):
+    def encode_batch(texts):
+        calls.append(list(texts))
+        return [np.full(3, len(calls), dtype=np.float32) for _ in texts]
+    return encode_batch
+
+
+def test_reembed_writes_every_job_and_removes_checkpoint(jobs, tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(reembed, "encode_batch", _fake_encode(calls))
+    checkpoint = tmp_path / "progress.json"
+
+    call_command("reembed", models="jobs", workers=0, batch_size=2, checkpoint=str(checkpoint))
+
+    assert [len(batch) for batch in calls] == [2, 2, 1]
+    assert all(np.allclose(job.vector_embedding, job.vector_embedding[0]) for job in JobPosting.objects.all())
+    assert not checkpoint.exists()
+
+
+def test_reembed_resumes_after_checkpoint(jobs, tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(reembed, "encode_batch", _fake_encode(calls))
+    ordered = sorted(jobs, key=lambda job: str(job.pk))
+    checkpoint = tmp_path / "progress.json"
+    checkpoint.write_text(json.dumps({"jobs": str(ordered[2].pk)}))
+
+    call_command("reembed", models="jobs", workers=0, batch_size=10, checkpoint=str(checkpoint))
+
+    assert len(calls) == 1 and len(calls[0]) == 2
+    untouched = JobPosting.objects.get(pk=ordered[0].pk)
+    assert untouched.vector_embedding is None
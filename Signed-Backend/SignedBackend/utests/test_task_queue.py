@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from accounts.models import BackgroundTask
+from accounts.tasks import enqueue, task
+from accounts.tasks.worker import Worker
+
+calls = []
+
+
+@task("test.record", max_attempts=3, concurrency=1, visibility_timeout=30, backoff_base=10)
+def record(value, fail=False):
+    calls.append(value)
+    if fail:
+        raise ValueError("boom")
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+def test_queued_task_runs_and_is_marked_done():
+    row = enqueue("test.record", value=1)
+    assert Worker(task_types=["test.record"]).run_once()
+
+    row.refresh_from_db()
+    assert calls == [1]
+    assert row.status == "done"
+    assert row.attempts == 1
+
+
+@pytest.mark.django_db
+def test_failures_back_off_then_give_up():
+    row = enqueue("test.record", value=2, fail=True)
+    worker = Worker(task_types=["test.record"])
+
+    assert worker.run_once()
+    row.refresh_from_db()
+    assert row.status == "queued"
+    assert row.run_after > timezone.now() + timedelta(seconds=5)
+    assert "boom" in row.last_error
+    assert not worker.run_once()  # not due yet
+
+    for _ in range(2):
+        BackgroundTask.objects.filter(id=row.id).update(run_after=timezone.now())
+        worker.run_once()
+    row.refresh_from_db()
+    assert row.status == "failed"
+    assert row.attempts == 3
+
+
+@pytest.mark.django_db
+def test_concurrency_limit_and_visibility_timeout():
+    held = enqueue("test.record", value=3)
+    BackgroundTask.objects.filter(id=held.id).update(
+        status="running", attempts=1, locked_by="dead-worker",
+        locked_until=timezone.now() + timedelta(seconds=30),
+    )
+    enqueue("test.record", value=4)
+    worker = Worker(task_types=["test.record"])
+
+    # the live lock uses up the type's only slot
+    assert not worker.run_once()
+
+    # once the lock expires the abandoned task is handed out again
+    BackgroundTask.objects.filter(id=held.id).update(locked_until=timezone.now() - timedelta(seconds=1))
+    assert worker.run_once()
+    assert worker.run_once()
+    assert sorted(calls) == [3, 4]
@@ -0,0 +1,130 @@
+import threading
+
+import numpy as np
+import pytest
+
+from accounts.vector_index import VectorIndex, scan_chunks, stream_vectors, top_k_indices
+
+
+def _unit(*values):
+    v = np.array(values, dtype=np.float32)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+@pytest.fixture
+def index():
+    idx = VectorIndex()
+    idx.load([
+        ("a", _unit(1, 0, 0)),
+        ("b", _unit(0, 1, 0)),
+        ("c", _unit(1, 1, 0)),
+        ("empty", []),
+    ])
+    return idx
+
+
+def test_top_k_indices_orders_best_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+    assert top_k_indices(scores, 2).tolist() == [1, 3]
+    assert top_k_indices(scores, None).tolist() == [1, 3, 2, 0]
+    assert top_k_indices(scores, 0).tolist() == []
+
+    tied = np.array([0.5, 0.9, 0.5, 0.5, 0.9, 0.1], dtype=np.float32)
+    for k in range(len(tied) + 1):
+        assert top_k_indices(tied, k).tolist() == np.argsort(-tied, kind="stable")[:k].tolist()
+
+
+def test_load_skips_rows_without_vectors(index):
+    assert len(index) == 3
+    assert "empty" not in index
+
+
+def test_top_k_returns_most_similar(index):
+    result = index.top_k([1, 0.1, 0], k=2)
+    assert [key for key, _ in result] == ["a", "c"]
+    assert result[0][1] == pytest.approx(0.995, abs=1e-3)
+
+
+def test_top_k_restricted_to_keys(index):
+    result = index.top_k([1, 0, 0], keys=["b", "c", "missing"])
+    assert [key for key, _ in result] == ["c", "b"]
+
+
+def test_scores_marks_missing_ids_as_nan(index):
+    scores = index.scores([0, 1, 0], ["b", "missing"])
+    assert scores[0] == pytest.approx(1.0)
+    assert np.isnan(scores[1])
+
+
+def test_upsert_and_remove_keep_rows_aligned(index):
+    index.upsert("d", _unit(0, 0, 1))
+    index.upsert("a", _unit(0, 0, 1))
+    index.remove("b")
+
+    assert len(index) == 3
+    assert "b" not in index
+    result = dict(index.top_k([0, 0, 1]))
+    assert result["a"] == pytest.approx(1.0)
+    assert result["d"] == pytest.approx(1.0)
+    assert result["c"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_upsert_with_empty_vector_removes(index):
+    index.upsert("a", None)
+    assert "a" not in index
+
+
+def test_above_applies_threshold_and_cap_across_chunks(index):
+    result = index.above([1, 0.2, 0], threshold=0.5, chunk_size=1)
+    assert [key for key, _ in result] == ["a", "c"]
+
+    assert [key for key, _ in index.above([1, 0.2, 0], threshold=0.5, k=1, chunk_size=2)] == ["a"]
+    assert index.above([0, 0, 1], threshold=0.5) == []
+
+
+def test_streamed_chunks_match_in_memory_scan(index):
+    rows = [("a", [2, 0, 0]), ("b", [0, 3, 0]), ("c", [1, 1, 0]), ("empty", [])]
+    streamed = scan_chunks([1, 0.2, 0], stream_vectors(rows, chunk_size=2), threshold=0.5, k=5)
+    expected = index.above([1, 0.2, 0], threshold=0.5, k=5)
+
+    assert [key for key, _ in streamed] == [key for key, _ in expected]
+    assert [score for _, score in streamed] == pytest.approx([score for _, score in expected])
+
+
+def test_generation_moves_only_when_the_contents_change(index):
+    generation = index.generation
+
+    index.upsert("a", _unit(1, 0, 0))
+    index.remove("missing")
+    index.load([("c", _unit(1, 1, 0)), ("a", _unit(1, 0, 0)), ("b", _unit(0, 1, 0))])
+    assert index.generation == generation
+
+    index.upsert("a", _unit(0, 0, 1))
+    assert index.generation == generation + 1
+    index.remove("b")
+    assert index.generation == generation + 2
+
+
+def test_reload_runs_the_loader_outside_the_lock():
+    index = VectorIndex(loader=lambda: rows, ttl=0)
+    rows = [("a", _unit(1, 0, 0))]
+    index.ensure_loaded()
+    during_reload = []
+
+    def loader():
+        # scoring and a signal upsert from another thread while the scan runs
+        other = threading.Thread(target=lambda: (
+            during_reload.append(float(index.scores([1, 0, 0], ["a"])[0])),
+            index.upsert("b", _unit(0, 1, 0)),
+        ))
+        other.start()
+        other.join(timeout=5)
+        assert not other.is_alive()
+        return [("a", _unit(1, 0, 0))]
+
+    index._loader = loader
+    index.ensure_loaded()
+
+    assert during_reload == [pytest.approx(1.0)]
+    # the upsert made during the reload survives the swap
+    assert "b" in index
@@ -44,6 +44,19 @@ type AuthState =
   | "forgot-password";
 type UserType = "applicant" | "employer";
 
+const toNotification = (n: any): Notification => ({
+  id: n.id,
+  title: n.title,
+  message: n.message,
+  timestamp: new Date(n.created_at),
+  createdAt: n.created_at,
+  read: n.read,
+  type: n.notification_type || 'info',
+  onPress: n.job_posting ? () => {
+    console.log("Navigate to job posting:", n.job_posting);
+  } : undefined,
+});
+
 function EmployerTabs({ currentUser, initialRouteName, onSwitchEmployerTab }: { currentUser: any | void, initialRouteName: string, onSwitchEmployerTab: (route: string) => void }) {
   const { isDark } = useTheme();
   const colors = getColors(isDark);
@@ -199,6 +212,10 @@ function AppContent() {
   const [showSharedJob, setShowSharedJob] = useState(false);
   const [sharedJobToken, setSharedJobToken] = useState<string | null>(null);
   const [notifications, setNotifications] = useState<Notification[]>([]);
+  // next_cursor of the oldest page loaded; null once everything is loaded
+  const [notificationsCursor, setNotificationsCursor] = useState<string | null>(null);
+  const [loadedOlderNotifications, setLoadedOlderNotifications] = useState(false);
+  const [loadingMoreNotifications, setLoadingMoreNotifications] = useState(false);
   const [showLikedJobs, setShowLikedJobs] = useState(false);
 
 
@@ -302,24 +319,59 @@ function AppContent() {
       );
 
       if (response.data?.status === 'success' && response.data?.notifications) {
-        const apiNotifications: Notification[] = response.data.notifications.map((n: any) => ({
-          id: n.id,
-          title: n.title,
-          message: n.message,
-          timestamp: new Date(n.created_at),
-          read: n.read,
-          type: n.notification_type || 'info',
-          onPress: n.job_posting ? () => {
-            console.log("Navigate to job posting:", n.job_posting);
-          } : undefined,
-        }));
-
-        setNotifications(apiNotifications);
+        const firstPage: Notification[] = response.data.notifications.map(toNotification);
+        const nextCursor: string | null = response.data.pagination?.next_cursor ?? null;
+
+        if (nextCursor && loadedOlderNotifications) {
+          // keep the older pages already loaded (and the cursor after them)
+          const oldest = firstPage[firstPage.length - 1].timestamp.getTime();
+          const ids = new Set(firstPage.map(n => n.id));
+          setNotifications(prev => [
+            ...firstPage,
+            ...prev.filter(n => !ids.has(n.id) && n.timestamp.getTime() < oldest),
+          ]);
+        } else {
+          setNotifications(firstPage);
+          setNotificationsCursor(nextCursor);
+          setLoadedOlderNotifications(false);
+        }
       }
     } catch (error) {
       console.error("Error fetching notifications:", error);
     }
-  }, [authState, currentUser, machineIp]);
+  }, [authState, currentUser, machineIp, loadedOlderNotifications]);
+
+  const loadMoreNotifications = async () => {
+    if (!notificationsCursor || loadingMoreNotifications) return;
+
+    setLoadingMoreNotifications(true);
+    try {
+      const token = await AsyncStorage.getItem('userToken');
+      if (!token) return;
+
+      const response = await axios.get(
+        `http://${machineIp}:8000/api/v1/users/notifications/`,
+        {
+          headers: { Authorization: `Bearer ${token}` },
+          params: { before: notificationsCursor },
+        }
+      );
+
+      if (response.data?.status === 'success' && response.data?.notifications) {
+        const olderPage: Notification[] = response.data.notifications.map(toNotification);
+        setNotifications(prev => {
+          const ids = new Set(prev.map(n => n.id));
+          return [...prev, ...olderPage.filter(n => !ids.has(n.id))];
+        });
+        setNotificationsCursor(response.data.pagination?.next_cursor ?? null);
+        setLoadedOlderNotifications(true);
+      }
+    } catch (error) {
+      console.error("Error loading more notifications:", error);
+    } finally {
+      setLoadingMoreNotifications(false);
+    }
+  };
 
   const handleNotificationPress = async (notification: Notification) => {
     if (!notification.read) {
@@ -371,23 +423,28 @@ function AppContent() {
   };
 
   const handleMarkAllAsRead = async () => {
+    // the server's timestamp of the newest loaded notification, not this device's clock
+    const newest = notifications.reduce<string | null>((latest, n) => {
+      if (!n.createdAt) return latest;
+      if (latest === null) return n.createdAt;
+      const diff = Date.parse(n.createdAt) - Date.parse(latest);
+      // same millisecond: the strings carry the microseconds
+      return diff > 0 || (diff === 0 && n.createdAt > latest) ? n.createdAt : latest;
+    }, null);
+    if (newest === null) {
+      return;
+    }
+
     try {
       const token = await AsyncStorage.getItem('userToken');
       if (token) {
-        const unreadNotifications = notifications.filter(n => !n.read);
-        for (const notification of unreadNotifications) {
-          try {
-            await axios.post(
-              `http://${machineIp}:8000/api/v1/users/notifications/mark-read/`,
-              { notification_id: notification.id },
-              {
-                headers: { Authorization: `Bearer ${token}` },
-              }
-            );
-          } catch (error) {
-            console.error(`Error marking notification ${notification.id} as read:`, error);
+        await axios.post(
+          `http://${machineIp}:8000/api/v1/users/notifications/mark-read/bulk/`,
+          { all_before: newest },
+          {
+            headers: { Authorization: `Bearer ${token}` },
           }
-        }
+        );
       }
     } catch (error) {
       console.error("Error marking all notifications as read:", error);
@@ -504,6 +561,9 @@ function AppContent() {
           onDismissNotification={handleDismissNotification}
           onMarkAllAsRead={handleMarkAllAsRead}
           onRefreshNotifications={fetchNotifications}
+          hasMoreNotifications={notificationsCursor !== null}
+          loadingMoreNotifications={loadingMoreNotifications}
+          onLoadMoreNotifications={loadMoreNotifications}
         />
 
         {/* {userType === "employer" && (
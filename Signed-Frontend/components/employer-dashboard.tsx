@@ -72,6 +72,7 @@ type APIJobPosting = {
   impressions: number;
   num_rejects: number;
   applicants: applicant[];
+  num_applicants: number;
   likes_count: number;
 };
 
@@ -83,6 +84,7 @@ type DashboardJob = {
   postedDays: number;
   impressions: number;
   applicants: applicant[];
+  num_applicants: number;
   likes_count: number;
 };
 
@@ -125,6 +127,7 @@ function toDashboard(items: APIJobPosting[]): DashboardJob[] {
     postedDays: daysSince(jp.date_posted),
     impressions: jp.impressions,
     applicants: jp.applicants,
+    num_applicants: jp.num_applicants ?? jp.applicants.length,
     likes_count: jp.likes_count,
   }));
 }
@@ -258,6 +261,19 @@ export const EmployerDashboard = ({ userId, userEmail }: Props) => {
     return acc;
   }
 
+  async function fetchJobApplicants(jobId: string) {
+    const base = `http://${machineIp}:8000/api/v1/users/jobs/${jobId}/applicants/`;
+    let cursor: string | null = null;
+    const acc: applicant[] = [];
+    do {
+      const url = cursor ? `${base}?limit=100&cursor=${encodeURIComponent(cursor)}` : `${base}?limit=100`;
+      const { data } = await axios.get(url);
+      acc.push(...(data?.applicants ?? []));
+      cursor = data?.pagination?.next_cursor ?? null;
+    } while (cursor);
+    return acc;
+  }
+
   const fetchCompanyData = async (isRefresh: boolean = false) => {
     try {
       const token = await AsyncStorage.getItem('userToken');
@@ -458,7 +474,7 @@ export const EmployerDashboard = ({ userId, userEmail }: Props) => {
     0
   );
   const totalApplicants = dashboardJobs.reduce(
-    (sum, j) => sum + j.applicants.length,
+    (sum, j) => sum + j.num_applicants,
     0
   );
   const totalLikes = dashboardJobs.reduce((sum, j) => sum + j.likes_count, 0);
@@ -731,9 +747,9 @@ export const EmployerDashboard = ({ userId, userEmail }: Props) => {
               </Text>
             </View>
             <View style={styles.jobStat}>
-              <Text style={styles.jobStatValue}>{job.applicants.length}</Text>
+              <Text style={styles.jobStatValue}>{job.num_applicants}</Text>
               <Text style={styles.jobStatLabel}>
-                {job.applicants.length === 1 ? "Applicant" : "Applicants"}
+                {job.num_applicants === 1 ? "Applicant" : "Applicants"}
               </Text>
             </View>
             <View style={styles.jobStat}>
@@ -772,12 +788,12 @@ export const EmployerDashboard = ({ userId, userEmail }: Props) => {
         <ChevronRightIcon size={20} color={colors.mutedForeground} />
       </View>
 
-      {job.applicants.length > 0 && (
+      {job.num_applicants > 0 && (
         <TouchableOpacity
           style={[styles.showApplicantsButton]}
-          onPress={() => {
+          onPress={async () => {
             // console.log(job);
-            currentApplicants.current = job.applicants;
+            currentApplicants.current = await fetchJobApplicants(job.id);
             setShowApplicants(true);
             currentJobTitle.current = job.title;
           }}
@@ -854,12 +870,12 @@ export const EmployerDashboard = ({ userId, userEmail }: Props) => {
   };
 
   function computeJobPopularity(job : DashboardJob) {
-    const { impressions, likes_count, applicants } = job;
+    const { impressions, likes_count, num_applicants } = job;
 
     return (
       impressions * 0.2 +   
       likes_count * 2 +          
-      applicants.length * 5 
+      num_applicants * 5 
     );
   }
 
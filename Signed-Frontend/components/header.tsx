@@ -17,6 +17,9 @@ interface HeaderProps {
   onDismissNotification?: (notificationId: string) => void;
   onMarkAllAsRead?: () => void;
   onRefreshNotifications?: () => void;
+  hasMoreNotifications?: boolean;
+  loadingMoreNotifications?: boolean;
+  onLoadMoreNotifications?: () => void;
 }
 
 export const Header = ({
@@ -30,6 +33,9 @@ export const Header = ({
   onDismissNotification,
   onMarkAllAsRead,
   onRefreshNotifications,
+  hasMoreNotifications = false,
+  loadingMoreNotifications = false,
+  onLoadMoreNotifications,
 }: HeaderProps) => {
   const { isDark } = useTheme();
   const colors = getColors(isDark);
@@ -99,6 +105,9 @@ export const Header = ({
         onNotificationPress={onNotificationPress}
         onDismissNotification={onDismissNotification}
         onMarkAllAsRead={onMarkAllAsRead}
+        hasMore={hasMoreNotifications}
+        loadingMore={loadingMoreNotifications}
+        onLoadMore={onLoadMoreNotifications}
       />
     </>
   );
@@ -7,6 +7,7 @@ export interface Notification {
   title: string;
   message: string;
   timestamp: Date;
+  createdAt?: string; // the server's created_at, to microseconds
   read: boolean;
   type?: 'info' | 'success' | 'warning' | 'error';
   onPress?: () => void;
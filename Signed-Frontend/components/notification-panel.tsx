@@ -18,6 +18,9 @@ interface NotificationPanelProps {
   onNotificationPress?: (notification: Notification) => void;
   onDismissNotification?: (notificationId: string) => void;
   onMarkAllAsRead?: () => void;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 export const NotificationPanel = ({
@@ -27,6 +30,9 @@ export const NotificationPanel = ({
   onNotificationPress,
   onDismissNotification,
   onMarkAllAsRead,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
 }: NotificationPanelProps) => {
   const unreadCount = notifications.filter(n => !n.read).length;
 
@@ -99,6 +105,17 @@ export const NotificationPanel = ({
                 />
               ))
             )}
+            {hasMore && onLoadMore && (
+              <TouchableOpacity
+                onPress={onLoadMore}
+                disabled={loadingMore}
+                style={styles.loadMoreButton}
+              >
+                <Text style={styles.loadMoreText}>
+                  {loadingMore ? 'Loading...' : 'Load older notifications'}
+                </Text>
+              </TouchableOpacity>
+            )}
           </ScrollView>
         </Pressable>
       </Pressable>
@@ -190,6 +207,15 @@ const styles = StyleSheet.create({
   scrollContent: {
     paddingBottom: spacing.md,
   },
+  loadMoreButton: {
+    alignItems: 'center',
+    paddingVertical: spacing.md,
+  },
+  loadMoreText: {
+    fontSize: fontSizes.sm,
+    color: colors.primary,
+    fontWeight: fontWeights.medium,
+  },
   emptyContainer: {
     flex: 1,
     justifyContent: 'center',